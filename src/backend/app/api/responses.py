@@ -0,0 +1,249 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Responses that forward Orion-LD bodies without decoding them.
+"""
+
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+import httpx
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.services.entity_version import EntityVersion
+from app.services.serialization import JsonSerializer, json_serializer
+
+# Broker headers that matter to API clients
+FORWARDED_HEADERS = ("NGSILD-Results-Count",)
+
+# Streamed bodies are relayed still encoded, so their framing headers go too
+STREAM_FORWARDED_HEADERS = FORWARDED_HEADERS + ("Content-Encoding", "Content-Length")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def raw_json_response(
+    content: bytes, status_code: int = 200, media_type: str = "application/json"
+) -> Response:
+    """Return pre-serialized JSON bytes as-is."""
+    return Response(content=content, status_code=status_code, media_type=media_type)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix on either side is ignored.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: Optional[str], last_modified: str) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def conditional_json_response(request: Request, version: EntityVersion) -> Response:
+    """
+    Return an entity body, or 304 Not Modified if the client's copy is current.
+
+    If-None-Match is checked against the ETag; If-Modified-Since is only
+    considered without it and when the entity carries modifiedAt. Both
+    responses carry the validators, and `Cache-Control: no-cache` makes
+    clients revalidate instead of reusing a stale copy.
+
+    Example:
+        version = await service.get_entity_version(entity_id, options=options)
+        return conditional_json_response(request, version)
+    """
+    headers: Dict[str, str] = {"ETag": version.etag, "Cache-Control": "no-cache"}
+    if version.last_modified:
+        headers["Last-Modified"] = version.last_modified
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, version.etag)
+    else:
+        not_modified = (
+            _not_modified_since(
+                request.headers.get("If-Modified-Since"), version.last_modified
+            )
+            if version.last_modified
+            else False
+        )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=version.content, media_type="application/json", headers=headers
+    )
+
+
+def broker_json_response(response: httpx.Response) -> Response:
+    """
+    Forward a broker response body and its relevant headers unchanged.
+
+    Example:
+        orion_response = await service.query_entities_raw(type="AirQualityObserved")
+        return broker_json_response(orion_response)
+    """
+    headers = {
+        name: response.headers[name]
+        for name in FORWARDED_HEADERS
+        if name in response.headers
+    }
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json"),
+        headers=headers,
+    )
+
+
+async def _relay_body(response: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.aiter_raw():
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+def broker_stream_response(response: httpx.Response) -> Response:
+    """
+    Relay an open streaming broker response to the client chunk by chunk.
+
+    The body is neither decoded nor decompressed, so Content-Encoding and
+    Content-Length are forwarded with NGSILD-Results-Count. The upstream
+    connection is released when the relay finishes or the client goes away.
+
+    Example:
+        orion_response = await service.stream_entities(type="RoadSegment")
+        return broker_stream_response(orion_response)
+    """
+    if response.is_stream_consumed:
+        # Body already read (e.g. in-memory transports): nothing left to relay
+        return broker_json_response(response)
+
+    headers = {
+        name: response.headers[name]
+        for name in STREAM_FORWARDED_HEADERS
+        if name in response.headers
+    }
+    return StreamingResponse(
+        _relay_body(response),
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json"),
+        headers=headers,
+        # Also covers a relay that never started
+        background=BackgroundTask(response.aclose),
+    )
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether the client opted into newline-delimited JSON via Accept."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_lines(
+    first: List[Dict[str, Any]],
+    pages: AsyncGenerator[List[Dict[str, Any]], None],
+    serializer: JsonSerializer,
+) -> AsyncIterator[bytes]:
+    page = first
+    try:
+        while True:
+            # One chunk per page: one compression flush per page, not per line
+            yield b"".join(serializer.dumps(entity) + b"\n" for entity in page)
+            page = await pages.__anext__()
+    except StopAsyncIteration:
+        return
+    finally:
+        await pages.aclose()
+
+
+async def ndjson_response(
+    pages: AsyncGenerator[List[Dict[str, Any]], None],
+    serializer: JsonSerializer = json_serializer,
+) -> Response:
+    """
+    Stream entity pages as NDJSON, one entity per line.
+
+    The first page is fetched before the response starts, so invalid queries
+    and broker errors still map to a proper status code; later pages are
+    requested while earlier ones are sent.
+
+    Example:
+        if wants_ndjson(request):
+            pages = service.iter_pages(type="RoadSegment", q=q)
+            return await ndjson_response(pages)
+    """
+    try:
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        return Response(content=b"", media_type=NDJSON_MEDIA_TYPE)
+    except BaseException:
+        await pages.aclose()
+        raise
+    return StreamingResponse(
+        _ndjson_lines(first, pages, serializer), media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+async def _chain(
+    first: bytes, chunks: AsyncGenerator[bytes, None]
+) -> AsyncIterator[bytes]:
+    try:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+
+
+async def download_response(
+    chunks: AsyncGenerator[bytes, None], media_type: str, filename: str
+) -> Response:
+    """
+    Stream generated file chunks as an attachment.
+
+    Like ndjson_response(), the first chunk is produced before the response
+    starts so errors raised while generating it keep their status code.
+
+    Example:
+        chunks = export_columnar(air_quality_service, AirQualityObserved)
+        return await download_response(chunks, media_type, "air-quality.parquet")
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
+    except BaseException:
+        await chunks.aclose()
+        raise
+    return StreamingResponse(
+        _chain(first, chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.models.AirQualityObserved import AirQualityObserved
+from app.models.CarbonFootprint import CarbonFootprint
+from app.models.WaterQualityObserved import WaterQualityObserved
+from app.services.aggregation import aggregate_attribute, numeric_attributes
+from app.services.air_quality_service import air_quality_service
+from app.services.carbon_footprint_service import carbon_footprint_service
+from app.services.water_quality_service import water_quality_service
+
+router = APIRouter(prefix="/api/v1/aggregations", tags=["Aggregations"])
+logger = logging.getLogger(__name__)
+
+# dataset -> (service, observation time attribute, numeric attributes)
+DATASETS = {
+    "air-quality": (
+        air_quality_service,
+        "dateObserved",
+        numeric_attributes(AirQualityObserved),
+    ),
+    "water-quality": (
+        water_quality_service,
+        "dateObserved",
+        numeric_attributes(WaterQualityObserved),
+    ),
+    "carbon-footprint": (
+        carbon_footprint_service,
+        "emissionDate",
+        numeric_attributes(CarbonFootprint),
+    ),
+}
+
+
+@router.get(
+    "/{dataset}",
+    response_model=Dict[str, Any],
+    summary="Aggregate an environmental time series",
+    description="Compute statistics server-side instead of downloading every observation.",
+)
+async def aggregate_dataset(
+    dataset: str,
+    attribute: str = Query(..., description="Numeric attribute (e.g. pm25, pH, CO2eq)"),
+    start_time: Optional[str] = Query(
+        None, description="Start time (ISO8601), inclusive"
+    ),
+    end_time: Optional[str] = Query(None, description="End time (ISO8601), inclusive"),
+    q: Optional[str] = Query(None, description="Additional query filter"),
+    bucket: Optional[str] = Query(
+        None, description="Time-bucketed rollup: 'minute', 'hour' or 'day'"
+    ),
+    group_by: Optional[str] = Query(
+        None, description="'location' or an attribute name for per-group statistics"
+    ),
+    percentiles: str = Query("50,90,99", description="Comma-separated percentiles"),
+    location_precision: int = Query(
+        3, ge=0, le=6, description="Decimals of the location grid for group_by=location"
+    ),
+):
+    """
+    Aggregate one numeric attribute of a dataset (min/max/mean/std/percentiles),
+    optionally per time bucket and per location.
+
+    Examples:
+    - PM2.5 summary: `/api/v1/aggregations/air-quality?attribute=pm25`
+    - Hourly NO2: `/api/v1/aggregations/air-quality?attribute=no2&bucket=hour`
+    - pH per site: `/api/v1/aggregations/water-quality?attribute=pH&group_by=location`
+    - Daily CO2eq: `/api/v1/aggregations/carbon-footprint?attribute=CO2eq&bucket=day`
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Unknown dataset", "datasets": sorted(DATASETS)},
+        )
+    service, time_attribute, attributes = DATASETS[dataset]
+    if attribute not in attributes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Not a numeric attribute",
+                "attribute": attribute,
+                "attributes": sorted(attributes),
+            },
+        )
+
+    try:
+        points = [float(p) for p in percentiles.split(",") if p.strip()]
+        if any(p < 0 or p > 100 for p in points):
+            raise ValueError("percentiles must be between 0 and 100")
+        return await aggregate_attribute(
+            service,
+            attribute,
+            time_attribute,
+            start_time=start_time,
+            end_time=end_time,
+            q=q,
+            bucket=bucket,
+            group_by=group_by,
+            percentiles=points,
+            location_precision=location_precision,
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Invalid query parameters", "message": str(e)},
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Orion-LD error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+    except httpx.RequestError as e:
+        logger.error(f"Connection error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Service Unavailable"},
+        ) from e
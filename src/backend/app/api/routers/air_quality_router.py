@@ -7,9 +7,10 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import broker_stream_response, conditional_json_response
 from app.models.AirQualityObserved import AirQualityObserved
 from app.services.air_quality_service import air_quality_service
 
@@ -79,6 +80,10 @@ async def get_all_air_quality(
     attrs: Optional[str] = Query(
         None, description="Legacy - Comma-separated list of attributes to include"
     ),
+    fields: Optional[str] = Query(
+        None,
+        description="Attributes needed, comma-separated: returned as key-value pairs (pick + format=simplified)",
+    ),
     # Geo-spatial queries
     georel: Optional[str] = Query(
         None, description="Geo-relationship (e.g., 'near;maxDistance==5000')"
@@ -129,11 +134,33 @@ async def get_all_air_quality(
     - Geo-spatial query: `/api/v1/air-quality/?georel=near;maxDistance==5000&geometry=Point&coordinates=[-3.70,40.41]`
     """
     try:
+        if not count:
+            # Entities are returned unchanged: relay Orion's body as it streams
+            orion_response = await air_quality_service.stream_entities(
+                type=air_quality_service.entity_type,
+                id=id,
+                q=q,
+                pick=pick,
+                attrs=attrs,
+                fields=fields,
+                georel=georel,
+                geometry=geometry,
+                coordinates=coordinates,
+                geoproperty=geoproperty,
+                limit=limit,
+                offset=offset,
+                format=format,
+                options=options,
+                local=local,
+            )
+            return broker_stream_response(orion_response)
+
         result = await air_quality_service.get_all(
             id=id,
             q=q,
             pick=pick,
             attrs=attrs,
+            fields=fields,
             georel=georel,
             geometry=geometry,
             coordinates=coordinates,
@@ -180,6 +207,7 @@ async def get_all_air_quality(
     description="Retrieve a single AirQualityObserved entity by its full URN with optional attribute selection.",
 )
 async def get_air_quality_by_id(
+    request: Request,
     entity_id: str,
     pick: Optional[str] = Query(
         None, description="Preferred - Comma-separated list of attributes to select"
@@ -203,9 +231,10 @@ async def get_air_quality_by_id(
     - Get specific attrs: `/api/v1/air-quality/urn:ngsi-ld:AirQualityObserved:Madrid-001?pick=id,type,pm25&format=simplified`
     """
     try:
-        return await air_quality_service.get_by_id(
+        version = await air_quality_service.get_entity_version(
             entity_id, pick=pick, attrs=attrs, format=format, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
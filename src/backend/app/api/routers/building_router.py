@@ -7,9 +7,10 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import conditional_json_response
 from app.models.Building import Building
 from app.services.building_service import building_service
 
@@ -138,6 +139,7 @@ async def get_all_buildings(
     summary="Get Building by ID",
 )
 async def get_building_by_id(
+    request: Request,
     entity_id: str,
     pick: Optional[str] = Query(None),
     attrs: Optional[str] = Query(None),
@@ -146,9 +148,10 @@ async def get_building_by_id(
 ):
     """Retrieve a single Building entity by ID."""
     try:
-        return await building_service.get_by_id(
+        version = await building_service.get_entity_version(
             entity_id, pick=pick, attrs=attrs, format=format, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
@@ -7,9 +7,10 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import conditional_json_response
 from app.models.CarbonFootprint import CarbonFootprint
 from app.services.carbon_footprint_service import carbon_footprint_service
 
@@ -143,6 +144,7 @@ async def get_all_carbon_footprint(
     summary="Get CarbonFootprint by ID",
 )
 async def get_carbon_footprint_by_id(
+    request: Request,
     entity_id: str,
     pick: Optional[str] = Query(None),
     attrs: Optional[str] = Query(None),
@@ -151,9 +153,10 @@ async def get_carbon_footprint_by_id(
 ):
     """Retrieve a single CarbonFootprint entity by ID."""
     try:
-        return await carbon_footprint_service.get_by_id(
+        version = await carbon_footprint_service.get_entity_version(
             entity_id, pick=pick, attrs=attrs, format=format, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel, Field
+
+from app.services.air_quality_service import air_quality_service
+from app.services.building_service import building_service
+from app.services.carbon_footprint_service import carbon_footprint_service
+from app.services.device_service import device_service
+from app.services.fanout import QueryPart, fan_out
+from app.services.projection import Projection
+from app.services.road_segment_service import road_segment_service
+from app.services.traffic_enviroment_impact_service import (
+    traffic_environment_impact_service,
+)
+from app.services.traffic_flow_service import traffic_flow_service
+from app.services.water_quality_service import water_quality_service
+
+router = APIRouter(prefix="/api/v1/dashboard", tags=["Dashboard"])
+logger = logging.getLogger(__name__)
+
+# Entity type -> service answering its queries
+SERVICES = {
+    service.entity_type: service
+    for service in (
+        air_quality_service,
+        traffic_flow_service,
+        traffic_environment_impact_service,
+        device_service,
+        water_quality_service,
+        carbon_footprint_service,
+        road_segment_service,
+        building_service,
+    )
+}
+
+# Attributes the dashboard shows per type (pushed down as pick + keyValues)
+DASHBOARD_FIELDS = {
+    "AirQualityObserved": Projection(
+        "pm25", "pm10", "no2", "airQualityIndex", "dateObserved", "location"
+    ),
+    "TrafficFlowObserved": Projection(
+        "queues", "vehicleCount", "avgSpeed", "dateObservedTo", "refRoadSegment"
+    ),
+    "TrafficEnvironmentImpact": Projection(
+        "co2", "nox", "averageSpeed", "dateObservedTo"
+    ),
+    "Device": Projection("name", "category", "deviceState", "batteryLevel", "location"),
+}
+
+DEFAULT_TYPES = list(DASHBOARD_FIELDS)
+
+
+class PartQuery(BaseModel):
+    """One typed query of a composite request."""
+
+    type: str = Field(..., description="Entity type (e.g. AirQualityObserved)")
+    id: Optional[str] = None
+    q: Optional[str] = None
+    pick: Optional[str] = None
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="Attributes needed (sent as pick with format=simplified)",
+    )
+    georel: Optional[str] = None
+    geometry: Optional[str] = None
+    coordinates: Optional[str] = None
+    limit: Optional[int] = Field(default=None, ge=1, le=1000)
+    offset: Optional[int] = Field(default=None, ge=0)
+    format: Optional[str] = None
+    timeout: Optional[float] = Field(
+        default=None, gt=0, description="Deadline in seconds for this part"
+    )
+
+
+class CompositeQuery(BaseModel):
+    """Several typed queries answered in one request."""
+
+    parts: Dict[str, PartQuery] = Field(..., min_length=1)
+    timeout: Optional[float] = Field(
+        None, gt=0, description="Default per-part deadline in seconds"
+    )
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+
+
+def _part(name: str, query: PartQuery) -> QueryPart:
+    service = SERVICES.get(query.type)
+    if service is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Unsupported entity type",
+                "part": name,
+                "types": sorted(SERVICES),
+            },
+        )
+    return QueryPart(
+        name,
+        service,
+        query.model_dump(exclude={"type", "timeout"}),
+        timeout=query.timeout,
+    )
+
+
+@router.post(
+    "/query",
+    response_model=Dict[str, Any],
+    summary="Composite query over several entity types",
+    description="Run typed queries concurrently and return partial results with per-part status.",
+)
+async def composite_query(body: CompositeQuery):
+    """
+    Answer several typed queries in one round trip.
+
+    Parts run concurrently with their own deadline; a part that times out
+    or fails is reported with its status while the others are returned.
+
+    Example body:
+        {"parts": {"air": {"type": "AirQualityObserved", "pick": "id,pm25"},
+                   "devices": {"type": "Device", "limit": 50, "timeout": 1.0}}}
+    """
+    parts = [_part(name, query) for name, query in body.parts.items()]
+    return await fan_out(
+        parts, max_concurrency=body.max_concurrency, timeout=body.timeout
+    )
+
+
+@router.get(
+    "/",
+    response_model=Dict[str, Any],
+    summary="Dashboard snapshot",
+    description="Entities of the dashboard types, queried concurrently.",
+)
+async def dashboard_snapshot(
+    types: Optional[str] = Query(
+        None, description="Comma-separated entity types (default: dashboard types)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Entities per type"),
+    full: bool = Query(
+        False, description="All attributes instead of the dashboard fields"
+    ),
+    timeout: Optional[float] = Query(
+        None, gt=0, description="Per-type deadline in seconds"
+    ),
+):
+    """
+    Entities of each dashboard type, keyed by type.
+
+    Only the attributes in DASHBOARD_FIELDS are fetched, as key-value pairs,
+    unless `full` is set.
+
+    Example: `/api/v1/dashboard/?types=AirQualityObserved,Device&limit=20`
+    """
+    names = types.split(",") if types else DEFAULT_TYPES
+    parts = []
+    for name in names:
+        part = _part(name, PartQuery(type=name, limit=limit))
+        if not full and name in DASHBOARD_FIELDS:
+            part.query["fields"] = DASHBOARD_FIELDS[name]
+        parts.append(part)
+    return await fan_out(parts, timeout=timeout)
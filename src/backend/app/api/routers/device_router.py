@@ -7,9 +7,10 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import conditional_json_response
 from app.models.Device import Device
 from app.services.device_service import device_service
 
@@ -72,6 +73,10 @@ async def get_all_devices(
     attrs: Optional[str] = Query(
         None, description="Legacy - Comma-separated list of attributes"
     ),
+    fields: Optional[str] = Query(
+        None,
+        description="Attributes needed, comma-separated: returned as key-value pairs (pick + format=simplified)",
+    ),
     # Geo-spatial
     georel: Optional[str] = Query(None, description="Geo-relationship"),
     geometry: Optional[str] = Query(None, description="Geometry type"),
@@ -105,6 +110,7 @@ async def get_all_devices(
             q=q,
             pick=pick,
             attrs=attrs,
+            fields=fields,
             georel=georel,
             geometry=geometry,
             coordinates=coordinates,
@@ -142,6 +148,7 @@ async def get_all_devices(
     summary="Get Device by ID",
 )
 async def get_device_by_id(
+    request: Request,
     entity_id: str,
     pick: Optional[str] = Query(None),
     attrs: Optional[str] = Query(None),
@@ -150,9 +157,10 @@ async def get_device_by_id(
 ):
     """Retrieve a single Device entity by ID."""
     try:
-        return await device_service.get_by_id(
+        version = await device_service.get_entity_version(
             entity_id, pick=pick, attrs=attrs, format=format, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
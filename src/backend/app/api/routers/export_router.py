@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+from typing import Dict, Optional, Tuple, Type
+
+import httpx
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.api.responses import download_response
+from app.models.AirQualityObserved import AirQualityObserved
+from app.models.TrafficEnvironmentImpact import TrafficEnvironmentImpact
+from app.services import columnar_export
+from app.services.air_quality_service import air_quality_service
+from app.services.base_service import BaseService
+from app.services.traffic_enviroment_impact_service import (
+    traffic_environment_impact_service,
+)
+
+router = APIRouter(prefix="/api/v1/exports", tags=["Exports"])
+logger = logging.getLogger(__name__)
+
+# dataset -> (service, Smart Data Model, observation time attribute)
+DATASETS: Dict[str, Tuple[BaseService, Type[BaseModel], str]] = {
+    "air-quality": (air_quality_service, AirQualityObserved, "dateObserved"),
+    "traffic-environment-impact": (
+        traffic_environment_impact_service,
+        TrafficEnvironmentImpact,
+        "dateObservedFrom",
+    ),
+}
+
+
+@router.get(
+    "/{dataset}",
+    summary="Download a dataset as Parquet or Arrow",
+    description="Stream every matching entity as typed columns, ready for DataFrames.",
+)
+async def export_dataset(
+    dataset: str,
+    format: str = Query("parquet", description="'parquet' or 'arrow' (IPC stream)"),
+    start_time: Optional[str] = Query(
+        None, description="Start time (ISO8601), inclusive"
+    ),
+    end_time: Optional[str] = Query(None, description="End time (ISO8601), inclusive"),
+    q: Optional[str] = Query(None, description="Additional query filter"),
+    columns: Optional[str] = Query(
+        None, description="Comma-separated attributes to export (default: all)"
+    ),
+):
+    """
+    Export a dataset with NGSI-LD Properties/Relationships flattened into
+    typed columns (floats, UTC timestamps, strings; GeoJSON and structured
+    values as JSON text, Point locations also as location_lon/location_lat).
+
+    Examples:
+    - A month of air quality: `/api/v1/exports/air-quality?start_time=2025-01-01T00:00:00Z&end_time=2025-01-31T23:59:59Z`
+    - Arrow stream of CO2: `/api/v1/exports/traffic-environment-impact?format=arrow&columns=co2,dateObservedFrom,location`
+
+    Usage (pandas):
+        df = pd.read_parquet("http://backend:8000/api/v1/exports/air-quality")
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Unknown dataset", "datasets": sorted(DATASETS)},
+        )
+    if not columnar_export._PYARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"error": "Columnar export requires pyarrow on the server"},
+        )
+    if format not in columnar_export.EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Unknown format",
+                "formats": sorted(columnar_export.EXPORT_FORMATS),
+            },
+        )
+    service, model, time_attribute = DATASETS[dataset]
+    media_type, extension = columnar_export.EXPORT_FORMATS[format]
+
+    filters = [q] if q else []
+    if start_time:
+        filters.append(f'{time_attribute}>="{start_time}"')
+    if end_time:
+        filters.append(f'{time_attribute}<="{end_time}"')
+
+    try:
+        chunks = columnar_export.export_columnar(
+            service,
+            model,
+            export_format=format,
+            columns=[c.strip() for c in columns.split(",") if c.strip()]
+            if columns
+            else None,
+            q=";".join(filters) or None,
+        )
+        return await download_response(
+            chunks, media_type, filename=f"{dataset}.{extension}"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Invalid export parameters", "message": str(e)},
+        ) from e
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Orion-LD error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+    except httpx.RequestError as e:
+        logger.error(f"Connection error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": "Service Unavailable"},
+        ) from e
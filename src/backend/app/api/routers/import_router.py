@@ -0,0 +1,159 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services import bulk_import
+
+router = APIRouter(prefix="/api/v1/imports", tags=["Imports"])
+logger = logging.getLogger(__name__)
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={
+            "error": "Upload too large",
+            "maxBytes": settings.import_max_upload_bytes,
+        },
+    )
+
+
+async def _spool(request: Request, path: str) -> int:
+    """Write the request body to `path` off the event loop; returns its size."""
+    limit = settings.import_max_upload_bytes
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise _too_large()
+
+    upload = await run_in_threadpool(open, path, "wb")
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > limit:
+                raise _too_large()
+            await run_in_threadpool(upload.write, chunk)
+    except BaseException:
+        await run_in_threadpool(upload.close)
+        await run_in_threadpool(os.remove, path)
+        raise
+    await run_in_threadpool(upload.close)
+    return size
+
+
+def _check_options(options: str) -> None:
+    if options not in ("update", "replace"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "options must be 'update' or 'replace'"},
+        )
+
+
+@router.post(
+    "/{dataset}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=Dict[str, Any],
+    summary="Import an NDJSON or CSV file",
+    description="Upload rows as the request body; they are validated and upserted in the background.",
+)
+async def import_dataset(
+    request: Request,
+    dataset: str,
+    format: str = Query(..., description="'ndjson' or 'csv'"),
+    options: str = Query(
+        "update", description="'update' keeps other attributes, 'replace' drops them"
+    ),
+):
+    """
+    Import a large file of entities. The body is spooled to disk as it
+    arrives (at most settings.import_max_upload_bytes, else 413), then rows
+    are validated against the dataset's Smart Data Model and upserted in
+    chunks. Poll the returned status URL for progress; an
+    interrupted import is continued with POST /{import_id}/resume.
+
+    Examples:
+    - `curl -X POST --data-binary @day.csv "/api/v1/imports/air-quality?format=csv"`
+    - `curl -X POST -H "Content-Type: application/x-ndjson" --data-binary @devices.ndjson "/api/v1/imports/devices?format=ndjson"`
+    """
+    if dataset not in bulk_import.DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Unknown dataset",
+                "datasets": sorted(bulk_import.DATASETS),
+            },
+        )
+    if format not in bulk_import.ROW_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Unknown format",
+                "formats": list(bulk_import.ROW_FORMATS),
+            },
+        )
+    _check_options(options)
+
+    import_id = bulk_import.new_import_id()
+    path, _ = bulk_import.import_paths(import_id, format)
+    os.makedirs(settings.import_directory, exist_ok=True)
+    size = await _spool(request, path)
+    logger.info(f"Import {import_id}: received {size} bytes of {dataset} {format}")
+
+    report = bulk_import.start_import(import_id, dataset, format, options=options)
+    return {
+        "importId": import_id,
+        "statusUrl": f"{router.prefix}/{import_id}",
+        **report.to_dict(),
+    }
+
+
+@router.get(
+    "/{import_id}",
+    response_model=Dict[str, Any],
+    summary="Get the progress of an import",
+)
+async def get_import(import_id: str):
+    """Counters, status and the first invalid rows of an import."""
+    report = bulk_import.find_import(import_id)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Import not found", "importId": import_id},
+        )
+    return {"importId": import_id, **report.to_dict()}
+
+
+@router.post(
+    "/{import_id}/resume",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=Dict[str, Any],
+    summary="Resume an interrupted import",
+)
+async def resume_import(
+    import_id: str,
+    options: str = Query("update", description="'update' or 'replace'"),
+):
+    """Continue an import after its last checkpoint (e.g. after a restart)."""
+    _check_options(options)
+    try:
+        report = bulk_import.resume_import(import_id, options=options)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": str(e), "importId": import_id},
+        ) from e
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Import not found", "importId": import_id},
+        )
+    return {"importId": import_id, **report.to_dict()}
@@ -7,9 +7,15 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import (
+    broker_stream_response,
+    conditional_json_response,
+    ndjson_response,
+    wants_ndjson,
+)
 from app.models.RoadSegment import RoadSegment
 from app.services.road_segment_service import road_segment_service
 
@@ -62,6 +68,7 @@ class BatchDeleteRequest(BaseModel):
     description="Retrieve a list of RoadSegment entities with advanced filtering, pagination, and formatting options.",
 )
 async def get_all_road_segments(
+    request: Request,
     # Filtering
     id: Optional[str] = Query(
         None,
@@ -133,8 +140,49 @@ async def get_all_road_segments(
         - Get count only: GET /?count=true
         - Get simplified format: GET /?format=simplified&pick=id,type,roadName
         - Geo-spatial query: GET /?georel=near;maxDistance==2000&geometry=Point&coordinates=[-3.7038,40.4168]
+        - Stream every match, one entity per line: GET / with 'Accept: application/x-ndjson'
     """
     try:
+        if not count and wants_ndjson(request):
+            # Walks all pages; 'limit' caps the total instead of one page
+            pages = road_segment_service.iter_pages(
+                type=road_segment_service.entity_type,
+                id=id,
+                q=q,
+                pick=pick,
+                attrs=attrs,
+                georel=georel,
+                geometry=geometry,
+                coordinates=coordinates,
+                geoproperty=geoproperty,
+                limit=limit,
+                offset=offset,
+                format=format,
+                options=options,
+                local=local,
+            )
+            return await ndjson_response(pages, road_segment_service.serializer)
+
+        if not count:
+            # Entities are returned unchanged: relay Orion's body as it streams
+            orion_response = await road_segment_service.stream_entities(
+                type=road_segment_service.entity_type,
+                id=id,
+                q=q,
+                pick=pick,
+                attrs=attrs,
+                georel=georel,
+                geometry=geometry,
+                coordinates=coordinates,
+                geoproperty=geoproperty,
+                limit=limit,
+                offset=offset,
+                format=format,
+                options=options,
+                local=local,
+            )
+            return broker_stream_response(orion_response)
+
         return await road_segment_service.get_all(
             id=id,
             q=q,
@@ -172,6 +220,7 @@ async def get_all_road_segments(
     description="Retrieve a specific RoadSegment entity by its unique identifier.",
 )
 async def get_road_segment_by_id(
+    request: Request,
     entity_id: str,
     attrs: Optional[str] = Query(
         None,
@@ -191,9 +240,10 @@ async def get_road_segment_by_id(
         - Get in key-value format: GET /urn:ngsi-ld:RoadSegment:001?option=keyValues
     """
     try:
-        return await road_segment_service.get_by_id(
-            entity_id=entity_id, attrs=attrs, options=options
+        version = await road_segment_service.get_entity_version(
+            entity_id, attrs=attrs, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
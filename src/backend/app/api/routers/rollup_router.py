@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.services.rollup_store import METRIC_NAMES, rollup_store
+
+router = APIRouter(prefix="/api/v1/rollups", tags=["Traffic KPI Rollups"])
+logger = logging.getLogger(__name__)
+
+
+def _metrics(metrics: Optional[str]) -> Optional[List[str]]:
+    if not metrics:
+        return None
+    names = [m for m in metrics.split(",") if m]
+    unknown = [m for m in names if m not in METRIC_NAMES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Unknown metrics", "metrics": unknown},
+        )
+    return names
+
+
+def _not_found(intersection: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail={"error": "No rollups for intersection", "intersection": intersection},
+    )
+
+
+@router.get(
+    "/",
+    response_model=Dict[str, Any],
+    summary="List intersections with traffic KPI rollups",
+)
+async def list_rollups():
+    """Intersections with recorded KPIs and the bucket layout."""
+    return {"intersections": rollup_store.intersections(), **rollup_store.stats()}
+
+
+@router.get(
+    "/{intersection}/summary",
+    response_model=Dict[str, Any],
+    summary="Traffic KPIs of an intersection over a time range",
+)
+async def get_rollup_summary(
+    intersection: str,
+    start_time: Optional[str] = Query(None, description="Start time (ISO8601)"),
+    end_time: Optional[str] = Query(None, description="End time (ISO8601)"),
+    metrics: Optional[str] = Query(
+        None, description="Comma-separated KPIs (queueLength,avgSpeed,co2,nox)"
+    ),
+):
+    """
+    Queue length, average speed, CO2 and NOx combined over the buckets in range.
+
+    Example: `/api/v1/rollups/Nga4ThuDuc/summary?start_time=2025-11-17T00:00:00Z`
+    """
+    try:
+        summary = rollup_store.summary(
+            intersection, start_time, end_time, _metrics(metrics)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Invalid query parameters", "message": str(e)},
+        ) from e
+    if summary is None:
+        raise _not_found(intersection)
+    return {"intersection": intersection, **summary}
+
+
+@router.get(
+    "/{intersection}",
+    response_model=Dict[str, Any],
+    summary="Bucketed traffic KPIs of an intersection",
+)
+async def get_rollup_series(
+    intersection: str,
+    start_time: Optional[str] = Query(None, description="Start time (ISO8601)"),
+    end_time: Optional[str] = Query(None, description="End time (ISO8601)"),
+    metrics: Optional[str] = Query(
+        None, description="Comma-separated KPIs (queueLength,avgSpeed,co2,nox)"
+    ),
+):
+    """
+    Per-bucket count/mean/min/max of each KPI, oldest first.
+
+    Example: `/api/v1/rollups/Nga4ThuDuc?metrics=queueLength,co2`
+    """
+    try:
+        buckets = rollup_store.series(
+            intersection, start_time, end_time, _metrics(metrics)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "Invalid query parameters", "message": str(e)},
+        ) from e
+    if buckets is None:
+        raise _not_found(intersection)
+    return {
+        "intersection": intersection,
+        "bucket_seconds": rollup_store.bucket_seconds,
+        "buckets": buckets,
+    }
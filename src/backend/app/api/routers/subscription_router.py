@@ -10,6 +10,10 @@ import httpx
 from fastapi import APIRouter, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 
+from app.services.entity_cache import entity_cache
+from app.services.historical_service import historical_service
+from app.services.rollup_store import rollup_store
+from app.services.spatial_index import get_spatial_index
 from app.services.subscription_service import subscription_service
 
 router = APIRouter(prefix="/api/v1/subscriptions", tags=["Subscriptions"])
@@ -263,3 +267,187 @@ async def quick_subscribe_entity_type(
         raise HTTPException(
             status_code=e.response.status_code, detail=e.response.json()
         ) from e
+
+
+@router.post("/quick/cache-invalidation", status_code=status.HTTP_201_CREATED)
+async def quick_subscribe_cache_invalidation(
+    entity_types: Optional[str] = Query(
+        None, description="Comma-separated entity types (default: all cached types)"
+    ),
+    notification_uri: Optional[str] = Query(
+        None, description="Notification endpoint (default from settings)"
+    ),
+):
+    """
+    Subscribe the backend entity cache to changes of cached entity types.
+
+    Example: /api/v1/subscriptions/quick/cache-invalidation?entity_types=Building,RoadSegment
+    """
+    try:
+        types_list = entity_types.split(",") if entity_types else None
+
+        orion_responses = await subscription_service.subscribe_cache_invalidation(
+            entity_types=types_list, notification_uri=notification_uri
+        )
+
+        return {
+            "message": "Cache invalidation subscriptions created",
+            "ids": [
+                r.headers.get("Location", "").split("/")[-1] for r in orion_responses
+            ],
+        }
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+
+
+@router.post("/quick/history", status_code=status.HTTP_201_CREATED)
+async def quick_subscribe_history(
+    entity_types: Optional[str] = Query(
+        None, description="Comma-separated entity types (default from settings)"
+    ),
+    notification_uri: Optional[str] = Query(
+        None, description="QuantumLeap notify endpoint (default from settings)"
+    ),
+):
+    """
+    Subscribe QuantumLeap to entity changes so historical queries have data.
+
+    Example: /api/v1/subscriptions/quick/history?entity_types=CarbonFootprint
+    """
+    try:
+        types_list = entity_types.split(",") if entity_types else None
+
+        orion_responses = await subscription_service.subscribe_history(
+            entity_types=types_list, notification_uri=notification_uri
+        )
+
+        return {
+            "message": "History subscriptions created",
+            "ids": [
+                r.headers.get("Location", "").split("/")[-1] for r in orion_responses
+            ],
+        }
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+
+
+@router.post("/quick/spatial-index", status_code=status.HTTP_201_CREATED)
+async def quick_subscribe_spatial_index(
+    entity_types: Optional[str] = Query(
+        None, description="Comma-separated entity types (default from settings)"
+    ),
+    notification_uri: Optional[str] = Query(
+        None, description="Notification endpoint (default from settings)"
+    ),
+):
+    """
+    Subscribe the local spatial index to changes of the indexed entity types.
+
+    Example: /api/v1/subscriptions/quick/spatial-index?entity_types=RoadSegment
+    """
+    try:
+        types_list = entity_types.split(",") if entity_types else None
+
+        orion_responses = await subscription_service.subscribe_spatial_index(
+            entity_types=types_list, notification_uri=notification_uri
+        )
+
+        return {
+            "message": "Spatial index subscriptions created",
+            "ids": [
+                r.headers.get("Location", "").split("/")[-1] for r in orion_responses
+            ],
+        }
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+
+
+@router.post("/quick/rollups", status_code=status.HTTP_201_CREATED)
+async def quick_subscribe_rollups(
+    entity_types: Optional[str] = Query(
+        None, description="Comma-separated entity types (default from settings)"
+    ),
+    notification_uri: Optional[str] = Query(
+        None, description="Notification endpoint (default from settings)"
+    ),
+):
+    """
+    Subscribe the traffic KPI rollups to new traffic observations.
+
+    Example: /api/v1/subscriptions/quick/rollups
+    """
+    try:
+        types_list = entity_types.split(",") if entity_types else None
+
+        orion_responses = await subscription_service.subscribe_rollups(
+            entity_types=types_list, notification_uri=notification_uri
+        )
+
+        return {
+            "message": "Rollup subscriptions created",
+            "ids": [
+                r.headers.get("Location", "").split("/")[-1] for r in orion_responses
+            ],
+        }
+
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail=e.response.json()
+        ) from e
+
+
+@router.post("/notify/history", status_code=status.HTTP_200_OK)
+async def receive_history_notification(notification: Dict[str, Any]):
+    """
+    Record notified entities in the in-memory QuantumLeap stand-in.
+
+    Only used with settings.history_backend = "memory"; point subscribe_history
+    at this endpoint instead of QuantumLeap's /v2/notify.
+    """
+    if historical_service.store is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "History is stored by QuantumLeap, not the backend"},
+        )
+    recorded = historical_service.store.ingest(notification.get("data", []))
+    return {"status": "ok", "recorded": recorded}
+
+
+@router.post("/notify/spatial", status_code=status.HTTP_200_OK)
+async def receive_spatial_index_notification(notification: Dict[str, Any]):
+    """
+    Apply notified entity changes to the local spatial indexes.
+    """
+    applied = 0
+    for entity_type in {e.get("type") for e in notification.get("data", [])}:
+        index = get_spatial_index(entity_type)
+        if index is not None:
+            applied += index.handle_notification(notification)
+    return {"status": "ok", "applied": applied}
+
+
+@router.post("/notify/rollups", status_code=status.HTTP_200_OK)
+async def receive_rollup_notification(notification: Dict[str, Any]):
+    """
+    Fold notified traffic observations into the per-intersection KPI rollups.
+    """
+    recorded = rollup_store.ingest(notification.get("data", []))
+    return {"status": "ok", "recorded": recorded}
+
+
+@router.post("/notify/cache", status_code=status.HTTP_200_OK)
+async def receive_cache_invalidation(notification: Dict[str, Any]):
+    """
+    Receive NGSI-LD notifications and drop the notified entities from the cache.
+    """
+    invalidated = entity_cache.handle_notification(notification)
+    return {"status": "ok", "invalidated": invalidated, **entity_cache.stats()}
@@ -11,26 +11,41 @@ Hỗ trợ 2 modes:
 2. Start new SUMO instance (cần SUMO_HOME)
 
 Updated: 2025-11-30 - Added TraCI connector support
+
+Once connected, a SimulationWorker thread owns the TraCI connection: it
+steps the simulation in the background and every TraCI call below runs on
+it, so requests never block the event loop. GET /sumo/state reads the
+latest published snapshot; /sumo/socket pushes every new one (WebSocket,
+or Server-Sent Events for plain GET requests).
+
+Several simulations can run side by side (SimulationManager). The routes
+below act on the "default" simulation; the same routes under
+/sumo/simulations/{simulation_id}/... act on any other one.
 """
+import asyncio
 import logging
 import os
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+from app.sumo_rl.agents.compact_state import encode_stream
+from app.sumo_rl.agents.simulation_manager import (
+    DEFAULT_SIMULATION,
+    Simulation,
+    simulation_manager,
+)
 from app.sumo_rl.agents.smart_traffic_controller import SmartTrafficController
-from app.sumo_rl.agents.traci_connector import TraCIConnector
 
 router = APIRouter(prefix="/sumo", tags=["SUMO Control"])
 logger = logging.getLogger(__name__)
 
-# Global TraCI connector instance (singleton)
-traci_connector: Optional[TraCIConnector] = None
-
-# Smart controllers for each traffic light (one per TLS)
-smart_controllers: Dict[str, SmartTrafficController] = {}
+# Per-simulation routes: /sumo/simulations/{simulation_id}/<route>
+SIMULATION_PREFIX = "/simulations/{simulation_id}"
 
 
 class ConnectSimulationRequest(BaseModel):
@@ -38,6 +53,7 @@ class ConnectSimulationRequest(BaseModel):
     host: str = "localhost"
     port: int = 8813
     scenario: str = "Nga4ThuDuc"
+    simulation_id: str = DEFAULT_SIMULATION
 
 
 class StartSimulationRequest(BaseModel):
@@ -47,6 +63,14 @@ class StartSimulationRequest(BaseModel):
     port: int = 8813
 
 
+class LaunchSimulationRequest(BaseModel):
+    """Launch one more local SUMO instance, next to the running ones"""
+    scenario: str = "Nga4ThuDuc"
+    simulation_id: Optional[str] = None  # Default: the scenario name
+    gui: bool = False
+    port: Optional[int] = None  # Default: any free port
+
+
 class SetPhaseRequest(BaseModel):
     phase_index: int
 
@@ -57,6 +81,26 @@ class SetPhaseWithCountdownRequest(BaseModel):
     countdown_seconds: int = 5  # Default 5 seconds countdown
 
 
+class SetSpeedRequest(BaseModel):
+    """Simulated seconds per wall-clock second (0 = step only on POST /sumo/step)"""
+    real_time_factor: float
+
+
+def _require_simulation(simulation_id: str = DEFAULT_SIMULATION) -> Simulation:
+    """Return the running simulation, or raise 400 (default) / 404 (by ID)"""
+    simulation = simulation_manager.get(simulation_id)
+    if simulation is None:
+        if simulation_id == DEFAULT_SIMULATION:
+            raise HTTPException(status_code=400, detail="No simulation connected")
+        raise HTTPException(status_code=404, detail=f"Simulation '{simulation_id}' not found")
+    return simulation
+
+
+async def shutdown_simulation() -> None:
+    """Stop every simulation on application shutdown"""
+    await simulation_manager.stop_all()
+
+
 def start_sumo_on_host(scenario: str) -> bool:
     """
     Start SUMO on host machine via HTTP service
@@ -113,35 +157,32 @@ async def connect_to_simulation(request: ConnectSimulationRequest):
     - Nga4ThuDuc: Ngã tư Thủ Đức (4-way intersection)
     - NguyenThaiSon: Ngã 6 Nguyễn Thái Sơn (6-way intersection)
     - QuangTrung: Quang Trung (Complex intersection)
-    """
-    global traci_connector
     
+    Pass simulation_id to connect an additional simulation instead of
+    replacing the default one.
+    """
     try:
-        # Create connector if not exists
-        if traci_connector is None:
-            traci_connector = TraCIConnector()
-        
-        # Connect to SUMO
-        success = traci_connector.connect(
-            host=request.host,
-            port=request.port,
-            scenario=request.scenario
-        )
-        
-        if not success:
+        # Connect to SUMO (blocks up to ~10s while TraCI retries)
+        try:
+            simulation = await simulation_manager.connect(
+                host=request.host,
+                port=request.port,
+                scenario=request.scenario,
+                simulation_id=request.simulation_id
+            )
+        except RuntimeError as e:
             raise HTTPException(
                 status_code=500,
-                detail="Failed to connect to SUMO. Make sure SUMO is running with --remote-port 8813"
-            )
+                detail=f"{e}. Make sure SUMO is running with --remote-port {request.port}"
+            ) from e
         
         # Get initial state
-        state = traci_connector.get_traffic_state()
-        scenario_info = traci_connector.get_scenario_info()
+        state = await simulation.worker.call(simulation.connector.get_traffic_state)
         
         return {
             "status": "connected",
             "message": "Successfully connected to SUMO",
-            **scenario_info,
+            **simulation.info(),
             "initial_state": state
         }
         
@@ -160,12 +201,15 @@ async def start_simulation(request: StartSimulationRequest):
     Attempts:
     1. Start on Host (via starter service)
     2. Fallback: Connect directly to 'sumo-simulation' container
-    """
-    global traci_connector
     
+    Replaces the default simulation; use POST /sumo/simulations to run
+    scenarios side by side.
+    """
     # Track errors to report if all methods fail
     errors = []
     
+    await simulation_manager.stop(DEFAULT_SIMULATION)
+    
     # HOT SWAP TRIGGER
     # Write requested scenario to shared volume to trigger SUMO hot-reload if needed
     try:
@@ -186,32 +230,26 @@ async def start_simulation(request: StartSimulationRequest):
             
             # Wait a bit for the launcher to restart SUMO
             logger.info("Waiting for SUMO to restart with new scenario...")
-            time.sleep(5) 
+            await asyncio.sleep(5)
     except Exception as e:
         logger.warning(f"Failed to write hot-swap trigger file: {e}")
 
     # METHOD 1: Try Host Starter Service
     try:
         logger.info("Method 1: Attempting to start SUMO on host via starter service...")
-        if start_sumo_on_host(request.scenario):
+        if await run_in_threadpool(start_sumo_on_host, request.scenario):
             logger.info("Host starter service returned success. Waiting for initialization...")
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # Connect via TraCI using Docker Bridge IP
-            if traci_connector is None:
-                traci_connector = TraCIConnector()
-            elif traci_connector.is_connected():
-                traci_connector.close()
-                
-            success = traci_connector.connect(
-                host="172.17.0.1",
-                port=request.port,
-                scenario=request.scenario
-            )
-            
-            if success:
-                return _build_connection_response(request.scenario, "connected_host")
-            else:
+            try:
+                simulation = await simulation_manager.connect(
+                    host="172.17.0.1",
+                    port=request.port,
+                    scenario=request.scenario
+                )
+                return await _build_connection_response(simulation, request.scenario, "connected_host")
+            except RuntimeError:
                  errors.append("Host starter succeeded but TraCI connection failed")
         else:
              errors.append("Host starter service returned failure")
@@ -223,24 +261,18 @@ async def start_simulation(request: StartSimulationRequest):
     # METHOD 2: Fallback to Direct Container Connection (Headless/Containerized)
     logger.info("Method 2: Falling back to direct container connection (sumo-simulation)...")
     try:
-        if traci_connector is None:
-            traci_connector = TraCIConnector()
-        elif traci_connector.is_connected():
-            traci_connector.close()
-            
         target_host = os.getenv("SUMO_HOST", "sumo-simulation")
         
         # Determine port - if running in same network, use 8813
         # If testing locally outside docker, might need localhost
-        success = traci_connector.connect(
-            host=target_host,
-            port=request.port, # default 8813
-            scenario=request.scenario
-        )
-        
-        if success:
-            return _build_connection_response(request.scenario, "connected_container_fallback")
-        else:
+        try:
+            simulation = await simulation_manager.connect(
+                host=target_host,
+                port=request.port, # default 8813
+                scenario=request.scenario
+            )
+            return await _build_connection_response(simulation, request.scenario, "connected_container_fallback")
+        except RuntimeError:
             errors.append(f"Direct connection to {target_host}:{request.port} failed")
             
     except Exception as e:
@@ -255,30 +287,58 @@ async def start_simulation(request: StartSimulationRequest):
         detail=f"Failed to start/connect to SUMO. Details: {error_msg}"
     )
 
-def _build_connection_response(scenario, mode):
-    global traci_connector
-    state = traci_connector.get_traffic_state()
-    scenario_info = traci_connector.get_scenario_info()
+async def _build_connection_response(simulation: Simulation, scenario, mode):
+    state = await simulation.worker.call(simulation.connector.get_traffic_state)
     return {
         "status": "connected",
         "mode": mode,
         "message": f"Successfully connected to SUMO scenario {scenario}",
-        **scenario_info,
+        **simulation.info(),
         "initial_state": state
     }
 
 
+@router.post("/simulations")
+async def launch_simulation(request: LaunchSimulationRequest):
+    """
+    Launch a local SUMO instance alongside the running ones (requires SUMO_HOME)
+    
+    Each simulation gets its own process, port and TraCI connection; address
+    it with /sumo/simulations/{simulation_id}/state, /step, /set-phase, ...
+    """
+    try:
+        simulation = await simulation_manager.launch(
+            request.scenario,
+            simulation_id=request.simulation_id,
+            gui=request.gui,
+            port=request.port
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    
+    return await _build_connection_response(simulation, request.scenario, "launched")
+
+
+@router.get("/simulations")
+async def list_simulations():
+    """List all simulations managed by this backend"""
+    simulations = [simulation.info() for simulation in simulation_manager.list()]
+    return {
+        "simulations": simulations,
+        "total": len(simulations),
+        "max_simulations": simulation_manager.max_simulations
+    }
+
+
 
 @router.post("/stop")
-async def stop_simulation():
+@router.post(SIMULATION_PREFIX + "/stop")
+@router.delete(SIMULATION_PREFIX)
+async def stop_simulation(simulation_id: str = DEFAULT_SIMULATION):
     """Disconnect from SUMO simulation"""
-    global traci_connector
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
-        
-        traci_connector.close()
+        _require_simulation(simulation_id)
+        await simulation_manager.stop(simulation_id)
         
         return {"status": "disconnected"}
         
@@ -290,24 +350,20 @@ async def stop_simulation():
 
 
 @router.post("/step")
-async def simulation_step():
-    """Execute one simulation step"""
-    global traci_connector
-    
+@router.post(SIMULATION_PREFIX + "/step")
+async def simulation_step(simulation_id: str = DEFAULT_SIMULATION):
+    """Execute one simulation step (on top of background stepping, if enabled)"""
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
+        worker = _require_simulation(simulation_id).worker
         
-        sim_time = traci_connector.step()
-        if sim_time is None:
+        snapshot = await worker.call(worker.step)
+        if snapshot is None:
             raise HTTPException(status_code=500, detail="Failed to step simulation")
         
-        state = traci_connector.get_traffic_state()
-        
         return {
             "status": "ok",
-            "time": sim_time,
-            "state": state
+            "time": snapshot.simulation_time,
+            "state": snapshot.state
         }
         
     except HTTPException:
@@ -318,23 +374,23 @@ async def simulation_step():
 
 
 @router.get("/state")
-async def get_current_state():
+@router.get(SIMULATION_PREFIX + "/state")
+async def get_current_state(simulation_id: str = DEFAULT_SIMULATION):
     """
     Get current traffic state from SUMO
     Returns real-time metrics: vehicle count, speed, occupancy, etc.
-    """
-    global traci_connector
     
+    Reads the latest snapshot published by the simulation worker - no TraCI call.
+    """
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
+        worker = _require_simulation(simulation_id).worker
         
-        state = traci_connector.get_traffic_state()
+        snapshot = worker.latest()
         
-        if state is None:
-            raise HTTPException(status_code=500, detail="Failed to get traffic state")
+        if snapshot is None or worker.error:
+            raise HTTPException(status_code=500, detail=worker.error or "Failed to get traffic state")
         
-        return state
+        return snapshot.state
         
     except HTTPException:
         raise
@@ -343,8 +399,33 @@ async def get_current_state():
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/snapshots")
+@router.get(SIMULATION_PREFIX + "/snapshots")
+async def export_snapshots(simulation_id: str = DEFAULT_SIMULATION, since: int = 0):
+    """
+    Recent snapshots (seq > since) as a binary delta stream
+    
+    The body is a sequence of frames, each prefixed with its length as a
+    little-endian uint32: a keyframe with the full state, then frames with
+    only what changed since the one before (see compact_state.py, which
+    also decodes them). Keep the X-Last-Seq header to continue with
+    ?since=<seq> later.
+    """
+    worker = _require_simulation(simulation_id).worker
+    snapshots = worker.snapshots(since)
+    
+    body = await run_in_threadpool(encode_stream, [s.compact for s in snapshots])
+    
+    return Response(
+        content=body,
+        media_type="application/octet-stream",
+        headers={"X-Last-Seq": str(snapshots[-1].seq if snapshots else since)}
+    )
+
+
 @router.post("/set-phase")
-async def set_traffic_light_phase(request: SetPhaseRequest):
+@router.post(SIMULATION_PREFIX + "/set-phase")
+async def set_traffic_light_phase(request: SetPhaseRequest, simulation_id: str = DEFAULT_SIMULATION):
     """
     Manually set traffic light phase with SAFE TRANSITIONS
     
@@ -353,18 +434,16 @@ async def set_traffic_light_phase(request: SetPhaseRequest):
     
     Phase indices vary by scenario - use GET /sumo/phases to see available phases
     """
-    global traci_connector
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
+        simulation = _require_simulation(simulation_id)
+        worker, connector = simulation.worker, simulation.connector
         
-        success = traci_connector.set_phase(request.phase_index)
+        success = await worker.call(connector.set_phase, request.phase_index)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to set phase")
         
-        state = traci_connector.get_traffic_state()
+        state = await worker.call(connector.get_traffic_state)
         
         return {
             "status": "ok",
@@ -381,7 +460,8 @@ async def set_traffic_light_phase(request: SetPhaseRequest):
 
 
 @router.get("/phases")
-async def get_traffic_light_phases():
+@router.get(SIMULATION_PREFIX + "/phases")
+async def get_traffic_light_phases(simulation_id: str = DEFAULT_SIMULATION):
     """
     Get all available traffic light phases for current scenario
     
@@ -391,53 +471,53 @@ async def get_traffic_light_phases():
     - Duration
     - Min/Max durations
     """
-    global traci_connector
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
-        
-        import traci
+        simulation = _require_simulation(simulation_id)
+        connector = simulation.connector
         
-        tls_id = traci_connector.tls_id
-        all_programs = traci.trafficlight.getAllProgramLogics(tls_id)
-        
-        if not all_programs:
-            raise HTTPException(status_code=500, detail="No signal program found")
-        
-        program = all_programs[0]
-        phases_info = []
-        
-        for idx, phase in enumerate(program.phases):
-            # Interpret the phase state
-            phase_type = "unknown"
-            if 'G' in phase.state or 'g' in phase.state:
-                if 'y' not in phase.state.lower():
-                    phase_type = "green"
-                else:
-                    phase_type = "transition"
-            elif 'y' in phase.state.lower():
-                phase_type = "yellow"
-            elif 'r' in phase.state or 'R' in phase.state:
-                phase_type = "red"
+        def read_phases():
+            traci = connector.connection
+            tls_id = connector.tls_id
+            all_programs = traci.trafficlight.getAllProgramLogics(tls_id)
             
-            phases_info.append({
-                "index": idx,
-                "state": phase.state,
-                "type": phase_type,
-                "duration": phase.duration,
-                "minDur": phase.minDur,
-                "maxDur": phase.maxDur,
-                "description": f"Phase {idx} - {phase_type}"
-            })
-        
-        return {
-            "tls_id": tls_id,
-            "program_id": program.programID,
-            "current_phase": traci.trafficlight.getPhase(tls_id),
-            "phases": phases_info,
-            "total_phases": len(phases_info)
-        }
+            if not all_programs:
+                raise HTTPException(status_code=500, detail="No signal program found")
+            
+            program = all_programs[0]
+            phases_info = []
+            
+            for idx, phase in enumerate(program.phases):
+                # Interpret the phase state
+                phase_type = "unknown"
+                if 'G' in phase.state or 'g' in phase.state:
+                    if 'y' not in phase.state.lower():
+                        phase_type = "green"
+                    else:
+                        phase_type = "transition"
+                elif 'y' in phase.state.lower():
+                    phase_type = "yellow"
+                elif 'r' in phase.state or 'R' in phase.state:
+                    phase_type = "red"
+                
+                phases_info.append({
+                    "index": idx,
+                    "state": phase.state,
+                    "type": phase_type,
+                    "duration": phase.duration,
+                    "minDur": phase.minDur,
+                    "maxDur": phase.maxDur,
+                    "description": f"Phase {idx} - {phase_type}"
+                })
+            
+            return {
+                "tls_id": tls_id,
+                "program_id": program.programID,
+                "current_phase": traci.trafficlight.getPhase(tls_id),
+                "phases": phases_info,
+                "total_phases": len(phases_info)
+            }
+            
+        return await simulation.worker.call(read_phases)
         
     except HTTPException:
         raise
@@ -447,7 +527,8 @@ async def get_traffic_light_phases():
 
 
 @router.post("/set-phase-countdown")
-async def set_phase_with_countdown(request: SetPhaseWithCountdownRequest):
+@router.post(SIMULATION_PREFIX + "/set-phase-countdown")
+async def set_phase_with_countdown(request: SetPhaseWithCountdownRequest, simulation_id: str = DEFAULT_SIMULATION):
     """
     Set traffic light phase with COUNTDOWN TIMER for maximum safety
     
@@ -458,11 +539,8 @@ async def set_phase_with_countdown(request: SetPhaseWithCountdownRequest):
     
     This prevents sudden braking and accidents!
     """
-    global traci_connector
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
+        _require_simulation(simulation_id)
         
         # Return countdown status - actual phase change happens on frontend after countdown
         return {
@@ -480,7 +558,8 @@ async def set_phase_with_countdown(request: SetPhaseWithCountdownRequest):
 
 
 @router.post("/ai-control")
-async def enable_ai_traffic_control():
+@router.post(SIMULATION_PREFIX + "/ai-control")
+async def enable_ai_traffic_control(simulation_id: str = DEFAULT_SIMULATION):
     """
     Bật AI điều khiển giao thông THÔNG MINH
     
@@ -495,16 +574,13 @@ async def enable_ai_traffic_control():
     
     Đây mới là điều hướng giao thông ĐÚNG NGHĨA!
     """
-    global traci_connector, smart_controllers
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
-        
-        import traci
+        simulation = _require_simulation(simulation_id)
+        traci = simulation.connector.connection
+        smart_controllers = simulation.controllers
         
         # Get all traffic lights in current scenario
-        all_tls_ids = traci.trafficlight.getIDList()
+        all_tls_ids = await simulation.worker.call(traci.trafficlight.getIDList)
         
         if not all_tls_ids:
             raise HTTPException(status_code=500, detail="No traffic lights found")
@@ -514,7 +590,8 @@ async def enable_ai_traffic_control():
         for tls_id in all_tls_ids:
             smart_controllers[tls_id] = SmartTrafficController(
                 tls_id=tls_id,
-                min_green_time=10  # Minimum 10s green time
+                min_green_time=10,  # Minimum 10s green time
+                connection=traci
             )
         
         logger.info(f"✅ AI Traffic Control enabled for {len(smart_controllers)} traffic lights")
@@ -542,7 +619,8 @@ async def enable_ai_traffic_control():
 
 
 @router.post("/ai-step")
-async def ai_traffic_control_step():
+@router.post(SIMULATION_PREFIX + "/ai-step")
+async def ai_traffic_control_step(simulation_id: str = DEFAULT_SIMULATION):
     """
     Thực hiện MỘT BƯỚC điều khiển AI
     
@@ -554,11 +632,10 @@ async def ai_traffic_control_step():
     Returns:
         Decisions made for each traffic light
     """
-    global traci_connector, smart_controllers
-    
     try:
-        if traci_connector is None or not traci_connector.is_connected():
-            raise HTTPException(status_code=400, detail="No simulation connected")
+        simulation = _require_simulation(simulation_id)
+        traci = simulation.connector.connection
+        smart_controllers = simulation.controllers
         
         if not smart_controllers:
             raise HTTPException(
@@ -566,51 +643,53 @@ async def ai_traffic_control_step():
                 detail="AI control not enabled. Call POST /sumo/ai-control first"
             )
         
-        import traci
-        
-        decisions = []
-        
-        # Process each traffic light independently
-        for tls_id, controller in smart_controllers.items():
-            try:
-                # Let AI select best phase based on traffic
-                best_phase = controller.select_best_phase()
-                current_phase = traci.trafficlight.getPhase(tls_id)
-                
-                # Apply if different
-                if best_phase != current_phase:
-                    logger.info(f"🚦 TLS {tls_id}: Switching {current_phase} → {best_phase}")
-                    traci.trafficlight.setPhase(tls_id, best_phase)
+        def control_step():
+            decisions = []
+            
+            # Process each traffic light independently
+            for tls_id, controller in smart_controllers.items():
+                try:
+                    # Let AI select best phase based on traffic
+                    best_phase = controller.select_best_phase()
+                    current_phase = traci.trafficlight.getPhase(tls_id)
                     
+                    # Apply if different
+                    if best_phase != current_phase:
+                        logger.info(f"🚦 TLS {tls_id}: Switching {current_phase} → {best_phase}")
+                        traci.trafficlight.setPhase(tls_id, best_phase)
+                        simulation.connector.refresh_traffic_light(tls_id)
+                        
+                        decisions.append({
+                            "tls_id": tls_id,
+                            "action": "switch",
+                            "from_phase": current_phase,
+                            "to_phase": best_phase,
+                            "explanation": controller.get_phase_explanation(best_phase)
+                        })
+                    else:
+                        decisions.append({
+                            "tls_id": tls_id,
+                            "action": "hold",
+                            "current_phase": current_phase,
+                            "explanation": controller.get_phase_explanation(current_phase)
+                        })
+                        
+                except Exception as e:
+                    logger.error(f"Error controlling TLS {tls_id}: {e}")
                     decisions.append({
                         "tls_id": tls_id,
-                        "action": "switch",
-                        "from_phase": current_phase,
-                        "to_phase": best_phase,
-                        "explanation": controller.get_phase_explanation(best_phase)
-                    })
-                else:
-                    decisions.append({
-                        "tls_id": tls_id,
-                        "action": "hold",
-                        "current_phase": current_phase,
-                        "explanation": controller.get_phase_explanation(current_phase)
+                        "action": "error",
+                        "error": str(e)
                     })
-                    
-            except Exception as e:
-                logger.error(f"Error controlling TLS {tls_id}: {e}")
-                decisions.append({
-                    "tls_id": tls_id,
-                    "action": "error",
-                    "error": str(e)
-                })
-        
-        return {
-            "status": "ok",
-            "simulation_time": traci.simulation.getTime(),
-            "decisions": decisions,
-            "num_controlled": len([d for d in decisions if d['action'] != 'error'])
-        }
+            
+            return {
+                "status": "ok",
+                "simulation_time": traci.simulation.getTime(),
+                "decisions": decisions,
+                "num_controlled": len([d for d in decisions if d['action'] != 'error'])
+            }
+            
+        return await simulation.worker.call(control_step)
         
     except HTTPException:
         raise
@@ -647,21 +726,141 @@ async def list_scenarios():
 
 
 @router.get("/status")
-async def get_simulation_status():
+@router.get(SIMULATION_PREFIX + "/status")
+async def get_simulation_status(simulation_id: str = DEFAULT_SIMULATION):
     """Get SUMO simulation connection status"""
-    global traci_connector
+    simulation = simulation_manager.get(simulation_id)
     
-    if traci_connector is None or not traci_connector.is_connected():
+    if simulation is None:
         return {
             "connected": False,
             "scenario": None,
             "message": "Not connected to SUMO. Start SUMO with: sumo-gui -c <config> --remote-port 8813 --start"
         }
     
-    info = traci_connector.get_scenario_info()
-    state = traci_connector.get_traffic_state()
+    snapshot = simulation.worker.latest()
+    
+    return {
+        **simulation.info(),
+        "current_state": snapshot.state if snapshot else None
+    }
+
+
+@router.post("/speed")
+@router.post(SIMULATION_PREFIX + "/speed")
+async def set_simulation_speed(request: SetSpeedRequest, simulation_id: str = DEFAULT_SIMULATION):
+    """
+    Change how fast the background worker steps the simulation
     
+    real_time_factor: 1.0 = real time, 2.0 = twice as fast,
+    0 = paused (step manually with POST /sumo/step)
+    """
+    worker = _require_simulation(simulation_id).worker
+    worker.set_real_time_factor(request.real_time_factor)
     return {
-        **info,
-        "current_state": state
+        "status": "ok",
+        "real_time_factor": max(0.0, request.real_time_factor)
     }
+
+
+# --- Live snapshot streaming ---
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated state fields (None = all)"""
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()] or None
+
+
+def _message(kind: str, data) -> Dict:
+    return {"type": kind, "data": data, "timestamp": int(time.time() * 1000)}
+
+
+@router.websocket("/socket")
+@router.websocket(SIMULATION_PREFIX + "/socket")
+async def simulation_socket(
+    websocket: WebSocket,
+    simulation_id: str = DEFAULT_SIMULATION,
+    fields: Optional[str] = None
+):
+    """
+    Push live simulation snapshots over WebSocket
+    
+    Messages (JSON):
+    - connection: sent once on connect
+    - simulation_update: full state in `data` - first frame, after a new
+      field selection, or after frames were dropped for a slow client
+    - simulation_delta: JSON Merge Patch (RFC 7386) in `data`, to apply to
+      the frame whose `seq` equals this message's `base`
+    
+    Choose fields with ?fields=vehicle_count,avg_speed or, at any time:
+    {"type": "command", "data": {"command": "subscribe", "params": {"fields": [...]}}}
+    """
+    await websocket.accept()
+    subscription = simulation_manager.broadcaster(simulation_id).subscribe(_parse_fields(fields))
+    receive = asyncio.ensure_future(websocket.receive_json())
+    frame = asyncio.ensure_future(subscription.next_frame())
+    try:
+        await websocket.send_json(_message("connection", {
+            "simulation_id": simulation_id,
+            "connected": simulation_manager.get(simulation_id) is not None,
+            "fields": sorted(subscription.fields) if subscription.fields else None
+        }))
+        while True:
+            done, _ = await asyncio.wait({receive, frame}, return_when=asyncio.FIRST_COMPLETED)
+            
+            # A frame that completed with a command is sent before the
+            # command may replace the frame future
+            if frame in done:
+                # Frames published while this send is in flight are skipped
+                _, text = frame.result()
+                await websocket.send_text(text)
+                frame = asyncio.ensure_future(subscription.next_frame())
+            
+            if receive in done:
+                message = receive.result()
+                receive = asyncio.ensure_future(websocket.receive_json())
+                command = message.get("data") if isinstance(message, dict) else None
+                command = command if isinstance(command, dict) else {}
+                params = command.get("params") or {}
+                if command.get("command") == "subscribe" and "fields" in params:
+                    frame.cancel()
+                    subscription.select(params["fields"] or None)
+                    frame = asyncio.ensure_future(subscription.next_frame())
+                else:
+                    await websocket.send_json(_message("error", f"Unknown command: {command.get('command')}"))
+                
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Simulation socket closed: {e}")
+    finally:
+        receive.cancel()
+        frame.cancel()
+        subscription.close()
+
+
+@router.get("/socket")
+@router.get(SIMULATION_PREFIX + "/socket")
+async def simulation_events(simulation_id: str = DEFAULT_SIMULATION, fields: Optional[str] = None):
+    """
+    Server-Sent Events fallback of the /sumo/socket WebSocket
+    
+    Same messages as the WebSocket, as `event: <type>` / `data: <json>` pairs.
+    Fields are chosen with ?fields=... only.
+    """
+    subscription = simulation_manager.broadcaster(simulation_id).subscribe(_parse_fields(fields))
+    
+    async def events():
+        try:
+            while True:
+                kind, text = await subscription.next_frame()
+                yield f"event: {kind}\ndata: {text}\n\n"
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
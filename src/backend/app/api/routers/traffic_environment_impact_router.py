@@ -7,9 +7,14 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import (
+    conditional_json_response,
+    ndjson_response,
+    wants_ndjson,
+)
 from app.models.TrafficEnvironmentImpact import TrafficEnvironmentImpact
 from app.services.traffic_enviroment_impact_service import (
     traffic_environment_impact_service,
@@ -66,6 +71,7 @@ class BatchDeleteRequest(BaseModel):
     description="Retrieve a list of TrafficEnvironmentImpact entities with advanced filtering, pagination, and formatting options.",
 )
 async def get_all_traffic_environment_impact(
+    request: Request,
     # Filtering
     id: Optional[str] = Query(
         None,
@@ -83,6 +89,10 @@ async def get_all_traffic_environment_impact(
     attrs: Optional[str] = Query(
         None, description="Legacy - Comma-separated list of attributes to include"
     ),
+    fields: Optional[str] = Query(
+        None,
+        description="Attributes needed, comma-separated: returned as key-value pairs (pick + format=simplified)",
+    ),
     # Geo-spatial queries
     georel: Optional[str] = Query(
         None, description="Geo-relationship (e.g., 'near;maxDistance==5000')"
@@ -137,13 +147,38 @@ async def get_all_traffic_environment_impact(
         - Get count only: GET /?count=true
         - Get simplified format: GET /?format=simplified&pick=id,type,co2
         - Geo-spatial query: GET /?georel=near;maxDistance==2000&geometry=Point&coordinates=[-8.5,41.2]
+        - Stream every match, one entity per line: GET / with 'Accept: application/x-ndjson'
     """
     try:
+        if not count and wants_ndjson(request):
+            # Walks all pages; 'limit' caps the total instead of one page
+            pages = traffic_environment_impact_service.iter_pages(
+                type=traffic_environment_impact_service.entity_type,
+                id=id,
+                q=q,
+                pick=pick,
+                attrs=attrs,
+                fields=fields,
+                georel=georel,
+                geometry=geometry,
+                coordinates=coordinates,
+                geoproperty=geoproperty,
+                limit=limit,
+                offset=offset,
+                format=format,
+                options=options,
+                local=local,
+            )
+            return await ndjson_response(
+                pages, traffic_environment_impact_service.serializer
+            )
+
         return await traffic_environment_impact_service.get_all(
             id=id,
             q=q,
             pick=pick,
             attrs=attrs,
+            fields=fields,
             georel=georel,
             geometry=geometry,
             coordinates=coordinates,
@@ -180,6 +215,7 @@ async def get_all_traffic_environment_impact(
     description="Retrieve a specific TrafficEnvironmentImpact entity by its unique identifier.",
 )
 async def get_traffic_environment_impact_by_id(
+    request: Request,
     entity_id: str,
     attrs: Optional[str] = Query(
         None,
@@ -199,9 +235,10 @@ async def get_traffic_environment_impact_by_id(
         - Get in key-value format: GET /urn:ngsi-ld:TrafficEnvironmentImpact:001?option=keyValues
     """
     try:
-        return await traffic_environment_impact_service.get_by_id(
-            entity_id=entity_id, attrs=attrs, options=options
+        version = await traffic_environment_impact_service.get_entity_version(
+            entity_id, attrs=attrs, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
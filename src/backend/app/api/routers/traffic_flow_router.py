@@ -7,8 +7,9 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
+from app.api.responses import broker_stream_response, conditional_json_response
 from app.services.traffic_flow_service import traffic_flow_service
 
 router = APIRouter(prefix="/api/v1/traffic-flow", tags=["TrafficFlowObserved"])
@@ -20,6 +21,7 @@ async def get_all_traffic_flow(
     id: Optional[str] = Query(None),
     q: Optional[str] = Query(None),
     pick: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Attributes needed, returned as key-value pairs"),
     limit: Optional[int] = Query(None, ge=1, le=1000),
     offset: Optional[int] = Query(None, ge=0),
     count: Optional[bool] = Query(False),
@@ -28,10 +30,27 @@ async def get_all_traffic_flow(
     local: Optional[bool] = Query(None),
 ):
     try:
+        if not count:
+            # Entities are returned unchanged: relay Orion's body as it streams
+            orion_response = await traffic_flow_service.stream_entities(
+                type=traffic_flow_service.entity_type,
+                id=id,
+                q=q,
+                pick=pick,
+                fields=fields,
+                limit=limit,
+                offset=offset,
+                format=format,
+                options=options,
+                local=local,
+            )
+            return broker_stream_response(orion_response)
+
         return await traffic_flow_service.get_all(
             id=id,
             q=q,
             pick=pick,
+            fields=fields,
             limit=limit,
             offset=offset,
             count=count,
@@ -48,9 +67,10 @@ async def get_all_traffic_flow(
 
 
 @router.get("/{entity_id}", response_model=Dict[str, Any])
-async def get_traffic_flow_by_id(entity_id: str):
+async def get_traffic_flow_by_id(request: Request, entity_id: str, options: Optional[str] = Query(None)):
     try:
-        return await traffic_flow_service.get_by_id(entity_id=entity_id)
+        version = await traffic_flow_service.get_entity_version(entity_id, options=options)
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"TrafficFlowObserved {entity_id} not found") from e
@@ -7,9 +7,10 @@ import logging
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, model_validator
 
+from app.api.responses import conditional_json_response
 from app.models.WaterQualityObserved import WaterQualityObserved
 from app.services.water_quality_service import water_quality_service
 
@@ -142,6 +143,7 @@ async def get_all_water_quality(
     summary="Get WaterQualityObserved by ID",
 )
 async def get_water_quality_by_id(
+    request: Request,
     entity_id: str,
     pick: Optional[str] = Query(None),
     attrs: Optional[str] = Query(None),
@@ -150,9 +152,10 @@ async def get_water_quality_by_id(
 ):
     """Retrieve a single WaterQualityObserved entity by ID."""
     try:
-        return await water_quality_service.get_by_id(
+        version = await water_quality_service.get_entity_version(
             entity_id, pick=pick, attrs=attrs, format=format, options=options
         )
+        return conditional_json_response(request, version)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(
@@ -3,6 +3,8 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +12,129 @@ class Settings(BaseSettings):
     app_name: str = "OLP 2025 Core Backend Service"
     app_version: str = "1.0.0"
 
+    # Shared HTTP connection pool, owned by the FastAPI lifespan
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # Seconds
+    http_timeout: float = 30.0  # Seconds
+    http_connect_timeout: float = 10.0  # Seconds
+    http2_enabled: bool = True  # Needs the 'h2' package (httpx[http2])
+
+    # Orion-LD batch operations (POST /entityOperations/*)
+    orion_batch_chunk_size: int = 500  # Entities per request
+    orion_batch_max_concurrency: int = 4  # Chunks in flight at the same time
+    orion_batch_max_retries: int = 2  # Retries for transiently failed entity IDs
+    orion_batch_retry_backoff: float = 0.5  # Seconds, multiplied by the attempt
+
+    # Orion-LD request retries (idempotent methods; see services/circuit_breaker.py)
+    orion_retry_max_attempts: int = 3  # Retries after the first attempt
+    orion_retry_backoff_base: float = 0.2  # Seconds, doubled per attempt, jittered
+    orion_retry_backoff_max: float = 5.0  # Seconds
+    orion_retry_after_max: float = 30.0  # Upper bound for honored Retry-After
+
+    # Per-endpoint circuit breaker
+    orion_breaker_failure_threshold: int = 5  # Consecutive failures before opening
+    orion_breaker_reset_timeout: float = 30.0  # Seconds before a trial call
+
+    # Temporal queries (GET /temporal/entities)
+    temporal_window_hours: float = 6.0  # Long 'between' ranges are split into these
+    temporal_max_concurrency: int = 4  # Windows fetched at the same time
+    temporal_max_pages: int = 100  # Partial (206) pages followed per window
+
+    # JSON codec for broker payloads: auto (orjson if installed) | orjson | json
+    json_serializer: str = "auto"
+
+    # Response compression, negotiated with Accept-Encoding (br needs brotli)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # Bytes; smaller complete bodies go as-is
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # 0-11; higher is much slower to encode
+
+    # Columnar (Parquet / Arrow IPC) exports (services/columnar_export.py)
+    export_row_group_size: int = 10000  # Rows buffered per row group / record batch
+
+    # Bulk NDJSON/CSV imports (services/bulk_import.py)
+    import_directory: str = "data/imports"  # Uploaded files and their checkpoints
+    import_window_rows: int = 5000  # Rows validated and upserted per checkpoint
+    import_workers: int = 2  # Validation processes (0 = validate inline)
+    import_max_errors: int = 100  # Invalid rows / rejected entities kept in a report
+    import_max_upload_bytes: int = 2 * 1024**3  # Largest file accepted for import
+
+    # Background SUMO stepping (sumo_rl/agents/simulation_worker.py)
+    sumo_real_time_factor: float = 1.0  # Sim seconds per wall second (0 = manual)
+    sumo_step_length: float = 1.0  # Simulated seconds per step (--step-length)
+    sumo_snapshot_buffer_size: int = 300  # Recent snapshots kept in the ring buffer
+    sumo_command_timeout: float = 10.0  # Seconds an API call waits for the worker
+    sumo_max_simulations: int = 4  # SUMO instances run side by side (one core each)
+    # Deltas per keyframe in binary snapshot exports (0 = first frame only)
+    sumo_keyframe_interval: int = 300
+
+    # Composite queries fanned out over several entity types (services/fanout.py)
+    fanout_max_concurrency: int = 8  # Queries in flight at the same time
+    fanout_timeout: float = 5.0  # Seconds, per query
+
+    # Share one in-flight request between identical concurrent GETs
+    orion_coalesce_gets: bool = True
+
+    # Write-behind buffer for attribute updates (merged into batch updates)
+    write_behind_flush_interval: float = 0.1  # Seconds
+    write_behind_max_entities: int = 200  # Flush early at this many entities
+
+    # Orion-LD query pagination (GET /entities)
+    orion_page_size: int = 1000  # Orion-LD rejects limit > 1000 by default
+
+    # In-process entity cache (read-through, LRU eviction, TTL in seconds)
+    entity_cache_enabled: bool = True
+    entity_cache_max_entries: int = 10000
+    entity_cache_default_ttl: float = 0.0  # 0 = types not listed below are not cached
+    entity_cache_ttls: Dict[str, float] = {
+        "Building": 3600.0,
+        "RoadSegment": 3600.0,
+        "Device": 60.0,
+    }
+    # Where Orion-LD sends the notifications that invalidate cached entities
+    entity_cache_notification_uri: str = (
+        "http://backend:8000/api/v1/subscriptions/notify/cache"
+    )
+
+    # QuantumLeap time-series API for historical queries (fed by Orion-LD)
+    quantumleap_url: str = "http://quantumleap:8668"
+    quantumleap_fiware_service: Optional[str] = None
+    quantumleap_fiware_service_path: Optional[str] = None
+    # Where Orion-LD sends entity changes to be recorded
+    quantumleap_notification_uri: str = "http://quantumleap:8668/v2/notify"
+    history_entity_types: List[str] = [
+        "TrafficEnvironmentImpact",
+        "CarbonFootprint",
+        "WaterQualityObserved",
+    ]
+    history_backend: str = "quantumleap"  # quantumleap | memory (local stand-in)
+    history_fallback_to_broker: bool = True  # Scan Orion-LD if QuantumLeap is down
+    history_max_records: int = 10000  # Versions a current-state read may fetch
+
+    # Local spatial index for geo-queries on mostly static types
+    spatial_index_types: List[str] = ["RoadSegment", "Device", "Building"]
+    spatial_index_cell_size: float = 0.01  # Grid cell in degrees (~1.1 km)
+    spatial_index_consistency: str = "eventual"  # eventual (index) | strong (broker)
+    spatial_index_warm_on_startup: bool = True
+    # Where Orion-LD sends the notifications that keep the index in sync
+    spatial_index_notification_uri: str = (
+        "http://backend:8000/api/v1/subscriptions/notify/spatial"
+    )
+
+    # Per-intersection traffic KPI rollups (see services/rollup_store.py)
+    rollup_directory: Optional[str] = "data/rollups"  # None = in memory only
+    rollup_bucket_seconds: int = 300
+    rollup_num_buckets: int = 2016  # Buckets kept per intersection (7 days)
+    rollup_entity_types: List[str] = [
+        "TrafficFlowObserved",
+        "TrafficEnvironmentImpact",
+    ]
+    # Where Orion-LD sends the notifications folded into the rollups
+    rollup_notification_uri: str = (
+        "http://backend:8000/api/v1/subscriptions/notify/rollups"
+    )
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Application-wide HTTP connection pool.
+
+One httpx.AsyncClient is shared by every service singleton and SUMO RL agent.
+It is opened and closed by the FastAPI lifespan (see app.main); code running
+outside the app (scripts, tests) gets a lazily created client instead.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+_HTTP2_AVAILABLE = False
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    pass
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an AsyncClient configured from Settings."""
+    http2 = settings.http2_enabled and _HTTP2_AVAILABLE
+    if settings.http2_enabled and not _HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but 'h2' is not installed - using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            settings.http_timeout, connect=settings.http_connect_timeout
+        ),
+        limits=httpx.Limits(
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            max_connections=settings.http_max_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        follow_redirects=True,
+    )
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the lifespan has not started it."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = create_http_client()
+        logger.debug("Shared HTTP client created")
+    return _shared_client
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Open the shared pool (FastAPI lifespan startup)."""
+    client = await get_http_client()
+    logger.info(
+        f"Shared HTTP client started (max_connections={settings.http_max_connections}, "
+        f"http2={settings.http2_enabled and _HTTP2_AVAILABLE})"
+    )
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared pool (FastAPI lifespan shutdown)."""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+        logger.info("Shared HTTP client closed")
+    _shared_client = None
@@ -3,9 +3,14 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.compression import CompressionMiddleware
+from app.api.routers.aggregation_router import router as aggregation_router
 from app.api.routers.air_quality_router import router as air_quality_router
 from app.api.routers.building_router import router as building_router
 from app.api.routers.carbon_footprint_router import (
@@ -14,21 +19,61 @@ from app.api.routers.carbon_footprint_router import (
 from app.api.routers.context_source_router import (
     router as context_source_router,
 )
+from app.api.routers.dashboard_router import router as dashboard_router
 from app.api.routers.device_router import router as device_router
+from app.api.routers.export_router import router as export_router
+from app.api.routers.import_router import router as import_router
 from app.api.routers.road_segment_router import router as road_segment_router
+from app.api.routers.rollup_router import router as rollup_router
 from app.api.routers.subscription_router import router as subscription_router
 from app.api.routers.sumo_control_router import router as sumo_control_router
+from app.api.routers.sumo_control_router import shutdown_simulation
 from app.api.routers.traffic_environment_impact_router import (
     router as traffic_environment_impact_router,
 )
 from app.api.routers.traffic_flow_router import router as traffic_flow_router
 from app.api.routers.traffic_light_router import router as traffic_light_router
 from app.api.routers.water_quality_router import router as water_quality_router
+from app.core.config import settings
+from app.core.http_client import close_http_client, start_http_client
+from app.services.building_service import building_service
+from app.services.circuit_breaker import circuit_breaker_states
+from app.services.device_service import device_service
+from app.services.road_segment_service import road_segment_service
+from app.services.rollup_store import rollup_store
+from app.services.spatial_index import warm_spatial_indexes
+from app.services.write_behind import flush_write_buffers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared HTTP connection pool used by all services and agents."""
+    await start_http_client()
+    warm_up = None
+    if settings.spatial_index_warm_on_startup:
+        # Geo-queries use the broker until their type's index is loaded
+        warm_up = asyncio.create_task(
+            warm_spatial_indexes(
+                [road_segment_service, device_service, building_service]
+            )
+        )
+    try:
+        yield
+    finally:
+        if warm_up is not None:
+            warm_up.cancel()
+        await shutdown_simulation()
+        # Pending write-behind updates still need the pool
+        await flush_write_buffers()
+        await close_http_client()
+        rollup_store.flush()
+
 
 app = FastAPI(
     title="GreenWave Core Backend Service",
     description="Receives NGSI-LD notifications and handles business logic.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Enable CORS for Dashboard support
@@ -40,11 +85,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
 app.include_router(air_quality_router)
 app.include_router(carbon_footprint_router)
 app.include_router(traffic_environment_impact_router)
 app.include_router(traffic_flow_router)
 app.include_router(water_quality_router)
+app.include_router(aggregation_router)
+app.include_router(rollup_router)
+app.include_router(dashboard_router)
+app.include_router(export_router)
+app.include_router(import_router)
 app.include_router(device_router)
 app.include_router(building_router)
 app.include_router(subscription_router)
@@ -58,3 +116,11 @@ app.include_router(sumo_control_router)  # SUMO Control & Real-time Data
 def read_root():
     """Endpoint cơ bản để kiểm tra service có đang chạy không"""
     return {"message": "Core Backend Service is running!"}
+
+
+@app.get("/health/broker")
+def broker_health():
+    """Circuit breaker state per Orion-LD endpoint (closed / open / half_open)."""
+    states = circuit_breaker_states()
+    healthy = all(state["state"] == "closed" for state in states.values())
+    return {"healthy": healthy, "circuit_breakers": states}
@@ -0,0 +1,299 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+import typing
+from datetime import timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from .base_service import BaseService
+from .temporal import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Bucket name -> numpy datetime64 unit
+BUCKET_UNITS = {"minute": "m", "hour": "h", "day": "D"}
+
+
+def numeric_attributes(model: Type[BaseModel]) -> Set[str]:
+    """
+    NGSI-LD attribute names (aliases) of a model's numeric fields.
+
+    Example:
+        numeric_attributes(CarbonFootprint)  # -> {"CO2eq"}
+    """
+
+    def is_numeric(annotation: Any) -> bool:
+        if annotation in (int, float):
+            return True
+        return any(is_numeric(arg) for arg in typing.get_args(annotation))
+
+    return {
+        field.alias or name
+        for name, field in model.model_fields.items()
+        if is_numeric(field.annotation)
+    }
+
+
+def _value(attribute: Any) -> Any:
+    # Normalized attributes wrap the value, simplified ones do not
+    if isinstance(attribute, dict):
+        if "value" in attribute:
+            return _value(attribute["value"])
+        if "@value" in attribute:
+            return attribute["@value"]
+    return attribute
+
+
+def _number(attribute: Any) -> float:
+    value = _value(attribute)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+def _timestamp(attribute: Any) -> np.datetime64:
+    value = _value(attribute)
+    if not isinstance(value, str):
+        return np.datetime64("NaT", "ms")
+    try:
+        utc = parse_timestamp(value).astimezone(timezone.utc).replace(tzinfo=None)
+    except ValueError:
+        return np.datetime64("NaT", "ms")
+    return np.datetime64(utc, "ms")
+
+
+def _location_key(attribute: Any, precision: int) -> Optional[str]:
+    location = _value(attribute)
+    if isinstance(location, dict) and location.get("type") == "Point":
+        lon, lat = location["coordinates"][:2]
+        return f"{round(lon, precision)},{round(lat, precision)}"
+    return None
+
+
+def _python(value: Any) -> Optional[float]:
+    """Convert a numpy scalar to a JSON-safe float (NaN -> None)."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class SeriesAccumulator:
+    """
+    Collects one numeric attribute from pages of entities into NumPy arrays.
+
+    Each page is reduced to compact arrays (values, timestamps, group keys)
+    as it arrives, so entities are not kept; summaries, time buckets and
+    per-group statistics are then computed vectorized over the whole series.
+
+    Usage:
+        acc = SeriesAccumulator("pm25", time_attribute="dateObserved")
+        async for page in service.iter_pages(type="AirQualityObserved"):
+            acc.add_page(page)
+        acc.summary(), acc.buckets("hour")
+    """
+
+    def __init__(
+        self,
+        attribute: str,
+        time_attribute: Optional[str] = None,
+        group_by: Optional[str] = None,
+        location_precision: int = 3,
+    ):
+        self.attribute = attribute
+        self.time_attribute = time_attribute
+        self.group_by = group_by
+        self.location_precision = location_precision
+
+        self._values: List[np.ndarray] = []
+        self._times: List[np.ndarray] = []
+        self._groups: List[np.ndarray] = []
+        self.skipped = 0  # Entities without a numeric value
+
+    def add_page(self, entities: Sequence[Dict[str, Any]]) -> None:
+        values = np.fromiter(
+            (_number(e.get(self.attribute)) for e in entities),
+            dtype=np.float64,
+            count=len(entities),
+        )
+        keep = ~np.isnan(values)
+        self.skipped += int(len(values) - keep.sum())
+        self._values.append(values[keep])
+
+        if self.time_attribute:
+            times = np.array(
+                [_timestamp(e.get(self.time_attribute)) for e in entities],
+                dtype="datetime64[ms]",
+            )
+            self._times.append(times[keep])
+
+        if self.group_by:
+            if self.group_by == "location":
+                keys = [
+                    _location_key(e.get("location"), self.location_precision)
+                    for e in entities
+                ]
+            else:
+                keys = [_value(e.get(self.group_by)) for e in entities]
+            groups = np.array(["" if k is None else str(k) for k in keys], dtype=object)
+            self._groups.append(groups[keep])
+
+    @property
+    def values(self) -> np.ndarray:
+        if not self._values:
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate(self._values)
+
+    def summary(self, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, Any]:
+        """Count, min, max, mean, standard deviation and percentiles."""
+        values = self.values
+        if values.size == 0:
+            return {"count": 0}
+        points = np.percentile(values, percentiles) if percentiles else []
+        return {
+            "count": int(values.size),
+            "min": _python(values.min()),
+            "max": _python(values.max()),
+            "mean": _python(values.mean()),
+            "std": _python(values.std()),
+            "percentiles": {f"p{p:g}": _python(v) for p, v in zip(percentiles, points)},
+        }
+
+    def buckets(self, period: str) -> List[Dict[str, Any]]:
+        """
+        Statistics per time bucket ("minute", "hour" or "day"), oldest first.
+
+        Values without a timestamp are left out.
+        """
+        if not self.time_attribute:
+            raise ValueError("Time buckets need a time attribute")
+        if not self._times:
+            return []
+        times = np.concatenate(self._times).astype(
+            f"datetime64[{BUCKET_UNITS[period]}]"
+        )
+        values = self.values
+        dated = ~np.isnat(times)
+        keys, inverse = np.unique(times[dated], return_inverse=True)
+        return [
+            {"start": f"{np.datetime_as_string(key, unit='s')}Z", **stats}
+            for key, stats in zip(
+                keys, self._grouped(inverse, values[dated], len(keys))
+            )
+        ]
+
+    def groups(self) -> List[Dict[str, Any]]:
+        """Statistics per group key (location cell or attribute value)."""
+        if not self.group_by:
+            raise ValueError("Groups need a group_by attribute")
+        if not self._groups:
+            return []
+        groups = np.concatenate(self._groups).astype(str)
+        keys, inverse = np.unique(groups, return_inverse=True)
+        return [
+            {"key": key or None, **stats}
+            for key, stats in zip(
+                keys.tolist(), self._grouped(inverse, self.values, len(keys))
+            )
+        ]
+
+    @staticmethod
+    def _grouped(
+        inverse: np.ndarray, values: np.ndarray, size: int
+    ) -> List[Dict[str, Any]]:
+        counts = np.bincount(inverse, minlength=size)
+        sums = np.bincount(inverse, weights=values, minlength=size)
+        minimums = np.full(size, np.inf)
+        maximums = np.full(size, -np.inf)
+        np.minimum.at(minimums, inverse, values)
+        np.maximum.at(maximums, inverse, values)
+        return [
+            {
+                "count": int(count),
+                "min": _python(minimum),
+                "max": _python(maximum),
+                "mean": _python(total / count),
+            }
+            for count, total, minimum, maximum in zip(counts, sums, minimums, maximums)
+        ]
+
+
+async def aggregate_attribute(
+    service: BaseService,
+    attribute: str,
+    time_attribute: str,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    q: Optional[str] = None,
+    bucket: Optional[str] = None,
+    group_by: Optional[str] = None,
+    percentiles: Sequence[float] = (50, 90, 99),
+    location_precision: int = 3,
+) -> Dict[str, Any]:
+    """
+    Aggregate a numeric attribute over every matching entity of a service.
+
+    Entities are streamed page by page (only the needed attributes, in
+    simplified format) and reduced with NumPy, so only the summary is
+    returned to the caller.
+
+    Args:
+        service: Service whose entity type is aggregated
+        attribute: Numeric attribute (e.g. "pm25", "pH", "CO2eq")
+        time_attribute: Observation time attribute used for range and buckets
+        start_time: Start time in ISO8601 format (inclusive)
+        end_time: End time in ISO8601 format (inclusive)
+        q: Additional NGSI-LD query filter
+        bucket: "minute", "hour" or "day" for time-bucketed rollups
+        group_by: "location" (grid cell of `location_precision` decimals) or
+                  an attribute name, for per-group statistics
+        percentiles: Percentiles to compute for the summary
+
+    Returns:
+        {"entityType", "attribute", "summary", "buckets"?, "groups"?}
+    """
+    if bucket is not None and bucket not in BUCKET_UNITS:
+        raise ValueError(f"bucket must be one of {sorted(BUCKET_UNITS)}")
+
+    filters = [q] if q else []
+    if start_time:
+        filters.append(f'{time_attribute}>="{start_time}"')
+    if end_time:
+        filters.append(f'{time_attribute}<="{end_time}"')
+
+    pick = ["id", "type", attribute, time_attribute]
+    if group_by:
+        pick.append(group_by)
+
+    accumulator = SeriesAccumulator(
+        attribute,
+        time_attribute=time_attribute,
+        group_by=group_by,
+        location_precision=location_precision,
+    )
+    async for page in service.iter_pages(
+        type=service.entity_type,
+        q=";".join(filters) or None,
+        pick=",".join(pick),
+        format="simplified",
+    ):
+        accumulator.add_page(page)
+
+    result: Dict[str, Any] = {
+        "entityType": service.entity_type,
+        "attribute": attribute,
+        "summary": accumulator.summary(percentiles),
+    }
+    if bucket:
+        result["bucket"] = bucket
+        result["buckets"] = accumulator.buckets(bucket)
+    if group_by:
+        result["groupBy"] = group_by
+        result["groups"] = accumulator.groups()
+    if accumulator.skipped:
+        logger.debug(f"Aggregation skipped {accumulator.skipped} non-numeric values")
+    return result
@@ -3,18 +3,145 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+from collections import deque
+from datetime import timedelta
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import httpx
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+from .circuit_breaker import (
+    IDEMPOTENT_METHODS,
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    backoff_delay,
+    get_circuit_breaker,
+    is_breaker_failure,
+    parse_retry_after,
+)
+from .entity_cache import EntityCache, entity_cache, entity_type_from_id, make_cache_key
+from .entity_version import EntityVersion, entity_version
+from .projection import Projection, as_projection, push_down
+from .serialization import JsonSerializer, json_serializer
+from .spatial_index import (
+    EVENTUAL,
+    SpatialIndex,
+    get_spatial_index,
+    select_attributes,
+)
+from .temporal import (
+    merge_temporal_entities,
+    next_page_params,
+    parse_content_range,
+    split_time_range,
+)
+from .write_behind import AttributeUpdateBuffer
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# In-flight GET requests keyed by (url, params, headers), shared by all services
+_inflight_gets: Dict[Tuple, "asyncio.Future[httpx.Response]"] = {}
+
+# Per-entity statuses worth re-sending in a later batch round
+RETRYABLE_BATCH_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Geo-query parameters the local spatial index can evaluate
+_LOCAL_GEO_PARAMS = {
+    "type",
+    "id",
+    "georel",
+    "geometry",
+    "coordinates",
+    "geoproperty",
+    "pick",
+    "attrs",
+    "limit",
+    "offset",
+    "count",
+    "format",
+    "options",
+}
+_ORION_DEFAULT_LIMIT = 20  # Orion-LD's page size when no limit is given
+
+
+class BatchOperationResult:
+    """
+    Aggregated outcome of a chunked batch operation (POST /entityOperations/*).
+
+    Collects the success IDs and per-entity errors of every chunk and converts
+    them back into a single Orion-LD style response, so callers cannot tell
+    whether the batch was sent in one request or in many.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.success: List[str] = []
+        self.created: List[str] = []
+        self.errors: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def error_status(error: Dict[str, Any]) -> Optional[int]:
+        """Extract the HTTP status of a per-entity error, if Orion-LD reported one."""
+        details = error.get("error")
+        if isinstance(details, dict) and details.get("status") is not None:
+            return int(details["status"])
+        return None
+
+    @classmethod
+    def is_retryable(cls, error: Dict[str, Any]) -> bool:
+        """Transport failures and 5xx/429 errors are retried, everything else is final."""
+        status = cls.error_status(error)
+        return status is None or status in RETRYABLE_BATCH_STATUSES
+
+    def to_response(self, url: str) -> httpx.Response:
+        """
+        Build the merged response.
+
+        Returns:
+            207 with success/errors if any entity failed, otherwise 201 with the
+            created IDs (create/upsert) or 204 without body (update/delete/upsert)
+        """
+        request = httpx.Request("POST", url)
+        headers = {"Content-Type": "application/json"}
+        if self.errors:
+            return httpx.Response(
+                207,
+                content=json_serializer.dumps(
+                    {"success": self.success, "errors": self.errors}
+                ),
+                headers=headers,
+                request=request,
+            )
+        if self.operation == "create" or (self.operation == "upsert" and self.created):
+            return httpx.Response(
+                201,
+                content=json_serializer.dumps(self.created),
+                headers=headers,
+                request=request,
+            )
+        return httpx.Response(204, request=request)
+
 
 class BaseService:
     """
@@ -34,8 +161,14 @@ class BaseService:
             await service.close()
     """
 
+    # Set by per-type services (e.g. "AirQualityObserved")
+    entity_type: Optional[str] = None
+
     def __init__(
-        self, orion_url: Optional[str] = None, context_url: Optional[str] = None
+        self,
+        orion_url: Optional[str] = None,
+        context_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         self.ORION_LD_URL = orion_url or os.getenv(
             "ORION_LD_URL", "http://fiware-orionld:1026/ngsi-ld/v1"
@@ -50,27 +183,57 @@ class BaseService:
             "Link": f'<{self.CONTEXT_URL}>; rel="http://www.w3.org/ns/json-ld#context"; type="application/ld+json"'
         }
 
-        # ✅ Reusable HTTP client
-        self._client: Optional[httpx.AsyncClient] = None
+        # ✅ Reusable HTTP client - None uses the app-wide pool (app.core.http_client)
+        self._client: Optional[httpx.AsyncClient] = client
+
+        # JSON codec for request bodies and responses (orjson when installed)
+        self.serializer: JsonSerializer = json_serializer
+
+        # Shared read-through cache, invalidated by writes and notifications
+        self.cache: EntityCache = entity_cache
+
+        # Identical concurrent GETs are coalesced into one broker round trip
+        self.coalesce_gets = settings.orion_coalesce_gets
+
+        # Write-behind buffer for hot attribute updates, created on first use
+        self._write_buffer: Optional[AttributeUpdateBuffer] = None
+
+        # Transient broker failures are retried with jittered backoff
+        self.retry_max_attempts = settings.orion_retry_max_attempts
+        self.retry_backoff_base = settings.orion_retry_backoff_base
+        self.retry_backoff_max = settings.orion_retry_backoff_max
+        self.retry_after_max = settings.orion_retry_after_max
+
+        # Long temporal ranges are split into windows fetched concurrently
+        self.temporal_window = timedelta(hours=settings.temporal_window_hours)
+        self.temporal_max_concurrency = settings.temporal_max_concurrency
+        self.temporal_max_pages = settings.temporal_max_pages
+
+        # Batch operations are split into chunks sent concurrently
+        self.batch_chunk_size = settings.orion_batch_chunk_size
+        self.batch_max_concurrency = settings.orion_batch_max_concurrency
+        self.batch_max_retries = settings.orion_batch_max_retries
+        self.batch_retry_backoff = settings.orion_batch_retry_backoff
 
         logger.debug(f"BaseService initialized for broker at {self.ORION_LD_URL}")
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the async HTTP client with proper configuration."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(30.0, connect=10.0),  # ✅ Add timeouts
-                limits=httpx.Limits(
-                    max_keepalive_connections=20,
-                    max_connections=100,
-                    keepalive_expiry=30.0,
-                ),
-                follow_redirects=True,
-            )
-        return self._client
+        """
+        Get the HTTP client: the injected one, or the shared application pool.
+
+        The shared pool is owned by the FastAPI lifespan, so all service
+        singletons reuse the same connections instead of one pool each.
+        """
+        if self._client is not None and not self._client.is_closed:
+            return self._client
+        return await get_http_client()
 
     async def close(self):
-        """Close the HTTP client and release resources."""
+        """
+        Close an injected HTTP client and release its resources.
+
+        The shared application pool is left open; it is closed on app shutdown.
+        """
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             logger.debug("HTTP client closed")
@@ -103,17 +266,61 @@ class BaseService:
             json_payload: Optional JSON body
 
         Returns:
-            httpx.Response object
+            httpx.Response object. Concurrent identical GETs (same URL,
+            normalized params and headers) receive the same response object.
 
         Raises:
             httpx.HTTPStatusError: For HTTP error responses
             httpx.RequestError: For connection/request errors
+            CircuitOpenError: (a RequestError) while the endpoint's circuit is open
         """
         # ✅ Remove leading slash from endpoint if present
         endpoint = endpoint.lstrip("/")
         full_url = f"{self.ORION_LD_URL}/{endpoint}"
+        # One breaker per broker resource (entities, entityOperations, temporal...)
+        breaker = get_circuit_breaker(
+            f"{self.ORION_LD_URL}/{endpoint.split('/', 1)[0]}"
+        )
+        method = method.upper()
+
+        clean_params = self._clean_params(params)
 
-        # Clean parameters (remove None, convert bool to string)
+        # Serialize once (reused by retries) with the fast codec; httpx's json=
+        # would use stdlib json
+        content = None
+        if json_payload is not None:
+            content = self.serializer.dumps(json_payload)
+            if not any(k.lower() == "content-type" for k in (headers or {})):
+                headers = {**(headers or {}), "Content-Type": "application/json"}
+
+        # Identical concurrent GETs share one in-flight request (single-flight)
+        if method == "GET" and content is None and self.coalesce_gets:
+            key = (
+                full_url,
+                make_cache_key("params", params=clean_params),
+                tuple(sorted((k.lower(), v) for k, v in (headers or {}).items())),
+            )
+            inflight = _inflight_gets.get(key)
+            if inflight is None:
+                inflight = asyncio.ensure_future(
+                    self._send_request(
+                        method, full_url, headers, clean_params, None, breaker
+                    )
+                )
+                _inflight_gets[key] = inflight
+                inflight.add_done_callback(lambda _: _inflight_gets.pop(key, None))
+            else:
+                logger.debug(f"Coalesced {method} {full_url} | Params: {clean_params}")
+            # Shielded so a cancelled waiter does not cancel the shared request
+            return await asyncio.shield(inflight)
+
+        return await self._send_request(
+            method, full_url, headers, clean_params, content, breaker
+        )
+
+    @staticmethod
+    def _clean_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Clean parameters (remove None, convert bool to string)."""
         clean_params = {}
         if params:
             for key, value in params.items():
@@ -123,20 +330,119 @@ class BaseService:
                     clean_params[key] = "true" if value else "false"
                 else:
                     clean_params[key] = value
+        return clean_params
+
+    async def _send_request(
+        self,
+        method: str,
+        full_url: str,
+        headers: Optional[Dict[str, str]],
+        params: Dict[str, Any],
+        content: Optional[bytes],
+        breaker: CircuitBreaker,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send a request behind the endpoint's circuit breaker, retrying transient failures.
 
+        Waits use exponential backoff with full jitter, or the broker's
+        Retry-After when present. Client errors (4xx) count as a healthy
+        broker; connection errors and 5xx count towards opening the circuit.
+        """
+        attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                response = await self._send_once(
+                    method, full_url, headers, params, content, stream
+                )
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                if is_breaker_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if attempt >= self.retry_max_attempts or not self._is_retryable(
+                    method, e
+                ):
+                    raise
+
+                attempt += 1
+                retry_after = None
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = parse_retry_after(e.response)
+                if retry_after is not None:
+                    delay = min(retry_after, self.retry_after_max)
+                else:
+                    delay = backoff_delay(
+                        attempt, self.retry_backoff_base, self.retry_backoff_max
+                    )
+                logger.warning(
+                    f"Retrying {method} {full_url} in {delay:.2f}s "
+                    f"(attempt {attempt}/{self.retry_max_attempts})"
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (client gone, fan-out deadline) or an unexpected
+                # error: a half-open trial must not stay in flight forever
+                breaker.record_abort()
+                raise
+
+            breaker.record_success()
+            return response
+
+    @staticmethod
+    def _is_retryable(method: str, error: Exception) -> bool:
+        """
+        Whether a failed request may be sent again.
+
+        Idempotent methods are retried on connection errors and 502/503/504.
+        Any method is retried on 429 and when no connection was made, since
+        the broker never processed the request.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code == 429:
+                return True
+            return status_code in RETRYABLE_STATUSES and method in IDEMPOTENT_METHODS
+        if isinstance(
+            error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        ):
+            return True
+        return method in IDEMPOTENT_METHODS
+
+    async def _send_once(
+        self,
+        method: str,
+        full_url: str,
+        headers: Optional[Dict[str, str]],
+        params: Dict[str, Any],
+        content: Optional[bytes],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send one request on the shared client and raise for error statuses.
+
+        With stream=True the body is left unread; the caller must aclose()
+        the response. Error bodies are always read so they can be reported.
+        """
         # ✅ Use reusable client
         client = await self._get_client()
 
         try:
-            logger.debug(f"{method} {full_url} | Params: {clean_params}")
+            logger.debug(f"{method} {full_url} | Params: {params}")
 
-            response = await client.request(
+            request = client.build_request(
                 method,
                 full_url,
                 headers=headers,
-                params=clean_params,
-                json=json_payload,
+                params=params,
+                content=content,
             )
+            response = await client.send(request, stream=stream)
+            if stream and response.is_error:
+                await response.aread()
+                await response.aclose()
             response.raise_for_status()
 
             logger.info(f"{method} {full_url} - Status: {response.status_code}")
@@ -152,6 +458,31 @@ class BaseService:
             logger.error(f"Connection Error on {method} {full_url}: {e}")
             raise
 
+    def _json(self, response: httpx.Response) -> Any:
+        """Decode a broker response body with the service's serializer."""
+        return self.serializer.loads(response.content)
+
+    def _invalidate_cached(
+        self, entity_id: Optional[str], entity_type: Optional[str] = None
+    ) -> None:
+        """Drop cached reads of an entity after a write (successful or not)."""
+        if entity_id:
+            self.cache.invalidate_entity(entity_id, entity_type or self.entity_type)
+
+    def _spatial_index_of(
+        self, entity_id: Optional[str], entity_type: Optional[str] = None
+    ) -> Optional[SpatialIndex]:
+        """Spatial index to keep in sync with a successful write, if the type has one."""
+        if not entity_id:
+            return None
+        return get_spatial_index(
+            entity_type or self.entity_type or entity_type_from_id(entity_id)
+        )
+
+    @staticmethod
+    def _without_context(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in data.items() if k != "@context"}
+
     # --- GROUP 1: SINGLE ENTITY OPERATIONS ---
 
     async def create_entity(self, entity_data: Dict[str, Any]) -> httpx.Response:
@@ -165,12 +496,19 @@ class BaseService:
             httpx.Response with status 201 on success
         """
         entity_data.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "POST",
-            "entities",  # ✅ Removed trailing slash
-            headers=self.JSON_LD_CONTENT_HEADER,
-            json_payload=entity_data,
-        )
+        try:
+            response = await self._make_request(
+                "POST",
+                "entities",  # ✅ Removed trailing slash
+                headers=self.JSON_LD_CONTENT_HEADER,
+                json_payload=entity_data,
+            )
+        finally:
+            self._invalidate_cached(entity_data.get("id"), entity_data.get("type"))
+        index = self._spatial_index_of(entity_data.get("id"), entity_data.get("type"))
+        if index is not None:
+            index.replace(self._without_context(entity_data))
+        return response
 
     async def get_entity_by_id(
         self,
@@ -190,6 +528,10 @@ class BaseService:
 
         Returns:
             Entity data as dictionary
+
+        Note:
+            Served from the entity cache when the entity type has a TTL
+            configured (see Settings.entity_cache_ttls).
         """
         params = kwargs.copy()
         if attrs:
@@ -197,10 +539,89 @@ class BaseService:
         if options:
             params["options"] = options
 
+        entity_type = self.entity_type or entity_type_from_id(entity_id)
+        cache_key = make_cache_key("entity", self.CONTEXT_URL, entity_id, params=params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation(entity_type)
         response = await self._make_request(
             "GET", f"entities/{entity_id}", headers=self.LINK_HEADER, params=params
         )
-        return response.json()
+        entity = self._json(response)
+        self.cache.set(
+            cache_key,
+            entity,
+            entity_type or entity.get("type"),
+            entity_id,
+            generation,
+        )
+        return entity
+
+    async def get_entity_raw(self, entity_id: str, **params) -> bytes:
+        """
+        Retrieve an entity as the broker's undecoded JSON bytes. (GET /entities/{id})
+
+        For routes that return the entity unchanged: the bytes go straight to
+        the client without a decode/re-encode round trip. Cached like
+        get_entity_by_id().
+
+        Args:
+            entity_id: The entity identifier
+            **params: Query parameters (pick, attrs, format, options...)
+
+        Returns:
+            JSON bytes as sent by Orion-LD
+        """
+        params = {k: v for k, v in params.items() if v is not None}
+        cache_key = make_cache_key(
+            "entity_raw", self.CONTEXT_URL, entity_id, params=params
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        entity_type = self.entity_type or entity_type_from_id(entity_id)
+        generation = self.cache.generation(entity_type)
+        response = await self._make_request(
+            "GET", f"entities/{entity_id}", headers=self.LINK_HEADER, params=params
+        )
+        self.cache.set(cache_key, response.content, entity_type, entity_id, generation)
+        return response.content
+
+    async def get_entity_version(self, entity_id: str, **params) -> EntityVersion:
+        """
+        Retrieve an entity's undecoded bytes with its ETag and Last-Modified.
+
+        For conditional GETs: the validators are computed once per broker
+        read and cached with the body, so a revalidation of an unchanged,
+        cached entity costs neither a broker request nor a hash. Writes and
+        notifications invalidate it like any other cached read.
+
+        Args:
+            entity_id: The entity identifier
+            **params: Query parameters (pick, attrs, format, options...)
+
+        Returns:
+            EntityVersion (content, etag, last_modified)
+        """
+        params = {k: v for k, v in params.items() if v is not None}
+        cache_key = make_cache_key(
+            "entity_version", self.CONTEXT_URL, entity_id, params=params
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        entity_type = self.entity_type or entity_type_from_id(entity_id)
+        generation = self.cache.generation(entity_type)
+        response = await self._make_request(
+            "GET", f"entities/{entity_id}", headers=self.LINK_HEADER, params=params
+        )
+        version = entity_version(response.content, self.serializer)
+        self.cache.set(cache_key, version, entity_type, entity_id, generation)
+        return version
 
     async def replace_entity(
         self, entity_id: str, entity_data: Union[BaseModel, Dict[str, Any]]
@@ -221,12 +642,19 @@ class BaseService:
         else:
             entity_dict = entity_data
         entity_dict.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "PUT",
-            f"entities/{entity_id}",
-            headers=self.JSON_LD_CONTENT_HEADER,
-            json_payload=entity_dict,
-        )
+        try:
+            response = await self._make_request(
+                "PUT",
+                f"entities/{entity_id}",
+                headers=self.JSON_LD_CONTENT_HEADER,
+                json_payload=entity_dict,
+            )
+        finally:
+            self._invalidate_cached(entity_id, entity_dict.get("type"))
+        index = self._spatial_index_of(entity_id, entity_dict.get("type"))
+        if index is not None:
+            index.replace({**self._without_context(entity_dict), "id": entity_id})
+        return response
 
     async def delete_entity(self, entity_id: str) -> httpx.Response:
         """
@@ -238,7 +666,14 @@ class BaseService:
         Returns:
             httpx.Response with status 204 on success
         """
-        return await self._make_request("DELETE", f"entities/{entity_id}")
+        try:
+            response = await self._make_request("DELETE", f"entities/{entity_id}")
+        finally:
+            self._invalidate_cached(entity_id)
+        index = self._spatial_index_of(entity_id)
+        if index is not None:
+            index.remove(entity_id)
+        return response
 
     # --- GROUP 2: ATTRIBUTE OPERATIONS ---
 
@@ -256,12 +691,48 @@ class BaseService:
             httpx.Response with status 204 on success
         """
         attrs_data.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "PATCH",
-            f"entities/{entity_id}/attrs",
-            headers=self.JSON_LD_CONTENT_HEADER,
-            json_payload=attrs_data,
-        )
+        try:
+            response = await self._make_request(
+                "PATCH",
+                f"entities/{entity_id}/attrs",
+                headers=self.JSON_LD_CONTENT_HEADER,
+                json_payload=attrs_data,
+            )
+        finally:
+            self._invalidate_cached(entity_id)
+        index = self._spatial_index_of(entity_id)
+        if index is not None:
+            index.update(entity_id, self._without_context(attrs_data))
+        return response
+
+    def buffer_attribute_update(
+        self, entity_id: str, attrs_data: Dict[str, Any]
+    ) -> "asyncio.Future[bool]":
+        """
+        Queue an attribute update in the write-behind buffer.
+
+        Updates to the same entity within the flush window are merged (last
+        write wins per attribute) and all pending entities are sent together
+        as one POST /entityOperations/update. Use this for hot paths that
+        patch the same entities several times per second.
+
+        Args:
+            entity_id: The entity identifier
+            attrs_data: Attributes to update (without id and type)
+
+        Returns:
+            Future resolved with True once written, False if the broker
+            rejected the update. Awaiting it is optional.
+
+        Example:
+            service.buffer_attribute_update(
+                "urn:ngsi-ld:Device:001",
+                {"batteryLevel": {"type": "Property", "value": 0.8}},
+            )
+        """
+        if self._write_buffer is None:
+            self._write_buffer = AttributeUpdateBuffer(self)
+        return self._write_buffer.update(entity_id, attrs_data)
 
     async def delete_entity_attribute(
         self, entity_id: str, attr_name: str
@@ -276,11 +747,202 @@ class BaseService:
         Returns:
             httpx.Response with status 204 on success
         """
-        return await self._make_request(
-            "DELETE", f"entities/{entity_id}/attrs/{attr_name}"
-        )
+        try:
+            response = await self._make_request(
+                "DELETE", f"entities/{entity_id}/attrs/{attr_name}"
+            )
+        finally:
+            self._invalidate_cached(entity_id)
+        index = self._spatial_index_of(entity_id)
+        if index is not None:
+            index.remove_attribute(entity_id, attr_name)
+        return response
 
     # --- GROUP 3: BATCH OPERATIONS ---
+    # Lists longer than `batch_chunk_size` are split into chunks that are sent
+    # concurrently (at most `batch_max_concurrency` in flight). The per-chunk
+    # 201/204/207 bodies are merged into one response and entity IDs that
+    # failed with a transient error are re-sent up to `batch_max_retries` times.
+
+    @staticmethod
+    def _batch_item_id(item: Union[str, Dict[str, Any]]) -> Optional[str]:
+        """Entity ID of a batch item (entity dict or bare ID for delete)."""
+        if isinstance(item, str):
+            return item
+        return item.get("id")
+
+    async def _run_batch(
+        self,
+        operation: str,
+        items: List[Any],
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """
+        Run a batch operation, chunking it when the list is larger than one chunk.
+
+        Args:
+            operation: 'create', 'upsert', 'update' or 'delete'
+            items: Entity dictionaries (or entity IDs for 'delete')
+            headers: HTTP headers for every chunk request
+            params: Query parameters for every chunk request
+
+        Returns:
+            httpx.Response - the broker response for a single chunk, or a merged
+            201/204/207 response built by BatchOperationResult otherwise
+        """
+        endpoint = f"entityOperations/{operation}"
+        chunk_size = max(1, self.batch_chunk_size)
+
+        try:
+            # Small batches keep the exact single-request behaviour (errors raise)
+            if len(items) <= chunk_size:
+                response = await self._make_request(
+                    "POST", endpoint, headers=headers, params=params, json_payload=items
+                )
+            else:
+                response = await self._run_chunked_batch(
+                    operation, endpoint, items, chunk_size, headers, params
+                )
+        finally:
+            for item in items:
+                self._invalidate_cached(
+                    self._batch_item_id(item),
+                    item.get("type") if isinstance(item, dict) else None,
+                )
+        self._index_batch(operation, items, response, (params or {}).get("options"))
+        return response
+
+    def _index_batch(
+        self,
+        operation: str,
+        items: List[Any],
+        response: httpx.Response,
+        options: Optional[str],
+    ) -> None:
+        """Apply the entities a batch operation wrote to their spatial indexes."""
+        failed: Set[Optional[str]] = set()
+        if response.status_code == 207:
+            failed = {e.get("entityId") for e in self._json(response).get("errors", [])}
+        for item in items:
+            entity_id = self._batch_item_id(item)
+            entity_type = item.get("type") if isinstance(item, dict) else None
+            index = self._spatial_index_of(entity_id, entity_type)
+            if index is None or entity_id is None or entity_id in failed:
+                continue
+            if operation == "delete":
+                index.remove(entity_id)
+            elif operation == "create" or options == "replace":
+                index.replace(self._without_context(item))
+            elif operation == "upsert":
+                index.upsert(self._without_context(item))
+            else:
+                index.update(entity_id, self._without_context(item))
+
+    async def _run_chunked_batch(
+        self,
+        operation: str,
+        endpoint: str,
+        items: List[Any],
+        chunk_size: int,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+    ) -> httpx.Response:
+        """Send `items` in concurrent chunks and merge the results."""
+        result = BatchOperationResult(operation)
+        semaphore = asyncio.Semaphore(max(1, self.batch_max_concurrency))
+        pending = list(items)
+        attempt = 0
+
+        while pending:
+            chunks = [
+                pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)
+            ]
+            logger.info(
+                f"Batch {operation}: {len(pending)} entities in {len(chunks)} chunks "
+                f"(attempt {attempt + 1})"
+            )
+            outcomes = await asyncio.gather(
+                *(
+                    self._send_batch_chunk(
+                        endpoint, chunk, headers, params, semaphore, result
+                    )
+                    for chunk in chunks
+                )
+            )
+            errors = [error for chunk_errors in outcomes for error in chunk_errors]
+
+            retryable = [e for e in errors if BatchOperationResult.is_retryable(e)]
+            if not retryable or attempt >= self.batch_max_retries:
+                result.errors.extend(errors)
+                break
+
+            result.errors.extend(
+                e for e in errors if not BatchOperationResult.is_retryable(e)
+            )
+            retry_ids = {e.get("entityId") for e in retryable}
+            pending = [i for i in pending if self._batch_item_id(i) in retry_ids]
+            attempt += 1
+            logger.warning(
+                f"Batch {operation}: retrying {len(pending)} failed entities "
+                f"(attempt {attempt + 1}/{self.batch_max_retries + 1})"
+            )
+            await asyncio.sleep(self.batch_retry_backoff * attempt)
+
+        return result.to_response(f"{self.ORION_LD_URL}/{endpoint}")
+
+    async def _send_batch_chunk(
+        self,
+        endpoint: str,
+        chunk: List[Any],
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        result: BatchOperationResult,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send one chunk and record its successes in `result`.
+
+        Returns:
+            Per-entity errors of this chunk (a failed request marks every entity)
+        """
+        chunk_ids = [self._batch_item_id(item) for item in chunk]
+
+        async with semaphore:
+            try:
+                response = await self._make_request(
+                    "POST", endpoint, headers=headers, params=params, json_payload=chunk
+                )
+            except httpx.HTTPStatusError as e:
+                error = {
+                    "type": "ChunkRequestFailed",
+                    "title": e.response.reason_phrase,
+                    "status": e.response.status_code,
+                    "detail": e.response.text,
+                }
+                return [{"entityId": i, "error": error} for i in chunk_ids]
+            except httpx.RequestError as e:
+                error = {"type": "ChunkConnectionError", "detail": str(e)}
+                return [{"entityId": i, "error": error} for i in chunk_ids]
+
+        if response.status_code == 207:
+            body = self._json(response)
+            result.success.extend(body.get("success", []))
+            return list(body.get("errors", []))
+
+        if response.status_code == 201 and response.content:
+            created = self._json(response)
+            result.success.extend(created)
+            result.created.extend(created)
+            # Upsert reports only the created IDs, the rest were updated
+            created_ids = set(created)
+            result.success.extend(
+                i for i in chunk_ids if i is not None and i not in created_ids
+            )
+            return []
+
+        result.success.extend(i for i in chunk_ids if i is not None)
+        return []
 
     async def batch_create(self, entities: List[Dict[str, Any]]) -> httpx.Response:
         """
@@ -294,11 +956,8 @@ class BaseService:
         """
         for entity in entities:
             entity.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "POST",
-            "entityOperations/create",
-            headers=self.JSON_LD_CONTENT_HEADER,
-            json_payload=entities,
+        return await self._run_batch(
+            "create", entities, headers=self.JSON_LD_CONTENT_HEADER
         )
 
     async def batch_upsert(
@@ -316,12 +975,11 @@ class BaseService:
         """
         for entity in entities:
             entity.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "POST",
-            "entityOperations/upsert",
+        return await self._run_batch(
+            "upsert",
+            entities,
             headers=self.JSON_LD_CONTENT_HEADER,
             params={"options": options},
-            json_payload=entities,
         )
 
     async def batch_update(
@@ -339,12 +997,11 @@ class BaseService:
         """
         for entity in entities:
             entity.setdefault("@context", self.CONTEXT_URL)
-        return await self._make_request(
-            "POST",
-            "entityOperations/update",
+        return await self._run_batch(
+            "update",
+            entities,
             headers=self.JSON_LD_CONTENT_HEADER,
             params={"options": options},
-            json_payload=entities,
         )
 
     async def batch_delete(self, entity_ids: List[str]) -> httpx.Response:
@@ -357,11 +1014,8 @@ class BaseService:
         Returns:
             httpx.Response with status 204/207
         """
-        return await self._make_request(
-            "POST",
-            "entityOperations/delete",
-            headers=self.JSON_CONTENT_HEADER,
-            json_payload=entity_ids,
+        return await self._run_batch(
+            "delete", entity_ids, headers=self.JSON_CONTENT_HEADER
         )
 
     # --- GROUP 4: QUERY OPERATIONS ---
@@ -394,6 +1048,10 @@ class BaseService:
         timeAt: Optional[str] = None,
         endTimeAt: Optional[str] = None,
         timeproperty: Optional[str] = None,  # Default is "observedAt"
+        # Geo-queries on indexed types: eventual (local index) | strong (broker)
+        consistency: Optional[str] = None,
+        # Declared attributes, pushed down as pick + format=simplified
+        fields: Union[None, str, Sequence[str], Projection] = None,
         # Additional
         **kwargs,
     ) -> Union[List[Dict[str, Any]], int]:
@@ -425,6 +1083,16 @@ class BaseService:
             endTimeAt: End timestamp (required for 'between')
             timeproperty: Property to use for temporal queries (default: "observedAt")
 
+            fields: Attributes the caller needs (Projection, list or
+                    comma-separated): sent as pick=id,type,<fields> with
+                    format=simplified unless pick/attrs or format/options
+                    are given
+
+            consistency: For geo-queries on spatially indexed types (see
+                         services/spatial_index.py): 'eventual' answers from
+                         the local index, 'strong' always asks the broker
+                         (default: settings.spatial_index_consistency)
+
             **kwargs: Additional query parameters
 
         Returns:
@@ -517,11 +1185,220 @@ class BaseService:
             "timeproperty": timeproperty,
         }
         params.update(kwargs)
+        projection = as_projection(fields)
+        if projection is not None:
+            params = projection.apply(params)
 
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
 
-        # Validate that at least one filter is provided
+        self._check_query_filters(params)
+
+        if georel:
+            indexed = self._query_spatial_index(params, consistency)
+            if indexed is not None:
+                return indexed
+
+        # Only single-type queries are cached, so writes can invalidate them
+        query_type = str(params.get("type") or "")
+        cacheable = bool(query_type) and "," not in query_type
+        cache_key = make_cache_key("query", self.CONTEXT_URL, params=params)
+        if cacheable:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self.cache.generation(query_type)
+
+        response = await self._make_request(
+            "GET", "entities", headers=self.LINK_HEADER, params=params
+        )
+
+        # Return count if requested
+        if count:
+            result: Union[List[Dict[str, Any]], int] = int(
+                response.headers.get("NGSILD-Results-Count", 0)
+            )
+        else:
+            result = self._json(response)
+
+        if cacheable:
+            self.cache.set(cache_key, result, query_type, generation=generation)
+        return result
+
+    def _query_spatial_index(
+        self, params: Dict[str, Any], consistency: Optional[str] = None
+    ) -> Optional[Union[List[Dict[str, Any]], int]]:
+        """
+        Answer a geo-query from the local spatial index of its entity type.
+
+        Returns None (ask the broker) unless the type is indexed and loaded,
+        the consistency is eventual and every parameter can be evaluated
+        locally (no q, temporal or federation options).
+        """
+        if (consistency or settings.spatial_index_consistency) != EVENTUAL:
+            return None
+        index = get_spatial_index(params.get("type"))
+        if index is None or not index.ready:
+            return None
+        if not set(params) <= _LOCAL_GEO_PARAMS:
+            return None
+        if params.get("geoproperty", index.geoproperty) != index.geoproperty:
+            return None
+        if params.get("options") not in (None, "keyValues"):
+            return None
+
+        try:
+            entities = index.query(
+                params["georel"], params.get("geometry"), params.get("coordinates")
+            )
+        except (ValueError, TypeError, IndexError):
+            return None  # Let the broker report the malformed query
+        if entities is None:
+            return None
+
+        if params.get("id"):
+            ids = set(params["id"].split(","))
+            entities = [e for e in entities if e["id"] in ids]
+        if params.get("count"):
+            return len(entities)
+
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", _ORION_DEFAULT_LIMIT))
+        key_values = (
+            params.get("format") == "simplified" or params.get("options") == "keyValues"
+        )
+        return [
+            select_attributes(e, params.get("pick") or params.get("attrs"), key_values)
+            for e in entities[offset : offset + limit]
+        ]
+
+    async def select(
+        self, fields: Union[str, Sequence[str], Projection], **query
+    ) -> List[Any]:
+        """
+        Query only the declared attributes and return typed records.
+
+        Args:
+            fields: Attributes needed (Projection, list or comma-separated)
+            **query: query_entities() parameters (type defaults to the service's)
+
+        Returns:
+            One named tuple per entity (id, type, *fields); missing attributes
+            are None
+
+        Example:
+            for light in await service.select("forcePhase,location", limit=50):
+                print(light.id, light.forcePhase)
+        """
+        projection = as_projection(fields)
+        query.setdefault("type", self.entity_type)
+        query["count"] = False
+        entities = await self.query_entities(fields=projection, **query)
+        if isinstance(entities, int):
+            return []
+        return projection.records(entities)
+
+    async def query_entities_raw(self, **query) -> httpx.Response:
+        """
+        Query entities and return the undecoded broker response. (GET /entities)
+
+        For routes that forward Orion's JSON unchanged; use the response's
+        .content and headers (e.g. NGSILD-Results-Count). Not cached.
+
+        Args:
+            **query: Same parameters as query_entities()
+
+        Returns:
+            httpx.Response from Orion-LD
+
+        Raises:
+            ValueError: If query is too broad (no filters provided)
+        """
+        params = push_down({k: v for k, v in query.items() if v is not None})
+        self._check_query_filters(params)
+        return await self._make_request(
+            "GET", "entities", headers=self.LINK_HEADER, params=params
+        )
+
+    async def stream_entities(self, **query) -> httpx.Response:
+        """
+        Open GET /entities as a stream without reading the body.
+
+        For pass-through routes: the body is relayed to the client chunk by
+        chunk (see app.api.responses.broker_stream_response), so the entity
+        list is never held in memory. Queries the service can answer better
+        are not streamed but returned as a read response: geo-queries the
+        spatial index answers, types with a cache TTL (cached as bytes) and,
+        with coalesce_gets on, GETs shared with identical concurrent ones.
+
+        Args:
+            **query: Same parameters as query_entities()
+
+        Returns:
+            httpx.Response - if streaming, the caller must aclose() it
+
+        Raises:
+            ValueError: If query is too broad (no filters provided)
+        """
+        consistency = query.pop("consistency", None)
+        params = push_down({k: v for k, v in query.items() if v is not None})
+        self._check_query_filters(params)
+
+        if params.get("georel"):
+            indexed = self._query_spatial_index(params, consistency)
+            if indexed is not None:
+                return httpx.Response(
+                    200,
+                    content=self.serializer.dumps(indexed),
+                    headers={"Content-Type": "application/json"},
+                )
+
+        query_type = params.get("type")
+        cacheable = (
+            isinstance(query_type, str)
+            and "," not in query_type
+            and self.cache.ttl_for(query_type) > 0
+        )
+        if cacheable:
+            cache_key = make_cache_key("query_raw", self.CONTEXT_URL, params=params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                content, headers = cached
+                return httpx.Response(200, content=content, headers=headers)
+            generation = self.cache.generation(query_type)
+
+        if not cacheable and not self.coalesce_gets:
+            breaker = get_circuit_breaker(f"{self.ORION_LD_URL}/entities")
+            return await self._send_request(
+                "GET",
+                f"{self.ORION_LD_URL}/entities",
+                self.LINK_HEADER,
+                self._clean_params(params),
+                None,
+                breaker,
+                stream=True,
+            )
+
+        response = await self._make_request(
+            "GET", "entities", headers=self.LINK_HEADER, params=params
+        )
+        if cacheable:
+            headers = {
+                name: response.headers[name]
+                for name in ("Content-Type", "NGSILD-Results-Count")
+                if name in response.headers
+            }
+            self.cache.set(
+                cache_key,
+                (response.content, headers),
+                query_type,
+                generation=generation,
+            )
+        return response
+
+    @staticmethod
+    def _check_query_filters(params: Dict[str, Any]) -> None:
+        """Validate that at least one filter is provided."""
         filter_keys = {"type", "q", "id", "georel", "attrs", "local"}
         if not any(key in params for key in filter_keys):
             raise ValueError(
@@ -529,15 +1406,149 @@ class BaseService:
                 "'type', 'q', 'id', 'georel', 'attrs', or 'local'."
             )
 
+    async def _query_page(
+        self, params: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Fetch one page of GET /entities.
+
+        Returns:
+            (entities, total) - total comes from NGSILD-Results-Count when the
+            page was requested with count=true, otherwise None
+        """
         response = await self._make_request(
             "GET", "entities", headers=self.LINK_HEADER, params=params
         )
+        total = response.headers.get("NGSILD-Results-Count")
+        return self._json(response), int(total) if total is not None else None
 
-        # Return count if requested
-        if count:
-            return int(response.headers.get("NGSILD-Results-Count", 0))
+    async def iter_entities(
+        self,
+        page_size: Optional[int] = None,
+        prefetch: bool = True,
+        **query,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every entity matching a query, page by page. (GET /entities)
+
+        Pages are requested lazily with limit/offset. The first page asks for
+        `count=true` so the walk stops at NGSILD-Results-Count; while the caller
+        consumes a page, the next one is already being fetched (`prefetch`).
+        Only one or two pages are held in memory, whatever the result size.
+
+        Args:
+            page_size: Entities per request (default: settings.orion_page_size)
+            prefetch: Fetch the next page while the current one is consumed
+            **query: Same keyword filters as query_entities (type, q, pick,
+                     georel, format, options, ...). 'limit' caps the total
+                     number of entities yielded and 'offset' is the start.
+
+        Yields:
+            Entity dictionaries
+
+        Raises:
+            ValueError: If query is too broad (no filters provided)
+
+        Example:
+            async for entity in service.iter_entities(
+                type="AirQualityObserved", q="pm25>50", format="simplified"
+            ):
+                process(entity)
+        """
+        pages = self.iter_pages(page_size=page_size, prefetch=prefetch, **query)
+        try:
+            async for entities in pages:
+                for entity in entities:
+                    yield entity
+        finally:
+            await pages.aclose()
+
+    async def iter_pages(
+        self,
+        page_size: Optional[int] = None,
+        prefetch: bool = True,
+        **query,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Page-level counterpart of iter_entities(), for vectorized consumers.
+
+        Takes the same arguments and yields each non-empty page as a list.
+
+        Example:
+            async for page in service.iter_pages(type="AirQualityObserved"):
+                values = np.array([e["pm25"] for e in page], dtype=float)
+        """
+        query.pop("count", None)
+        max_results: Optional[int] = query.pop("limit", None)
+        offset: int = query.pop("offset", None) or 0
+        page_size = max(1, page_size or settings.orion_page_size)
+
+        params = push_down({k: v for k, v in query.items() if v is not None})
+        self._check_query_filters(params)
+
+        def page_params(start: int, size: int, with_count: bool) -> Dict[str, Any]:
+            page = dict(params, offset=start, limit=size)
+            if with_count:
+                page["count"] = True
+            return page
+
+        first_offset = offset
+        total: Optional[int] = None
+        size = page_size if max_results is None else min(page_size, max_results)
+        if size <= 0:
+            return
+
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(
+            self._query_page(page_params(offset, size, with_count=True))
+        )
+        try:
+            while next_page is not None:
+                entities, page_total = await next_page
+                next_page = None
+                if page_total is not None:
+                    total = page_total
+
+                # A short page, the reported total or the caller's limit ends the walk
+                offset += len(entities)
+                has_more = len(entities) == size
+                if total is not None and offset >= total:
+                    has_more = False
+                if max_results is not None:
+                    size = min(page_size, max_results - (offset - first_offset))
+                    has_more = has_more and size > 0
+
+                if has_more and prefetch:
+                    next_page = asyncio.ensure_future(
+                        self._query_page(page_params(offset, size, with_count=False))
+                    )
+
+                if entities:
+                    yield entities
+
+                if has_more and not prefetch:
+                    next_page = asyncio.ensure_future(
+                        self._query_page(page_params(offset, size, with_count=False))
+                    )
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    def iter_all(
+        self, page_size: Optional[int] = None, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming counterpart of the per-type get_all().
+
+        Accepts the same filter keywords as get_all() and adds the service
+        entity type automatically.
 
-        return response.json()
+        Example:
+            async for building in building_service.iter_all(q="category==office"):
+                ...
+        """
+        if self.entity_type is None:
+            raise ValueError(f"{type(self).__name__} is not bound to an entity type.")
+        return self.iter_entities(page_size=page_size, type=self.entity_type, **kwargs)
 
     async def temporal_query(
         self,
@@ -550,6 +1561,10 @@ class BaseService:
         """
         Performs a temporal query. (GET /temporal/entities)
 
+        Long 'between' ranges are split into windows fetched concurrently
+        (see iter_temporal) and partial (206) responses are followed, so the
+        result covers the whole range.
+
         Args:
             timerel: Temporal relationship ('before', 'after', 'between')
             timeAt: Timestamp in ISO8601 format
@@ -558,18 +1573,114 @@ class BaseService:
             **kwargs: Additional query parameters
 
         Returns:
-            List of temporal entities
+            List of temporal entities, each attribute's instances in time order
         """
-        params = {
-            "timerel": timerel,
-            "timeAt": timeAt,
-            "endTimeAt": endTimeAt,
-            "type": type,
-        }
+        windows = [
+            entities
+            async for entities in self.iter_temporal(
+                timerel, timeAt, endTimeAt, type=type, **kwargs
+            )
+        ]
+        return merge_temporal_entities(
+            windows, kwargs.get("timeproperty") or "observedAt"
+        )
+
+    async def iter_temporal(
+        self,
+        timerel: str,
+        timeAt: str,
+        endTimeAt: Optional[str] = None,
+        window: Optional[timedelta] = None,
+        **kwargs,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream a temporal query window by window, in chronological order.
+
+        A 'between' range longer than `window` is split into sub-windows;
+        up to `temporal_max_concurrency` of them are fetched ahead while the
+        caller consumes earlier ones. Queries with `lastN` are not split (the
+        last N instances are only known over the whole range).
+
+        Args:
+            timerel: Temporal relationship ('before', 'after', 'between')
+            timeAt: Timestamp in ISO8601 format
+            endTimeAt: End timestamp (required for 'between')
+            window: Sub-window length (default: settings.temporal_window_hours)
+            **kwargs: Additional query parameters (type, attrs, lastN, ...)
+
+        Yields:
+            Temporal entities of one window, attribute instances in time order
+
+        Example:
+            async for entities in service.iter_temporal(
+                "between", "2025-11-01T00:00:00Z", "2025-11-08T00:00:00Z",
+                type="AirQualityObserved", attrs="pm25",
+            ):
+                process(entities)
+        """
+        params = {"timerel": timerel, "timeAt": timeAt, "endTimeAt": endTimeAt}
         params.update(kwargs)
         params = {k: v for k, v in params.items() if v is not None}
+        timeproperty = params.get("timeproperty") or "observedAt"
 
-        response = await self._make_request(
-            "GET", "temporal/entities", headers=self.LINK_HEADER, params=params
+        windows: Sequence[Tuple[str, Optional[str]]]
+        if timerel == "between" and endTimeAt and not params.get("lastN"):
+            windows = split_time_range(
+                timeAt, endTimeAt, window or self.temporal_window
+            )
+        else:
+            windows = [(timeAt, endTimeAt)]
+
+        remaining = iter(windows)
+        in_flight: Deque["asyncio.Future[List[List[Dict[str, Any]]]]"] = deque()
+
+        def schedule_next() -> None:
+            next_window = next(remaining, None)
+            if next_window is not None:
+                window_params = dict(params)
+                if next_window[1] is not None:
+                    window_params["timeAt"], window_params["endTimeAt"] = next_window
+                in_flight.append(
+                    asyncio.ensure_future(self._fetch_temporal_window(window_params))
+                )
+
+        for _ in range(max(1, self.temporal_max_concurrency)):
+            schedule_next()
+        try:
+            while in_flight:
+                pages = await in_flight.popleft()
+                schedule_next()
+                yield merge_temporal_entities(pages, timeproperty)
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _fetch_temporal_window(
+        self, params: Dict[str, Any]
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch one time window, following partial (206) responses."""
+        pages = []
+        for _ in range(self.temporal_max_pages):
+            response = await self._make_request(
+                "GET", "temporal/entities", headers=self.LINK_HEADER, params=params
+            )
+            pages.append(self._json(response))
+
+            content_range = parse_content_range(response)
+            if content_range is None:
+                return pages
+            next_params = next_page_params(params, content_range)
+            if next_params is None:
+                # A full page of instances at one instant: the broker cannot
+                # be asked for the rest by time
+                logger.warning(
+                    f"Temporal page did not advance past {content_range}; "
+                    f"instances at that instant may be incomplete: {params}"
+                )
+                return pages
+            params = next_params
+
+        logger.warning(
+            f"Temporal query stopped after {self.temporal_max_pages} pages: {params}"
         )
-        return response.json()
+        return pages
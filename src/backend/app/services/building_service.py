@@ -384,6 +384,7 @@ class BuildingService(BaseService):
         limit: Optional[int] = None,
         format: Optional[str] = None,
         pick: Optional[str] = None,
+        consistency: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find Building entities near a specific location.
@@ -394,6 +395,7 @@ class BuildingService(BaseService):
             limit: Maximum number of results
             format: Response format ('simplified' for key-value pairs)
             pick: Attributes to select
+            consistency: 'eventual' (local spatial index) or 'strong' (broker)
 
         Returns:
             List of nearby Building entities
@@ -415,6 +417,7 @@ class BuildingService(BaseService):
             format=format,
             pick=pick,
             count=False,
+            consistency=consistency,
         )
         if isinstance(result, int):
             return []
@@ -0,0 +1,616 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+import copy
+import csv
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Generator, List, Optional, Tuple, Type
+
+import annotated_types
+import httpx
+from pydantic import BaseModel, ValidationError, create_model
+
+from app.core.config import settings
+from app.models.AirQualityObserved import AirQualityObserved
+from app.models.Building import Building
+from app.models.CarbonFootprint import CarbonFootprint
+from app.models.Device import Device
+from app.models.RoadSegment import RoadSegment
+from app.models.TrafficEnvironmentImpact import TrafficEnvironmentImpact
+from app.models.TrafficFlowObserved import TrafficFlowObserved
+from app.models.WaterQualityObserved import WaterQualityObserved
+
+from .air_quality_service import air_quality_service
+from .base_service import BaseService
+from .building_service import building_service
+from .carbon_footprint_service import carbon_footprint_service
+from .columnar_export import TIMESTAMP, column_kinds
+from .device_service import device_service
+from .road_segment_service import road_segment_service
+from .traffic_enviroment_impact_service import traffic_environment_impact_service
+from .traffic_flow_service import traffic_flow_service
+from .water_quality_service import water_quality_service
+
+logger = logging.getLogger(__name__)
+
+ROW_FORMATS = ("ndjson", "csv")
+
+# dataset -> (service, Smart Data Model rows are validated against)
+DATASETS: Dict[str, Tuple[BaseService, Type[BaseModel]]] = {
+    "air-quality": (air_quality_service, AirQualityObserved),
+    "water-quality": (water_quality_service, WaterQualityObserved),
+    "carbon-footprint": (carbon_footprint_service, CarbonFootprint),
+    "traffic-environment-impact": (
+        traffic_environment_impact_service,
+        TrafficEnvironmentImpact,
+    ),
+    "traffic-flow": (traffic_flow_service, TrafficFlowObserved),
+    "devices": (device_service, Device),
+    "buildings": (building_service, Building),
+    "road-segments": (road_segment_service, RoadSegment),
+}
+
+# Import states
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_ATTRIBUTE_TYPES = ("Property", "GeoProperty", "Relationship", "LanguageProperty")
+_GEOMETRY_TYPES = {
+    "Point",
+    "LineString",
+    "Polygon",
+    "MultiPoint",
+    "MultiLineString",
+    "MultiPolygon",
+}
+
+
+def format_of(path: str) -> str:
+    """Row format from a file extension (.ndjson/.jsonl or .csv)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot infer the format of {path}; use one of {ROW_FORMATS}")
+
+
+def read_rows(path: str, row_format: str) -> Generator[Dict[str, Any], None, None]:
+    """
+    Stream the rows of an NDJSON or CSV file without loading it.
+
+    Blank NDJSON lines are skipped; an unparsable line is yielded as
+    {"__error__": message} so row numbers stay stable across runs.
+    """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"format must be one of {ROW_FORMATS}")
+    with open(path, newline="", encoding="utf-8") as source:
+        if row_format == "csv":
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield {"__error__": f"Invalid JSON: {e}"}
+
+
+def _cell(value: Any) -> Any:
+    # CSV cells are text: structured values are written as JSON
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if value == "":
+        return None
+    if value[0] in "{[":
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _unwrap(attribute: Any) -> Any:
+    # Rows may hold normalized NGSI-LD attributes as well as plain values
+    if isinstance(attribute, dict) and attribute.get("type") in _ATTRIBUTE_TYPES:
+        attribute = attribute.get("value", attribute.get("object"))
+    if isinstance(attribute, dict) and "@value" in attribute:
+        return attribute["@value"]
+    return attribute
+
+
+def _row_data(row: Dict[str, Any]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for name, value in row.items():
+        if name is None or name == "@context":
+            continue
+        value = _unwrap(_cell(value))
+        if value is None:
+            continue
+        if "." in name:
+            # address.streetAddress -> {"address": {"streetAddress": ...}}
+            parent, child = name.split(".", 1)
+            data.setdefault(parent, {})[child] = value
+        else:
+            data[name] = value
+
+    # Columns written by the columnar export
+    lon, lat = data.pop("location_lon", None), data.pop("location_lat", None)
+    if "location" not in data and lon is not None and lat is not None:
+        data["location"] = {"type": "Point", "coordinates": [float(lon), float(lat)]}
+    return data
+
+
+def _attribute(name: str, value: Any, kind: Optional[str]) -> Dict[str, Any]:
+    if (
+        isinstance(value, dict)
+        and value.get("type") in _GEOMETRY_TYPES
+        and "coordinates" in value
+    ):
+        return {"type": "GeoProperty", "value": value}
+    if name.startswith("ref") and isinstance(value, str):
+        return {"type": "Relationship", "object": value}
+    if kind == TIMESTAMP:
+        return {"type": "Property", "value": {"@type": "DateTime", "@value": value}}
+    return {"type": "Property", "value": value}
+
+
+@lru_cache(maxsize=None)
+def _column_kinds(model: Type[BaseModel]) -> Dict[str, str]:
+    return column_kinds(model)
+
+
+def _is_string_constraint(metadata: Any) -> bool:
+    return isinstance(
+        metadata, (annotated_types.MinLen, annotated_types.MaxLen)
+    ) or bool(getattr(metadata, "pattern", None))
+
+
+@lru_cache(maxsize=None)
+def _row_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    # The generated models escape their identifier pattern twice (it rejects
+    # every URN) and put string-length bounds on GeoJSON objects: those
+    # constraints are dropped, everything else is validated as declared.
+    fields: Dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        patterns = [getattr(m, "pattern", None) or "" for m in field.metadata]
+        if any("\\\\w" in pattern for pattern in patterns):
+            field = copy.copy(field)
+            field.metadata = [m for m in field.metadata if not _is_string_constraint(m)]
+        fields[name] = (field.annotation, field)
+    return create_model(model.__name__, **fields)
+
+
+def row_to_entity(
+    row: Dict[str, Any], model: Type[BaseModel], entity_type: str
+) -> Dict[str, Any]:
+    """
+    Validate a row against a Smart Data Model and build the NGSI-LD entity.
+
+    Rows are flat (CSV, `a.b` columns for nested values, location_lon and
+    location_lat for Points) or JSON objects with plain or normalized values.
+
+    Raises:
+        ValueError: If the row has no id or does not validate
+
+    Example:
+        row_to_entity({"id": "urn:ngsi-ld:AirQualityObserved:1", "pm25": "12"},
+                      AirQualityObserved, "AirQualityObserved")
+        # -> {"id": ..., "type": ..., "pm25": {"type": "Property", "value": 12.0}}
+    """
+    if "__error__" in row:
+        raise ValueError(row["__error__"])
+    data = _row_data(row)
+    if not data.get("id"):
+        raise ValueError("Missing id")
+    data.pop("type", None)
+
+    values = (
+        _row_model(model)
+        .model_validate(data)
+        .model_dump(mode="json", by_alias=True, exclude_unset=True, exclude_none=True)
+    )
+    kinds = _column_kinds(model)
+    entity = {"id": values.pop("id"), "type": entity_type}
+    values.pop("type", None)
+    for name, value in values.items():
+        entity[name] = _attribute(name, value, kinds.get(name))
+    return entity
+
+
+def _validate_rows(
+    model: Type[BaseModel], entity_type: str, rows: List[Tuple[int, Dict[str, Any]]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # Runs in a worker process: module-level and picklable
+    entities, errors = [], []
+    for number, row in rows:
+        try:
+            entities.append(row_to_entity(row, model, entity_type))
+        except ValidationError as e:
+            errors.append({"row": number, "error": _validation_message(e)})
+        except (ValueError, TypeError) as e:
+            errors.append({"row": number, "error": str(e)})
+    return entities, errors
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _fingerprint(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+class ImportCheckpoint:
+    """
+    Progress of one import, persisted after every uploaded window.
+
+    `rows_done` rows have been validated and upserted. Upserts are
+    idempotent, so a run interrupted mid-window is resumed by replaying that
+    window. The source file's size and mtime are recorded so a resume
+    against a different file is refused.
+
+    Usage:
+        checkpoint = ImportCheckpoint.load("data/imports/a1b2.checkpoint.json")
+    """
+
+    def __init__(self, path: Optional[str], state: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.state: Dict[str, Any] = state or {}
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "ImportCheckpoint":
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return cls(path, json.load(f))
+        return cls(path)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Write-then-rename: a crash never leaves a truncated checkpoint
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(temporary, self.path)
+
+
+class ImportReport:
+    """Counters and the first errors of an import run."""
+
+    def __init__(self, entity_type: str, source: str, rows_done: int = 0):
+        self.entity_type = entity_type
+        self.source = source
+        self.status = RUNNING
+        self.resumed_from = rows_done
+        self.rows_done = rows_done
+        self.imported = 0
+        self.invalid = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.message: Optional[str] = None
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.finished_at: Optional[str] = None
+
+    def add_errors(self, errors: List[Dict[str, Any]]) -> None:
+        room = settings.import_max_errors - len(self.errors)
+        if room > 0:
+            self.errors.extend(errors[:room])
+
+    def finish(self, status: str, message: Optional[str] = None) -> None:
+        self.status = status
+        self.message = message
+        self.finished_at = datetime.now(timezone.utc).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entityType": self.entity_type,
+            "source": self.source,
+            "status": self.status,
+            "resumedFrom": self.resumed_from,
+            "rowsDone": self.rows_done,
+            "imported": self.imported,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "errors": self.errors,
+            "message": self.message,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ImportReport":
+        report = cls(data["entityType"], data["source"], data.get("resumedFrom", 0))
+        report.status = data.get("status", RUNNING)
+        report.rows_done = data.get("rowsDone", 0)
+        report.imported = data.get("imported", 0)
+        report.invalid = data.get("invalid", 0)
+        report.failed = data.get("failed", 0)
+        report.errors = data.get("errors", [])
+        report.message = data.get("message")
+        report.started_at = data.get("startedAt", report.started_at)
+        report.finished_at = data.get("finishedAt")
+        return report
+
+
+def _upload_failures(response: httpx.Response) -> List[Dict[str, Any]]:
+    if response.status_code != 207:
+        return []
+    try:
+        return response.json().get("errors", [])
+    except ValueError:
+        return []
+
+
+def _entity_type_of(service: BaseService) -> str:
+    if not service.entity_type:
+        raise ValueError(f"{type(service).__name__} has no entity type to import")
+    return service.entity_type
+
+
+async def import_entities(
+    service: BaseService,
+    model: Type[BaseModel],
+    path: str,
+    row_format: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    window_rows: Optional[int] = None,
+    workers: Optional[int] = None,
+    options: str = "update",
+    report: Optional[ImportReport] = None,
+) -> ImportReport:
+    """
+    Import an NDJSON or CSV file into Orion-LD, resuming from a checkpoint.
+
+    The file is read in windows of `window_rows` rows. Each window is split
+    across `workers` processes for model validation, then sent with
+    service.batch_upsert() (chunked and concurrent, see
+    settings.orion_batch_*), then checkpointed. Invalid rows and rejected
+    entities are counted and the first ones reported; they do not stop
+    the import. Broker outages do: the checkpoint is left at the last
+    complete window and the error propagates.
+
+    Args:
+        service: Service of the imported entity type
+        model: Smart Data Model rows are validated against
+        path: NDJSON (.ndjson/.jsonl) or CSV file
+        row_format: "ndjson" or "csv" (default: from the extension)
+        checkpoint_path: Progress file; an existing one resumes the import
+        window_rows: Rows per window (default: settings.import_window_rows)
+        workers: Validation processes, 0 for inline (default: settings.import_workers)
+        options: batch_upsert option, 'update' or 'replace'
+        report: Report to update in place (e.g. one exposed by a status route)
+
+    Returns:
+        The final ImportReport
+
+    Example:
+        report = await import_entities(
+            air_quality_service, AirQualityObserved, "day.csv",
+            checkpoint_path="day.checkpoint.json",
+        )
+    """
+    row_format = row_format or format_of(path)
+    window_rows = max(1, window_rows or settings.import_window_rows)
+    workers = settings.import_workers if workers is None else workers
+    entity_type = _entity_type_of(service)
+
+    checkpoint = ImportCheckpoint.load(checkpoint_path)
+    fingerprint = _fingerprint(path)
+    if checkpoint.state and checkpoint.state.get("fingerprint") != fingerprint:
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different file")
+    rows_done = checkpoint.state.get("rowsDone", 0)
+    if report is None:
+        report = ImportReport(entity_type, os.path.basename(path), rows_done)
+    if checkpoint.state.get("report"):
+        previous = ImportReport.from_dict(checkpoint.state["report"])
+        report.imported, report.invalid = previous.imported, previous.invalid
+        report.failed, report.errors = previous.failed, previous.errors
+    report.resumed_from = report.rows_done = rows_done
+    if rows_done:
+        logger.info(f"Resuming import of {path} after row {rows_done}")
+
+    def save() -> None:
+        checkpoint.state = {
+            "fingerprint": fingerprint,
+            "format": row_format,
+            "rowsDone": report.rows_done,
+            "report": report.to_dict(),
+        }
+        checkpoint.save()
+
+    save()
+    executor: Optional[Executor] = (
+        ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    )
+    loop = asyncio.get_running_loop()
+    rows = read_rows(path, row_format)
+    try:
+        # Already imported rows are only read, not validated or sent
+        await asyncio.to_thread(lambda: sum(1 for _ in islice(rows, rows_done)))
+        while True:
+            window = await asyncio.to_thread(lambda: list(islice(rows, window_rows)))
+            if not window:
+                break
+            numbered = list(enumerate(window, start=report.rows_done + 1))
+
+            if executor is None:
+                results = [_validate_rows(model, entity_type, numbered)]
+            else:
+                size = -(-len(numbered) // workers)
+                results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            executor,
+                            _validate_rows,
+                            model,
+                            entity_type,
+                            numbered[i : i + size],
+                        )
+                        for i in range(0, len(numbered), size)
+                    )
+                )
+            entities = [entity for found, _ in results for entity in found]
+            errors = [error for _, found in results for error in found]
+            if entities:
+                try:
+                    response = await service.batch_upsert(entities, options=options)
+                    failures = _upload_failures(response)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code >= 500:
+                        raise
+                    # The broker rejected the whole request: no entity of it stored
+                    failures = [
+                        {"entityId": entity["id"], "error": e.response.text}
+                        for entity in entities
+                    ]
+                report.failed += len(failures)
+                report.imported += len(entities) - len(failures)
+                failures = [
+                    {"entityId": f.get("entityId"), "error": f.get("error")}
+                    for f in failures
+                ]
+            else:
+                failures = []
+
+            # Counted once the window is stored, so a retried window never
+            # reports its invalid rows twice
+            report.invalid += len(errors)
+            report.add_errors(errors + failures)
+            report.rows_done += len(window)
+            save()
+            logger.info(
+                f"Import {report.source}: {report.rows_done} rows, "
+                f"{report.imported} imported, {report.invalid} invalid, "
+                f"{report.failed} failed"
+            )
+    except BaseException as e:
+        report.finish(FAILED, str(e) or type(e).__name__)
+        save()
+        raise
+    finally:
+        try:
+            rows.close()
+        except ValueError:
+            # Still being read by a cancelled to_thread() call
+            pass
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    report.finish(COMPLETED)
+    save()
+    return report
+
+
+# Imports started through the API, by import ID
+imports: Dict[str, ImportReport] = {}
+_import_tasks: Dict[str, "asyncio.Task"] = {}
+
+
+def import_paths(import_id: str, row_format: str) -> Tuple[str, str]:
+    """Uploaded file and checkpoint paths of an API import."""
+    base = os.path.join(settings.import_directory, import_id)
+    return f"{base}.{row_format}", f"{base}.checkpoint.json"
+
+
+def new_import_id() -> str:
+    return uuid.uuid4().hex
+
+
+def find_import(import_id: str) -> Optional[ImportReport]:
+    """Report of a running or past API import (from its checkpoint after a restart)."""
+    if import_id in imports:
+        return imports[import_id]
+    _, checkpoint_path = import_paths(import_id, "")
+    checkpoint = ImportCheckpoint.load(checkpoint_path)
+    if not checkpoint.state.get("report"):
+        return None
+    report = ImportReport.from_dict(checkpoint.state["report"])
+    if report.status == RUNNING:
+        # The process running it is gone
+        report.finish(FAILED, "Interrupted")
+    return report
+
+
+def start_import(
+    import_id: str, dataset: str, row_format: str, options: str = "update"
+) -> ImportReport:
+    """
+    Run an import of an uploaded file in the background.
+
+    Starting an import ID again resumes it from its checkpoint.
+
+    Raises:
+        RuntimeError: If the import is still running
+    """
+    task = _import_tasks.get(import_id)
+    if task is not None and not task.done():
+        raise RuntimeError(f"Import {import_id} is already running")
+
+    service, model = DATASETS[dataset]
+    path, checkpoint_path = import_paths(import_id, row_format)
+    report = ImportReport(_entity_type_of(service), os.path.basename(path))
+    imports[import_id] = report
+
+    async def run() -> None:
+        try:
+            await import_entities(
+                service,
+                model,
+                path,
+                row_format=row_format,
+                checkpoint_path=checkpoint_path,
+                options=options,
+                report=report,
+            )
+        except Exception as e:
+            logger.error(f"Import {import_id} failed: {e}")
+            if report.status == RUNNING:
+                report.finish(FAILED, str(e))
+        finally:
+            _import_tasks.pop(import_id, None)
+
+    _import_tasks[import_id] = asyncio.create_task(run())
+    return report
+
+
+def resume_import(import_id: str, options: str = "update") -> Optional[ImportReport]:
+    """
+    Restart an interrupted or failed API import from its checkpoint.
+
+    Returns:
+        The new report, or None for an unknown import ID or entity type
+    """
+    _, checkpoint_path = import_paths(import_id, "")
+    state = ImportCheckpoint.load(checkpoint_path).state
+    if not state.get("report"):
+        return None
+    entity_type = state["report"]["entityType"]
+    dataset = next(
+        (
+            name
+            for name, (service, _) in DATASETS.items()
+            if service.entity_type == entity_type
+        ),
+        None,
+    )
+    if dataset is None:
+        return None
+    return start_import(import_id, dataset, state["format"], options=options)
@@ -12,6 +12,7 @@ import httpx
 from app.models.CarbonFootprint import CarbonFootprint
 
 from .base_service import BaseService
+from .historical_service import historical_service
 
 logger = logging.getLogger(__name__)
 
@@ -462,6 +463,11 @@ class CarbonFootprintService(BaseService):
         """
         Get recent CarbonFootprint entities since a specific time.
 
+        Served from QuantumLeap (the latest recorded version of each
+        entity, filtered on emissionDate); scans Orion-LD's current state
+        instead when QuantumLeap is unreachable or does not hold every
+        entity, e.g. before POST /subscriptions/quick/history was called.
+
         Args:
             since: ISO8601 timestamp (e.g., "2025-11-15T10:00:00Z")
             limit: Maximum number of results
@@ -479,6 +485,12 @@ class CarbonFootprintService(BaseService):
                 pick="id,type,emissionDate,CO2eq,emissionSource"
             )
         """
+        records = await historical_service.current_state(
+            self, [("emissionDate", ">", since)], pick=pick, format=format, limit=limit
+        )
+        if records is not None:
+            return records
+
         q = f"emissionDate>'{since}'"
         result = await self.get_all(
             q=q, limit=limit, format=format, pick=pick, count=False
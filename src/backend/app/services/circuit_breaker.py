@@ -0,0 +1,203 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Methods that can be re-sent without changing the outcome (RFC 9110)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Statuses worth retrying; 429 is retried for every method (not processed)
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.RequestError):
+    """
+    Raised without contacting the broker while an endpoint's circuit is open.
+
+    Subclasses httpx.RequestError so existing router handlers answer 503.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for {endpoint} - retry in {retry_in:.1f}s",
+            request=httpx.Request("GET", endpoint),
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures (connection errors or 5xx)
+    the circuit opens and calls fail fast for `reset_timeout` seconds. Then a
+    single trial call is let through (half-open): success closes the circuit,
+    failure opens it again.
+
+    Usage:
+        breaker = get_circuit_breaker(url)
+        breaker.before_request()  # raises CircuitOpenError when open
+        try:
+            response = await send()
+        except httpx.RequestError:
+            breaker.record_failure()
+            raise
+        except BaseException:  # Cancelled, or failed before any response
+            breaker.record_abort()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.total_failures = 0
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """Let a call through or raise CircuitOpenError."""
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN:
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.endpoint, retry_in)
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+            logger.info(f"Circuit half-open for {self.endpoint}")
+
+        # Half-open: one trial call at a time
+        if self._trial_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(self.endpoint, 0.0)
+        self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a healthy response."""
+        if self.state != CLOSED:
+            logger.info(f"Circuit closed for {self.endpoint}")
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        self.failures += 1
+        self.total_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f"Circuit opened for {self.endpoint} after "
+                    f"{self.failures} consecutive failures"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def record_abort(self) -> None:
+        """
+        Release a call that ended without an outcome (e.g. cancelled).
+
+        A half-open trial counts as failed, so the next trial is let through
+        after another `reset_timeout` instead of the circuit staying
+        half-open forever. Other calls say nothing about the broker's health
+        and are not counted.
+        """
+        if self._trial_in_flight:
+            self.record_failure()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for monitoring."""
+        retry_in = 0.0
+        if self.state == OPEN:
+            retry_in = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected,
+            "retry_in": round(retry_in, 3),
+        }
+
+
+# endpoint -> breaker, shared by all service singletons
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """Return the breaker for an endpoint, creating it on first use."""
+    breaker = circuit_breakers.get(endpoint)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            endpoint,
+            failure_threshold=settings.orion_breaker_failure_threshold,
+            reset_timeout=settings.orion_breaker_reset_timeout,
+        )
+        circuit_breakers[endpoint] = breaker
+    return breaker
+
+
+def circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker, keyed by endpoint."""
+    return {endpoint: b.snapshot() for endpoint, b in circuit_breakers.items()}
+
+
+def is_breaker_failure(error: Exception) -> bool:
+    """Whether an error means the broker is unhealthy (not a client error)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.RequestError) and not isinstance(
+        error, CircuitOpenError
+    )
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for retry `attempt` (1-based)."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
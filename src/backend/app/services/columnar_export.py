@@ -0,0 +1,320 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+import typing
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Type
+
+from pydantic import AwareDatetime, BaseModel, NaiveDatetime
+
+from app.core.config import settings
+
+from .base_service import BaseService
+from .serialization import json_serializer
+from .temporal import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Arrow IPC and Parquet writers (pip install pyarrow)
+_PYARROW_AVAILABLE = False
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    pass
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Column kinds and their Arrow types
+FLOAT, INT, BOOL, TIMESTAMP, STRING, JSON = (
+    "float",
+    "int",
+    "bool",
+    "timestamp",
+    "string",
+    "json",
+)
+
+_ENTITY_KEYS = ("id", "type")
+
+
+def _column_kind(annotation: Any) -> str:
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if typing.get_origin(annotation) is typing.Union:
+        kinds = {_column_kind(arg) for arg in args}
+        return kinds.pop() if len(kinds) == 1 else JSON
+    if annotation is bool:
+        return BOOL
+    if annotation is int:
+        return INT
+    if annotation is float:
+        return FLOAT
+    if annotation in (AwareDatetime, NaiveDatetime):
+        return TIMESTAMP
+    if isinstance(annotation, type):
+        if issubclass(annotation, datetime):
+            return TIMESTAMP
+        if issubclass(annotation, (str, Enum)):
+            return STRING
+        if issubclass(annotation, BaseModel):
+            return JSON
+    # URLs and other scalar wrappers are written as text
+    return STRING if typing.get_origin(annotation) is None else JSON
+
+
+def column_kinds(model: Type[BaseModel]) -> Dict[str, str]:
+    """
+    Column name -> kind for the attributes of a Smart Data Model.
+
+    GeoProperties are written as GeoJSON text plus `<name>_lon`/`<name>_lat`
+    columns filled for Points; structured values (address, lists) as JSON.
+
+    Example:
+        column_kinds(AirQualityObserved)["pm25"]  # -> "float"
+    """
+    kinds: Dict[str, str] = {"id": STRING, "type": STRING}
+    for name, field in model.model_fields.items():
+        attribute = field.alias or name
+        if attribute in _ENTITY_KEYS:
+            continue
+        kinds[attribute] = _column_kind(field.annotation)
+        if attribute == "location":
+            kinds["location_lon"] = FLOAT
+            kinds["location_lat"] = FLOAT
+    return kinds
+
+
+def _value(attribute: Any) -> Any:
+    # Normalized Properties wrap the value, Relationships the object;
+    # typed literals (DateTime) carry @value in both formats
+    if isinstance(attribute, dict):
+        if "value" in attribute:
+            return _value(attribute["value"])
+        if "object" in attribute:
+            return attribute["object"]
+        if "@value" in attribute:
+            return attribute["@value"]
+    return attribute
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    try:
+        if kind == FLOAT:
+            return None if isinstance(value, bool) else float(value)
+        if kind == INT:
+            return None if isinstance(value, bool) else int(value)
+        if kind == BOOL:
+            return value if isinstance(value, bool) else None
+        if kind == TIMESTAMP:
+            return parse_timestamp(value) if isinstance(value, str) else None
+    except (TypeError, ValueError):
+        return None
+    if kind == STRING and not isinstance(value, (dict, list)):
+        return str(value)
+    return json_serializer.dumps(value).decode("utf-8")
+
+
+class ColumnBuffer:
+    """
+    Flattens NGSI-LD entities (normalized or simplified) into typed columns.
+
+    Values that do not fit their column type become nulls, so one bad
+    reading never fails an export.
+
+    Usage:
+        buffer = ColumnBuffer(column_kinds(AirQualityObserved))
+        buffer.extend(page)
+        columns = buffer.take()  # {"id": [...], "pm25": [...], ...}
+    """
+
+    def __init__(self, kinds: Dict[str, str]):
+        self.kinds = kinds
+        # GeoProperties whose Point coordinates also get _lon/_lat columns
+        self.points = [name for name in kinds if f"{name}_lon" in kinds]
+        self.attributes = [
+            name
+            for name in kinds
+            if not any(name in (f"{p}_lon", f"{p}_lat") for p in self.points)
+        ]
+        self.columns: Dict[str, List[Any]] = {name: [] for name in kinds}
+        self.rows = 0
+
+    def extend(self, entities: Sequence[Dict[str, Any]]) -> None:
+        columns = self.columns
+        for entity in entities:
+            for name in self.attributes:
+                columns[name].append(
+                    _coerce(_value(entity.get(name)), self.kinds[name])
+                )
+            for name in self.points:
+                geometry = _value(entity.get(name))
+                point = None
+                if isinstance(geometry, dict) and geometry.get("type") == "Point":
+                    point = geometry.get("coordinates")
+                columns[f"{name}_lon"].append(
+                    _coerce(point[0], FLOAT) if point else None
+                )
+                columns[f"{name}_lat"].append(
+                    _coerce(point[1], FLOAT) if point else None
+                )
+        self.rows += len(entities)
+
+    def take(self) -> Dict[str, List[Any]]:
+        """Return the buffered columns and start empty."""
+        columns = self.columns
+        self.columns = {name: [] for name in self.kinds}
+        self.rows = 0
+        return columns
+
+
+def _arrow_type(kind: str) -> "pa.DataType":
+    return {
+        FLOAT: pa.float64(),
+        INT: pa.int64(),
+        BOOL: pa.bool_(),
+        TIMESTAMP: pa.timestamp("ms", tz="UTC"),
+    }.get(kind, pa.string())
+
+
+class _ChunkSink:
+    # Write-only file object the Arrow writers flush into; drained per row group
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def export_columnar(
+    service: BaseService,
+    model: Type[BaseModel],
+    export_format: str = "parquet",
+    columns: Optional[Sequence[str]] = None,
+    row_group_size: Optional[int] = None,
+    **query,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream every matching entity of a service as Parquet or Arrow IPC bytes.
+
+    Pages come from service.iter_pages() in simplified format with only the
+    exported attributes picked; each `row_group_size` rows are written as
+    one Parquet row group / Arrow record batch and yielded, so memory stays
+    bounded by one row group whatever the export size.
+
+    Args:
+        service: Service whose entity type is exported
+        model: Smart Data Model giving the column names and types
+        export_format: "parquet" or "arrow" (IPC stream)
+        columns: Attributes to export (default: every model attribute)
+        row_group_size: Rows per row group (default: settings.export_row_group_size)
+        **query: Filters passed to iter_pages (q, georel, ...)
+
+    Yields:
+        Chunks of the encoded file
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: On an unknown format or column
+
+    Example:
+        async for chunk in export_columnar(
+            air_quality_service, AirQualityObserved, q='dateObserved>="2025-01-01"'
+        ):
+            out.write(chunk)
+    """
+    if not _PYARROW_AVAILABLE:
+        raise RuntimeError("Columnar export requires pyarrow (pip install pyarrow)")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {sorted(EXPORT_FORMATS)}")
+
+    kinds = column_kinds(model)
+    if columns:
+        unknown = [c for c in columns if c not in kinds]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        selected = list(_ENTITY_KEYS) + [c for c in columns if c not in _ENTITY_KEYS]
+        kinds = {name: kinds[name] for name in selected}
+        if "location" in kinds:
+            kinds.update(location_lon=FLOAT, location_lat=FLOAT)
+    buffer = ColumnBuffer(kinds)
+    schema = pa.schema([(name, _arrow_type(kind)) for name, kind in kinds.items()])
+    row_group_size = max(1, row_group_size or settings.export_row_group_size)
+    sink = _ChunkSink()
+    writer: Optional[Any] = None
+
+    def open_writer() -> Any:
+        if export_format == "parquet":
+            return pq.ParquetWriter(sink, schema, compression="zstd")
+        return pa.ipc.new_stream(sink, schema)
+
+    def write_row_group(writer: Any) -> None:
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(values, type=field.type)
+                for values, field in zip(buffer.take().values(), schema)
+            ],
+            schema=schema,
+        )
+        if export_format == "parquet":
+            writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            writer.write_batch(batch)
+
+    pages = service.iter_pages(
+        type=service.entity_type,
+        pick=",".join(buffer.attributes),
+        format="simplified",
+        **query,
+    )
+    try:
+        async for page in pages:
+            if writer is None:
+                # Opened on the first page, so broker errors surface before any bytes
+                writer = open_writer()
+            buffer.extend(page)
+            if buffer.rows >= row_group_size:
+                write_row_group(writer)
+                yield sink.drain()
+
+        if writer is None:
+            writer = open_writer()
+        if buffer.rows:
+            write_row_group(writer)
+        writer.close()
+        writer = None
+        yield sink.drain()
+    finally:
+        if writer is not None:
+            writer.close()
+        await pages.aclose()
@@ -538,6 +538,7 @@ class DeviceService(BaseService):
         limit: Optional[int] = None,
         format: Optional[str] = None,
         pick: Optional[str] = None,
+        consistency: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find Device entities near a specific location.
@@ -548,6 +549,7 @@ class DeviceService(BaseService):
             limit: Maximum number of results
             format: Response format
             pick: Attributes to select
+            consistency: 'eventual' (local spatial index) or 'strong' (broker)
 
         Returns:
             List of nearby devices
@@ -569,6 +571,7 @@ class DeviceService(BaseService):
             format=format,
             pick=pick,
             count=False,
+            consistency=consistency,
         )
         if isinstance(result, int):
             return []
@@ -0,0 +1,275 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def entity_type_from_id(entity_id: str) -> Optional[str]:
+    """
+    Extract the entity type from an NGSI-LD URN.
+
+    Example:
+        entity_type_from_id("urn:ngsi-ld:Building:001")  # -> "Building"
+    """
+    parts = entity_id.split(":")
+    if len(parts) >= 4 and parts[0] == "urn" and parts[1] == "ngsi-ld":
+        return parts[2]
+    return None
+
+
+def make_cache_key(kind: str, *parts: Any, params: Optional[Dict] = None) -> Tuple:
+    """Build a hashable cache key from a request kind, path parts and query params."""
+    normalized = tuple(
+        sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)
+    )
+    return (kind, *parts, normalized)
+
+
+class EntityCache:
+    """
+    In-process read-through cache for Orion-LD entity reads.
+
+    Entries expire after a per-entity-type TTL and the least recently used
+    entry is evicted once `max_entries` is reached. Entries are indexed by
+    entity ID (single-entity reads) and by entity type (query results), so a
+    write to one entity drops its own entries plus every cached query over
+    its type.
+
+    The cache is shared by all service singletons (see `entity_cache` below)
+    and can be invalidated from NGSI-LD notifications via handle_notification().
+
+    A read that was already in flight when a write invalidated its type
+    must not store the pre-write result afterwards: take a generation()
+    token before fetching and pass it to set(), which then skips the store
+    if an invalidation happened in between.
+
+    Usage:
+        key = make_cache_key("entity", entity_id, params=params)
+        cached = entity_cache.get(key)
+        if cached is None:
+            generation = entity_cache.generation("Building")
+            cached = await fetch()
+            entity_cache.set(key, cached, "Building", entity_id, generation)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        default_ttl: float = 0.0,
+        ttls: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.enabled = enabled
+
+        # key -> (expires_at, value, entity_type, entity_id)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Optional[str], Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._keys_by_entity: Dict[str, Set[Hashable]] = {}
+        self._query_keys_by_type: Dict[Optional[str], Set[Hashable]] = {}
+        # Bumped by invalidations; see generation()
+        self._generation = 0
+        self._type_generations: Dict[Optional[str], int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, entity_type: Optional[str]) -> float:
+        """TTL in seconds for an entity type (0 means not cached)."""
+        if not self.enabled:
+            return 0.0
+        if entity_type is None:
+            return self.default_ttl
+        return self.ttls.get(entity_type, self.default_ttl)
+
+    def generation(self, entity_type: Optional[str]) -> Tuple:
+        """
+        Token that changes whenever entries of `entity_type` are invalidated.
+
+        Pass it to set() for a value fetched after taking the token.
+        """
+        return (
+            entity_type,
+            self._generation,
+            self._type_generations.get(entity_type, 0),
+        )
+
+    def _bump(self, entity_type: Optional[str]) -> None:
+        self._type_generations[entity_type] = (
+            self._type_generations.get(entity_type, 0) + 1
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return a copy of the cached value, or None on miss/expiry.
+
+        Callers routinely mutate returned entities (e.g. setting 'type'), so
+        the stored value is never handed out directly.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _, _ = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        entity_type: Optional[str],
+        entity_id: Optional[str] = None,
+        generation: Optional[Tuple] = None,
+    ) -> None:
+        """
+        Store a value if its entity type has a positive TTL.
+
+        Args:
+            key: Key built with make_cache_key()
+            value: Parsed broker response (entity, entity list or count)
+            entity_type: Entity type used for the TTL and type invalidation
+            entity_id: Entity ID for single-entity reads, None for queries
+            generation: generation() taken before the value was fetched; the
+                value is dropped if the type was invalidated since
+        """
+        ttl = self.ttl_for(entity_type)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation(generation[0]):
+            return
+
+        if key in self._entries:
+            self._drop(key)
+
+        self._entries[key] = (
+            time.monotonic() + ttl,
+            copy.deepcopy(value),
+            entity_type,
+            entity_id,
+        )
+        if entity_id is not None:
+            self._keys_by_entity.setdefault(entity_id, set()).add(key)
+        else:
+            self._query_keys_by_type.setdefault(entity_type, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate_entity(
+        self, entity_id: str, entity_type: Optional[str] = None
+    ) -> None:
+        """
+        Drop every entry that may contain an entity.
+
+        Removes the single-entity reads of `entity_id` and all cached queries
+        over its type. When the type cannot be determined, all cached queries
+        are dropped.
+        """
+        for key in list(self._keys_by_entity.get(entity_id, ())):
+            self._drop(key)
+
+        entity_type = entity_type or entity_type_from_id(entity_id)
+        if entity_type is None:
+            self._generation += 1
+            for keys in list(self._query_keys_by_type.values()):
+                for key in list(keys):
+                    self._drop(key)
+        else:
+            self.invalidate_type(entity_type)
+
+    def invalidate_type(self, entity_type: str) -> None:
+        """Drop all cached queries over an entity type."""
+        self._bump(entity_type)
+        self._bump(None)
+        for key in list(self._query_keys_by_type.get(entity_type, ())):
+            self._drop(key)
+        # Queries without a type filter may contain any entity
+        for key in list(self._query_keys_by_type.get(None, ())):
+            self._drop(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._generation += 1
+        self._entries.clear()
+        self._keys_by_entity.clear()
+        self._query_keys_by_type.clear()
+
+    def handle_notification(self, notification: Dict[str, Any]) -> int:
+        """
+        Invalidate the entities contained in an NGSI-LD notification.
+
+        Args:
+            notification: Notification body ({"subscriptionId": ..., "data": [...]})
+
+        Returns:
+            Number of entities invalidated
+        """
+        entities = notification.get("data", [])
+        for entity in entities:
+            entity_id = entity.get("id")
+            if entity_id:
+                self.invalidate_entity(entity_id, entity.get("type"))
+        logger.debug(f"Cache invalidated {len(entities)} entities from notification")
+        return len(entities)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring."""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, _, entity_type, entity_id = entry
+        if entity_id is not None:
+            keys = self._keys_by_entity.get(entity_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_entity[entity_id]
+        else:
+            keys = self._query_keys_by_type.get(entity_type)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._query_keys_by_type[entity_type]
+
+
+# Shared by all service singletons so invalidation reaches every reader
+entity_cache = EntityCache(
+    max_entries=settings.entity_cache_max_entries,
+    default_ttl=settings.entity_cache_default_ttl,
+    ttls=settings.entity_cache_ttls,
+    enabled=settings.entity_cache_enabled,
+)
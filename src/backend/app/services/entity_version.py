@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import hashlib
+import logging
+from email.utils import format_datetime
+from typing import Optional
+
+from .serialization import JsonSerializer, json_serializer
+from .temporal import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class EntityVersion:
+    """
+    An entity representation and its HTTP validators.
+
+    `etag` is a strong validator hashed from the broker's bytes, so two
+    representations of one entity (e.g. different pick or format) never
+    share it. `last_modified` is the entity's `modifiedAt` as an HTTP date
+    when the broker sent it (options=sysAttrs), else None.
+
+    Usage:
+        version = entity_version(await service.get_entity_raw(entity_id))
+        if version.etag == request.headers.get("If-None-Match"):
+            ...  # 304 Not Modified
+    """
+
+    __slots__ = ("content", "etag", "last_modified")
+
+    def __init__(self, content: bytes, etag: str, last_modified: Optional[str] = None):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def __repr__(self) -> str:
+        return f"EntityVersion(etag={self.etag}, last_modified={self.last_modified!r})"
+
+
+def content_etag(content: bytes) -> str:
+    """Quoted strong ETag of a response body."""
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def _last_modified(content: bytes, serializer: JsonSerializer) -> Optional[str]:
+    # Skip the decode for bodies without system attributes
+    if b'"modifiedAt"' not in content:
+        return None
+    try:
+        modified_at = serializer.loads(content).get("modifiedAt")
+        if not isinstance(modified_at, str):
+            return None
+        return format_datetime(parse_timestamp(modified_at), usegmt=True)
+    except (ValueError, AttributeError) as e:
+        logger.debug(f"Ignoring unparsable modifiedAt: {e}")
+        return None
+
+
+def entity_version(
+    content: bytes, serializer: JsonSerializer = json_serializer
+) -> EntityVersion:
+    """Compute the validators of an entity body as sent by Orion-LD."""
+    return EntityVersion(
+        content, content_etag(content), _last_modified(content, serializer)
+    )
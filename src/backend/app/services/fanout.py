@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+from .base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"  # Orion-LD answered with an error status
+UNAVAILABLE = "unavailable"  # Connection error or open circuit
+INVALID = "invalid"  # Rejected before sending (e.g. query too broad)
+
+
+class QueryPart:
+    """
+    One typed query of a composite request.
+
+    Args:
+        name: Key of the part in the combined result
+        service: Service whose entity type is queried
+        query: query_entities() parameters (type defaults to the service's)
+        timeout: Deadline in seconds (default: the fan-out's)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        service: BaseService,
+        query: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.service = service
+        self.query = {k: v for k, v in (query or {}).items() if v is not None}
+        self.query.setdefault("type", service.entity_type)
+        self.timeout = timeout
+
+
+async def _query(part: QueryPart, semaphore: asyncio.Semaphore) -> Any:
+    async with semaphore:
+        return await part.service.query_entities(**part.query)
+
+
+async def _run_part(
+    part: QueryPart, semaphore: asyncio.Semaphore, timeout: float
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result: Dict[str, Any] = {}
+    try:
+        # The deadline covers waiting for a concurrency slot as well
+        result["data"] = await asyncio.wait_for(
+            _query(part, semaphore), timeout=part.timeout or timeout
+        )
+        result["status"] = OK
+    except asyncio.TimeoutError:
+        result["status"] = TIMEOUT
+        result["error"] = f"No response within {part.timeout or timeout}s"
+    except httpx.HTTPStatusError as e:
+        result["status"] = ERROR
+        result["status_code"] = e.response.status_code
+        result["error"] = e.response.text
+    except httpx.RequestError as e:
+        result["status"] = UNAVAILABLE
+        result["error"] = str(e)
+    except ValueError as e:
+        result["status"] = INVALID
+        result["error"] = str(e)
+    except Exception as e:
+        # An unexpected bug in one part must not fail the whole response
+        logger.exception(f"Query part '{part.name}' failed")
+        result["status"] = ERROR
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if result["status"] != OK:
+        logger.warning(
+            f"Query part '{part.name}' {result['status']}: {result['error']}"
+        )
+    return result
+
+
+async def fan_out(
+    parts: List[QueryPart],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run several typed queries concurrently and collect partial results.
+
+    At most `max_concurrency` queries are in flight; each one has its own
+    deadline, so a slow or failing part is reported instead of delaying or
+    failing the others. The overall latency is that of the slowest part.
+
+    Args:
+        parts: Queries to run (unique names)
+        max_concurrency: Parts in flight at the same time
+                         (default: settings.fanout_max_concurrency)
+        timeout: Default per-part deadline in seconds
+                 (default: settings.fanout_timeout)
+
+    Returns:
+        {"complete": bool, "elapsed_ms": ..., "parts": {name: {"status",
+        "data" | "error", "elapsed_ms"}}}
+
+    Example:
+        result = await fan_out([
+            QueryPart("air", air_quality_service, {"pick": "id,pm25"}),
+            QueryPart("devices", device_service, {"limit": 50}, timeout=1.0),
+        ])
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.fanout_max_concurrency)
+    timeout = timeout or settings.fanout_timeout
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run_part(part, semaphore, timeout) for part in parts)
+    )
+    return {
+        "complete": all(r["status"] == OK for r in results),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "parts": {part.name: result for part, result in zip(parts, results)},
+    }
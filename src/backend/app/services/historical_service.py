@@ -0,0 +1,554 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+from .base_service import BaseService
+from .temporal import format_timestamp, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Attributes that are not time series
+_ENTITY_KEYS = {"id", "type", "@context"}
+
+GEOJSON_TYPES = {
+    "Point",
+    "MultiPoint",
+    "LineString",
+    "MultiLineString",
+    "Polygon",
+    "MultiPolygon",
+}
+
+# aggrPeriod -> number of leading datetime fields kept when bucketing
+_AGGR_PERIODS = {"year": 1, "month": 2, "day": 3, "hour": 4, "minute": 5, "second": 6}
+
+
+def _aggregate(values: List[Any], method: str) -> Optional[float]:
+    numbers = [v for v in values if isinstance(v, (int, float))]
+    if method == "count":
+        return len(values)
+    if not numbers:
+        return None
+    if method == "sum":
+        return sum(numbers)
+    if method == "avg":
+        return sum(numbers) / len(numbers)
+    if method == "min":
+        return min(numbers)
+    if method == "max":
+        return max(numbers)
+    raise ValueError(f"Unsupported aggrMethod: {method}")
+
+
+def _bucket(timestamp: str, period: str) -> str:
+    at = parse_timestamp(timestamp)
+    kept = _AGGR_PERIODS[period]
+    # Dropped fields restart: month/day at 1, time at 0
+    year, month, day, hour, minute, second = (
+        list(at.timetuple()[:kept]) + [1, 1, 0, 0, 0][kept - 1 :]
+    )
+    return format_timestamp(
+        datetime(year, month, day, hour, minute, second, tzinfo=at.tzinfo)
+    )
+
+
+def pick_to_attrs(pick: Optional[str]) -> Optional[str]:
+    """Translate an NGSI-LD `pick` list into QuantumLeap `attrs` (no id/type)."""
+    if not pick:
+        return None
+    attrs = [a for a in pick.split(",") if a and a not in ("id", "type", "observedAt")]
+    return ",".join(attrs) or None
+
+
+def _timestamp_value(record: Dict[str, Any], name: str) -> Optional[str]:
+    # Plain value, {"type": "Property", "value": ...} or {"@type": "DateTime", ...}
+    value = record.get(name)
+    if isinstance(value, dict) and "value" in value:
+        value = value["value"]
+    if isinstance(value, dict):
+        value = value.get("@value")
+    return value if isinstance(value, str) else None
+
+
+def _matches(record: Dict[str, Any], conditions: List[Tuple[str, str, str]]) -> bool:
+    for name, op, bound in conditions:
+        value = _timestamp_value(record, name)
+        if value is None:
+            return False
+        try:
+            value_at, bound_at = parse_timestamp(value), parse_timestamp(bound)
+        except ValueError:
+            return False
+        if not {
+            ">": value_at > bound_at,
+            ">=": value_at >= bound_at,
+            "<": value_at < bound_at,
+            "<=": value_at <= bound_at,
+        }[op]:
+            return False
+    return True
+
+
+def _as_attribute(value: Any) -> Dict[str, Any]:
+    # QuantumLeap keeps values only; restore the NGSI-LD attribute type
+    if (
+        isinstance(value, dict)
+        and value.get("type") in GEOJSON_TYPES
+        and "coordinates" in value
+    ):
+        return {"type": "GeoProperty", "value": value}
+    if isinstance(value, str) and value.startswith("urn:"):
+        return {"type": "Relationship", "object": value}
+    return {"type": "Property", "value": value}
+
+
+def _as_entity(record: Dict[str, Any], key_values: bool) -> Dict[str, Any]:
+    # A history record in the shape the broker returns the entity in
+    entity = {"id": record["id"], "type": record["type"]}
+    for name, value in record.items():
+        if name not in ("id", "type", "observedAt"):
+            entity[name] = value if key_values else _as_attribute(value)
+    return entity
+
+
+class InMemoryQuantumLeap:
+    """
+    Local stand-in for QuantumLeap's time-series API.
+
+    Stores entity versions fed through ingest() (e.g. from NGSI-LD
+    notifications) and answers query_type() with QuantumLeap's response
+    shapes, including aggrMethod/aggrPeriod. Used by tests and for running
+    the backend without CrateDB (settings.history_backend = "memory").
+
+    Usage:
+        store = InMemoryQuantumLeap()
+        store.ingest(notification["data"])
+        service = QuantumLeapService(store=store)
+    """
+
+    def __init__(self):
+        # entity_type -> entity_id -> [(timestamp, {attr: value})]
+        self._series: Dict[str, Dict[str, List]] = {}
+
+    def ingest(
+        self, entities: List[Dict[str, Any]], time_attribute: str = "observedAt"
+    ) -> int:
+        """
+        Record one version of each entity (normalized or keyValues).
+
+        The version timestamp is the entity's `time_attribute`, else
+        `modifiedAt`, else the first attribute's `observedAt`, else now.
+
+        Returns:
+            Number of entity versions stored
+        """
+        for entity in entities:
+            values = {}
+            timestamp = entity.get(time_attribute) or entity.get("modifiedAt")
+            for name, attribute in entity.items():
+                if name in _ENTITY_KEYS:
+                    continue
+                if isinstance(attribute, dict) and "value" in attribute:
+                    timestamp = timestamp or attribute.get("observedAt")
+                    values[name] = attribute["value"]
+                elif isinstance(attribute, dict) and "object" in attribute:
+                    values[name] = attribute["object"]
+                else:
+                    values[name] = attribute
+            # Normalized Property and/or {"@type": "DateTime", "@value": ...}
+            if isinstance(timestamp, dict) and "value" in timestamp:
+                timestamp = timestamp["value"]
+            if isinstance(timestamp, dict):
+                timestamp = timestamp.get("@value")
+            if not timestamp:
+                timestamp = format_timestamp(datetime.now().astimezone())
+
+            series = self._series.setdefault(entity["type"], {})
+            series.setdefault(entity["id"], []).append((timestamp, values))
+            series[entity["id"]].sort(key=lambda item: parse_timestamp(item[0]))
+        return len(entities)
+
+    async def query_type(
+        self, entity_type: str, attr: Optional[str] = None, **params
+    ) -> Dict[str, Any]:
+        """Same contract as QuantumLeapService.query_type()."""
+        attrs = params.get("attrs")
+        wanted = set(attrs.split(",")) if attrs else None
+        from_date = params.get("fromDate")
+        to_date = params.get("toDate")
+        last_n = params.get("lastN")
+
+        entities = []
+        for entity_id, versions in self._series.get(entity_type, {}).items():
+            if params.get("id") and entity_id not in params["id"].split(","):
+                continue
+            rows = [
+                (t, v)
+                for t, v in versions
+                if (not from_date or parse_timestamp(t) >= parse_timestamp(from_date))
+                and (not to_date or parse_timestamp(t) <= parse_timestamp(to_date))
+            ]
+            if last_n:
+                rows = rows[-int(last_n) :]
+            offset = int(params.get("offset") or 0)
+            limit = params.get("limit")
+            rows = rows[offset : offset + int(limit) if limit else None]
+            if not rows:
+                continue
+
+            names = [attr] if attr else sorted({n for _, v in rows for n in v})
+            if wanted is not None:
+                names = [n for n in names if n in wanted]
+            index = [t for t, _ in rows]
+            attributes = [
+                {"attrName": n, "values": [v.get(n) for _, v in rows]} for n in names
+            ]
+
+            method = params.get("aggrMethod")
+            if method:
+                period = params.get("aggrPeriod")
+                buckets: "OrderedDict[str, List[int]]" = OrderedDict()
+                for i, t in enumerate(index):
+                    key = _bucket(t, period) if period else index[0]
+                    buckets.setdefault(key, []).append(i)
+                index = list(buckets)
+                for attribute in attributes:
+                    values = attribute["values"]
+                    attribute["values"] = [
+                        _aggregate([values[i] for i in rows_in_bucket], method)
+                        for rows_in_bucket in buckets.values()
+                    ]
+
+            entities.append(
+                {"entityId": entity_id, "index": index, "attributes": attributes}
+            )
+
+        return {"entityType": entity_type, "entities": entities}
+
+
+class QuantumLeapService(BaseService):
+    """
+    Historical queries against QuantumLeap (time series stored in CrateDB).
+
+    Orion-LD keeps only the current state; QuantumLeap receives every change
+    through a subscription (see SubscriptionService.subscribe_history) and
+    answers time-range and aggregation queries, so history scans do not load
+    the broker. Requests reuse BaseService's transport (shared pool, retries,
+    circuit breaker, fast JSON).
+
+    Usage:
+        records = await historical_service.get_history(
+            "WaterQualityObserved", from_date="2025-11-15T00:00:00Z", limit=50
+        )
+        hourly = await historical_service.aggregate(
+            "AirQualityObserved", "pm25", "avg", aggr_period="hour"
+        )
+    """
+
+    def __init__(
+        self,
+        quantumleap_url: Optional[str] = None,
+        store: Optional[InMemoryQuantumLeap] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize QuantumLeapService.
+
+        Args:
+            quantumleap_url: QuantumLeap base URL (default: settings.quantumleap_url)
+            store: Local stand-in answering queries instead of QuantumLeap
+            client: HTTP client (default: the app-wide pool)
+        """
+        base_url = (quantumleap_url or settings.quantumleap_url).rstrip("/")
+        super().__init__(orion_url=f"{base_url}/v2", client=client)
+        self.store = store
+
+        self.headers: Dict[str, str] = {}
+        if settings.quantumleap_fiware_service:
+            self.headers["Fiware-Service"] = settings.quantumleap_fiware_service
+        if settings.quantumleap_fiware_service_path:
+            self.headers[
+                "Fiware-ServicePath"
+            ] = settings.quantumleap_fiware_service_path
+
+    async def query_type(
+        self, entity_type: str, attr: Optional[str] = None, **params
+    ) -> Dict[str, Any]:
+        """
+        Query the time series of an entity type. (GET /v2/types/{type}[/attrs/{attr}])
+
+        Args:
+            entity_type: Entity type
+            attr: Single attribute to query (default: all attributes)
+            **params: QuantumLeap parameters (fromDate, toDate, lastN, limit,
+                      offset, attrs, id, aggrMethod, aggrPeriod)
+
+        Returns:
+            {"entityType": ..., "entities": [{"entityId", "index", "attributes"}]};
+            for a single attribute the entities carry "values" instead of
+            "attributes" as in QuantumLeap. No data (404) returns no entities.
+        """
+        params = {k: v for k, v in params.items() if v is not None}
+        if self.store is not None:
+            result = await self.store.query_type(entity_type, attr, **params)
+        else:
+            endpoint = f"types/{entity_type}"
+            if attr:
+                endpoint += f"/attrs/{attr}"
+            try:
+                response = await self._make_request(
+                    "GET", endpoint, headers=self.headers, params=params
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return {"entityType": entity_type, "entities": []}
+                raise
+            result = self._json(response)
+
+        if attr:
+            for entity in result.get("entities", []):
+                if "attributes" in entity:
+                    entity["values"] = entity.pop("attributes")[0]["values"]
+        return result
+
+    async def get_history(
+        self,
+        entity_type: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        attrs: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        last_n: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        key_values: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get entity versions recorded in a time range, oldest first.
+
+        Args:
+            entity_type: Entity type
+            from_date: Start time in ISO8601 format (inclusive)
+            to_date: End time in ISO8601 format (inclusive)
+            attrs: Attributes to include (comma-separated, default: all)
+            entity_id: Restrict to these entity IDs (comma-separated)
+            last_n: Only the last N versions per entity
+            limit: Maximum number of versions (QuantumLeap limit)
+            offset: Versions to skip (QuantumLeap offset)
+            key_values: Plain values (True) or NGSI-LD Property objects (False)
+
+        Returns:
+            One record per entity version: {"id", "type", "observedAt", attrs...}
+
+        Example:
+            recent = await historical_service.get_history(
+                "CarbonFootprint", from_date="2025-11-15T00:00:00Z", attrs="CO2eq"
+            )
+        """
+        result = await self.query_type(
+            entity_type,
+            fromDate=from_date,
+            toDate=to_date,
+            attrs=attrs,
+            id=entity_id,
+            lastN=last_n,
+            limit=limit,
+            offset=offset,
+        )
+
+        records = []
+        for entity in result.get("entities", []):
+            attributes = entity.get("attributes", [])
+            for i, timestamp in enumerate(entity.get("index", [])):
+                record: Dict[str, Any] = {
+                    "id": entity.get("entityId"),
+                    "type": entity_type,
+                    "observedAt": timestamp,
+                }
+                for attribute in attributes:
+                    value = attribute["values"][i]
+                    record[attribute["attrName"]] = (
+                        value if key_values else {"type": "Property", "value": value}
+                    )
+                records.append(record)
+
+        records.sort(key=lambda r: parse_timestamp(r["observedAt"]))
+        return records
+
+    async def get_current(
+        self,
+        entity_type: str,
+        conditions: List[Tuple[str, str, str]],
+        attrs: Optional[str] = None,
+        limit: Optional[int] = None,
+        key_values: bool = True,
+        expected_entities: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Latest recorded version of each entity, filtered on its own timestamps.
+
+        Answers what a broker query such as q=dateObserved>'...' answers on
+        the current state: one entity per ID, filtered on the domain
+        timestamp rather than on QuantumLeap's time index. Only versions
+        recorded since the earliest lower bound are fetched, since an entity
+        is recorded no earlier than it is observed, and at most
+        settings.history_max_records of them.
+
+        Args:
+            entity_type: Entity type
+            conditions: (attribute, operator, ISO8601 timestamp) triples, with
+                operator one of >, >=, <, <=
+            attrs: Attributes to include (comma-separated, default: all)
+            limit: Maximum number of entities
+            key_values: Plain values (True) or NGSI-LD attributes (False)
+            expected_entities: Entities of the type in the broker; fewer
+                recorded ones mean the history is incomplete
+
+        Returns:
+            Entities shaped as the broker returns them, oldest first; None
+            when history cannot answer: no lower time bound (the whole
+            history would be scanned), too many versions in range (the
+            latest ones may be cut off) or fewer entities than expected
+
+        Example:
+            recent = await historical_service.get_current(
+                "WaterQualityObserved", [("dateObserved", ">", since)]
+            )
+        """
+        lower_bounds = [bound for _, op, bound in conditions if op in (">", ">=")]
+        if not lower_bounds:
+            return None
+        wanted = attrs.split(",") if attrs else None
+        if wanted is not None:
+            attrs = ",".join(dict.fromkeys(wanted + [c[0] for c in conditions]))
+
+        max_records = settings.history_max_records
+        versions = await self.get_history(
+            entity_type,
+            from_date=min(lower_bounds, key=parse_timestamp),
+            attrs=attrs,
+            limit=max_records,
+        )
+        if len(versions) >= max_records:
+            logger.info(f"More than {max_records} {entity_type} versions in range")
+            return None
+
+        latest: Dict[str, Dict[str, Any]] = {}
+        for record in versions:
+            latest[record["id"]] = record  # Oldest first: the last one wins
+        if expected_entities is not None and len(latest) < expected_entities:
+            logger.info(
+                f"History holds {len(latest)} of {expected_entities} {entity_type}"
+            )
+            return None
+
+        records = [r for r in latest.values() if _matches(r, conditions)]
+        records.sort(key=lambda r: parse_timestamp(r["observedAt"]))
+        if wanted is not None:
+            for record in records:
+                for name, _, _ in conditions:
+                    if name not in wanted:
+                        record.pop(name, None)
+        return [_as_entity(r, key_values) for r in records[:limit]]
+
+    async def current_state(
+        self,
+        service: BaseService,
+        conditions: List[Tuple[str, str, str]],
+        pick: Optional[str] = None,
+        format: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a current-state query of a broker service from history.
+
+        Args:
+            service: Service of the queried type, asked for the entity count
+            conditions: As for get_current()
+            pick: NGSI-LD pick of the broker query
+            format: Broker format ('simplified' for plain values)
+            limit: Maximum number of entities
+
+        Returns:
+            As get_current(); None also when QuantumLeap is unreachable and
+            settings.history_fallback_to_broker allows asking the broker
+        """
+        if service.entity_type is None or not any(
+            op in (">", ">=") for _, op, _ in conditions
+        ):
+            return None
+        expected = await service.query_entities(
+            type=service.entity_type, count=True, limit=0
+        )
+        try:
+            return await self.get_current(
+                service.entity_type,
+                conditions,
+                attrs=pick_to_attrs(pick),
+                limit=limit,
+                key_values=format == "simplified",
+                expected_entities=expected if isinstance(expected, int) else None,
+            )
+        except httpx.HTTPError as e:
+            if not settings.history_fallback_to_broker:
+                raise
+            logger.warning(f"QuantumLeap unavailable, scanning Orion-LD: {e}")
+            return None
+
+    async def aggregate(
+        self,
+        entity_type: str,
+        attr: str,
+        aggr_method: str,
+        aggr_period: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        entity_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate an attribute's time series in QuantumLeap (CrateDB side).
+
+        Args:
+            entity_type: Entity type
+            attr: Numeric attribute to aggregate
+            aggr_method: count, sum, avg, min or max
+            aggr_period: Bucket size (year, month, day, hour, minute, second);
+                         None aggregates the whole range
+            from_date: Start time in ISO8601 format
+            to_date: End time in ISO8601 format
+            entity_id: Restrict to these entity IDs (comma-separated)
+
+        Returns:
+            Per entity: {"entityId", "index": [bucket start...], "values": [...]}
+        """
+        result = await self.query_type(
+            entity_type,
+            attr,
+            aggrMethod=aggr_method,
+            aggrPeriod=aggr_period,
+            fromDate=from_date,
+            toDate=to_date,
+            id=entity_id,
+        )
+        return result.get("entities", [])
+
+
+def _create_historical_service() -> QuantumLeapService:
+    if settings.history_backend == "memory":
+        logger.info("Historical queries use the in-memory QuantumLeap stand-in")
+        return QuantumLeapService(store=InMemoryQuantumLeap())
+    return QuantumLeapService()
+
+
+# Singleton instance
+historical_service = _create_historical_service()
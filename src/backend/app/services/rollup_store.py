@@ -0,0 +1,358 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from app.core.config import settings
+
+from .temporal import format_timestamp, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# KPI -> attributes it is read from, per entity type
+METRICS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "queueLength": {"TrafficFlowObserved": ("queues", "queueLength")},
+    "avgSpeed": {
+        "TrafficFlowObserved": ("avgSpeed", "averageVehicleSpeed"),
+        "TrafficEnvironmentImpact": ("averageSpeed",),
+    },
+    "co2": {"TrafficEnvironmentImpact": ("co2",)},
+    "nox": {"TrafficEnvironmentImpact": ("nox",)},
+}
+METRIC_NAMES = list(METRICS)
+
+# Relationships naming the intersection an observation belongs to
+_INTERSECTION_REFS = ("refTrafficLight", "refRoadSegment")
+
+_ROW_DTYPE = np.dtype(
+    [
+        ("start", "i8"),  # Bucket start (epoch seconds), -1 = empty slot
+        ("count", "f8", (len(METRICS),)),
+        ("sum", "f8", (len(METRICS),)),
+        ("min", "f8", (len(METRICS),)),
+        ("max", "f8", (len(METRICS),)),
+    ]
+)
+
+
+def _value(attribute: Any) -> Any:
+    if isinstance(attribute, dict):
+        if "value" in attribute:
+            return _value(attribute["value"])
+        if "object" in attribute:
+            return attribute["object"]
+        if "@value" in attribute:
+            return attribute["@value"]
+    return attribute
+
+
+def _metric_value(entity: Dict[str, Any], names: tuple) -> float:
+    for name in names:
+        value = _value(entity.get(name))
+        if isinstance(value, list):
+            # Queue lengths per lane: the intersection's queue is their sum
+            numbers = [v for v in value if isinstance(v, (int, float))]
+            if numbers:
+                return float(sum(numbers))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return np.nan
+
+
+def _observed_at(entity: Dict[str, Any]) -> float:
+    for name in ("dateObservedTo", "dateObservedFrom", "dateObserved", "modifiedAt"):
+        value = _value(entity.get(name))
+        if isinstance(value, str):
+            try:
+                return parse_timestamp(value).timestamp()
+            except ValueError:
+                continue
+    for attribute in entity.values():
+        if isinstance(attribute, dict) and isinstance(attribute.get("observedAt"), str):
+            return parse_timestamp(attribute["observedAt"]).timestamp()
+    return time.time()
+
+
+def _utc(epoch_seconds: int) -> datetime:
+    return datetime.fromtimestamp(int(epoch_seconds), tz=timezone.utc)
+
+
+class RollupStore:
+    """
+    Incrementally maintained per-intersection traffic KPIs in fixed time buckets.
+
+    Each intersection owns a ring of `num_buckets` rows (one per bucket of
+    `bucket_seconds`) holding count/sum/min/max for every KPI in METRICS.
+    Notified TrafficFlowObserved/TrafficEnvironmentImpact entities are folded
+    into their bucket as they arrive, so reads never touch raw entities and
+    cost O(buckets). With a directory the rings are NumPy arrays memory-mapped
+    to `<directory>/<bucket_seconds>s/<intersection>.npy` and survive
+    restarts; without one they live in memory.
+
+    Usage:
+        store = RollupStore("data/rollups", bucket_seconds=300)
+        store.ingest(notification["data"])
+        store.series("Nga4ThuDuc", start_time="2025-11-17T00:00:00Z")
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        bucket_seconds: int = 300,
+        num_buckets: int = 2016,
+    ):
+        self.directory = (
+            os.path.join(directory, f"{bucket_seconds}s") if directory else None
+        )
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+
+        self._rings: Dict[str, np.ndarray] = {}
+        # TrafficFlowObserved ID -> intersection, to place impacts that only
+        # reference their flow observation
+        self._flow_intersections: Dict[str, str] = {}
+        self._loaded = False
+
+        self.ingested = 0
+        self.dropped = 0  # Observations older than the oldest kept bucket
+
+    def _load(self) -> None:
+        """Open the rings persisted by a previous run."""
+        self._loaded = True
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".npy"):
+                continue
+            try:
+                ring = np.load(os.path.join(self.directory, filename), mmap_mode="r+")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable rollup file {filename}: {e}")
+                continue
+            if ring.dtype != _ROW_DTYPE or ring.shape != (self.num_buckets,):
+                logger.warning(f"Skipping rollup file {filename} with another layout")
+                continue
+            self._rings[unquote(filename[: -len(".npy")])] = ring
+
+    def _ring(self, intersection: str) -> Optional[np.ndarray]:
+        if not self._loaded:
+            self._load()
+        return self._rings.get(intersection)
+
+    def _new_ring(self, intersection: str) -> np.ndarray:
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            ring = np.lib.format.open_memmap(
+                os.path.join(self.directory, f"{quote(intersection, safe='')}.npy"),
+                mode="w+",
+                dtype=_ROW_DTYPE,
+                shape=(self.num_buckets,),
+            )
+        else:
+            ring = np.zeros(self.num_buckets, dtype=_ROW_DTYPE)
+        ring["start"] = -1
+        self._rings[intersection] = ring
+        return ring
+
+    def intersection_of(self, entity: Dict[str, Any]) -> str:
+        """
+        Intersection key of an observation.
+
+        The referenced traffic light or road segment, else (for impacts) the
+        intersection of the referenced flow observation, else the last
+        segment of the entity ID (urn:ngsi-ld:TrafficFlowObserved:<key>).
+        """
+        for name in _INTERSECTION_REFS:
+            ref = _value(entity.get(name))
+            if isinstance(ref, str) and ref:
+                return ref.rsplit(":", 1)[-1]
+        traffic = _value(entity.get("traffic")) or []
+        for item in traffic if isinstance(traffic, list) else [traffic]:
+            flow_id = _value(item)
+            if isinstance(flow_id, dict):
+                flow_id = flow_id.get("refTrafficFlowObserved")
+            if flow_id in self._flow_intersections:
+                return self._flow_intersections[flow_id]
+        return str(entity.get("id", "")).rsplit(":", 1)[-1]
+
+    def ingest(self, entities: List[Dict[str, Any]]) -> int:
+        """
+        Fold notified entities (normalized or keyValues) into their buckets.
+
+        Returns:
+            Number of observations recorded
+        """
+        recorded = 0
+        for entity in entities:
+            entity_type = str(entity.get("type"))
+            values = np.array(
+                [
+                    _metric_value(entity, METRICS[m].get(entity_type, ()))
+                    for m in METRIC_NAMES
+                ]
+            )
+            present = ~np.isnan(values)
+            if not present.any():
+                continue
+
+            intersection = self.intersection_of(entity)
+            if entity_type == "TrafficFlowObserved" and entity.get("id"):
+                self._flow_intersections[entity["id"]] = intersection
+
+            bucket = int(_observed_at(entity) // self.bucket_seconds)
+            start = bucket * self.bucket_seconds
+            ring = self._ring(intersection)
+            if ring is None:
+                ring = self._new_ring(intersection)
+            row = ring[bucket % self.num_buckets]
+            if row["start"] > start:
+                self.dropped += 1
+                continue
+            if row["start"] != start:
+                row["start"] = start
+                row["count"] = 0
+                row["sum"] = 0
+                row["min"] = np.inf
+                row["max"] = -np.inf
+
+            row["count"][present] += 1
+            row["sum"][present] += values[present]
+            row["min"][present] = np.minimum(row["min"][present], values[present])
+            row["max"][present] = np.maximum(row["max"][present], values[present])
+            recorded += 1
+
+        self.ingested += recorded
+        return recorded
+
+    def _rows(
+        self,
+        intersection: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """Filled buckets of an intersection within the range, oldest first."""
+        ring = self._ring(intersection)
+        if ring is None:
+            return None
+        starts = ring["start"]
+        keep = starts >= 0
+        if start_time:
+            # Buckets overlapping the range
+            keep &= (
+                starts + self.bucket_seconds > parse_timestamp(start_time).timestamp()
+            )
+        if end_time:
+            keep &= starts <= parse_timestamp(end_time).timestamp()
+        rows = ring[keep]
+        return rows[np.argsort(rows["start"])]
+
+    @staticmethod
+    def _stats(count, total, minimum, maximum, metrics: List[str]) -> Dict[str, Any]:
+        stats: Dict[str, Optional[Dict[str, float]]] = {}
+        for m in metrics:
+            i = METRIC_NAMES.index(m)
+            if count[i]:
+                stats[m] = {
+                    "count": int(count[i]),
+                    "mean": float(total[i] / count[i]),
+                    "min": float(minimum[i]),
+                    "max": float(maximum[i]),
+                }
+            else:
+                stats[m] = None
+        return stats
+
+    def series(
+        self,
+        intersection: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        metrics: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Per-bucket KPIs of an intersection, oldest first.
+
+        Returns:
+            [{"start": ..., "<metric>": {"count", "mean", "min", "max"} | None}],
+            or None for an unknown intersection
+        """
+        rows = self._rows(intersection, start_time, end_time)
+        if rows is None:
+            return None
+        metrics = metrics or METRIC_NAMES
+        return [
+            {
+                "start": format_timestamp(_utc(row["start"])),
+                **self._stats(
+                    row["count"], row["sum"], row["min"], row["max"], metrics
+                ),
+            }
+            for row in rows
+        ]
+
+    def summary(
+        self,
+        intersection: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        metrics: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """KPIs of an intersection combined over all buckets in the range."""
+        rows = self._rows(intersection, start_time, end_time)
+        if rows is None:
+            return None
+        metrics = metrics or METRIC_NAMES
+        if len(rows) == 0:
+            return {"buckets": 0, **{m: None for m in metrics}}
+        return {
+            "buckets": int(len(rows)),
+            "from": format_timestamp(_utc(rows["start"][0])),
+            "to": format_timestamp(_utc(rows["start"][-1] + self.bucket_seconds)),
+            **self._stats(
+                rows["count"].sum(axis=0),
+                rows["sum"].sum(axis=0),
+                rows["min"].min(axis=0),
+                rows["max"].max(axis=0),
+                metrics,
+            ),
+        }
+
+    def intersections(self) -> List[str]:
+        """Intersections with recorded KPIs."""
+        if not self._loaded:
+            self._load()
+        return sorted(self._rings)
+
+    def flush(self) -> None:
+        """Write memory-mapped rings to disk."""
+        for ring in self._rings.values():
+            if isinstance(ring, np.memmap):
+                ring.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "intersections": len(self._rings),
+            "bucket_seconds": self.bucket_seconds,
+            "num_buckets": self.num_buckets,
+            "metrics": METRIC_NAMES,
+            "persistent": self.directory is not None,
+            "ingested": self.ingested,
+            "dropped": self.dropped,
+        }
+
+
+# Singleton instance, fed by /api/v1/subscriptions/notify/rollups
+rollup_store = RollupStore(
+    directory=settings.rollup_directory,
+    bucket_seconds=settings.rollup_bucket_seconds,
+    num_buckets=settings.rollup_num_buckets,
+)
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import json
+import logging
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# orjson parses/serializes large NGSI-LD payloads several times faster
+_ORJSON_AVAILABLE = False
+try:
+    import orjson
+
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class JsonSerializer:
+    """
+    JSON codec used by BaseService for request bodies and broker responses.
+
+    The default implementation is the standard library. Subclasses override
+    dumps()/loads(); pick one with get_serializer() or settings.json_serializer.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def loads(self, data: bytes) -> Any:
+        """Parse JSON bytes."""
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """JSON codec backed by orjson (pip install orjson)."""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def get_serializer(name: Optional[str] = None) -> JsonSerializer:
+    """
+    Return a serializer by name.
+
+    Args:
+        name: 'auto' (orjson when installed), 'orjson' or 'json'
+              (default: settings.json_serializer)
+    """
+    name = name or settings.json_serializer
+    if name in ("auto", "orjson") and _ORJSON_AVAILABLE:
+        return OrjsonSerializer()
+    if name == "orjson":
+        logger.warning("orjson requested but not installed - using stdlib json")
+    return JsonSerializer()
+
+
+# Shared by all service singletons
+json_serializer = get_serializer()
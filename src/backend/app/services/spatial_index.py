@@ -0,0 +1,515 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import copy
+import json
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS = 6371008.8  # Meters
+
+# Consistency modes for geo-queries on indexed types
+EVENTUAL = "eventual"  # Answer from the local index once it is loaded
+STRONG = "strong"  # Always ask the broker
+
+Point = Tuple[float, float]  # (lon, lat)
+
+_GEOREL = re.compile(r"^(near|within|intersects)((?:;\w+==[\d.]+)*)$")
+
+
+class Shape:
+    """
+    A GeoJSON geometry reduced to points, polylines and polygons (lon, lat).
+
+    Supports Point, MultiPoint, LineString, MultiLineString, Polygon and
+    MultiPolygon.
+    """
+
+    __slots__ = ("points", "lines", "polygons", "bbox")
+
+    def __init__(self, geometry: Dict[str, Any]):
+        kind = geometry.get("type")
+        coordinates = geometry.get("coordinates")
+        if coordinates is None:
+            raise ValueError("Geometry has no coordinates")
+        self.points: List[Point] = []
+        self.lines: List[List[Point]] = []
+        self.polygons: List[List[List[Point]]] = []  # Outer ring, then holes
+
+        if kind == "Point":
+            self.points = [_point(coordinates)]
+        elif kind == "MultiPoint":
+            self.points = [_point(c) for c in coordinates]
+        elif kind == "LineString":
+            self.lines = [[_point(c) for c in coordinates]]
+        elif kind == "MultiLineString":
+            self.lines = [[_point(c) for c in line] for line in coordinates]
+        elif kind == "Polygon":
+            self.polygons = [[[_point(c) for c in ring] for ring in coordinates]]
+        elif kind == "MultiPolygon":
+            self.polygons = [
+                [[_point(c) for c in ring] for ring in polygon]
+                for polygon in coordinates
+            ]
+        else:
+            raise ValueError(f"Unsupported geometry type: {kind}")
+
+        vertices = list(self.vertices())
+        if not vertices:
+            raise ValueError("Geometry has no coordinates")
+        lons = [p[0] for p in vertices]
+        lats = [p[1] for p in vertices]
+        self.bbox = (min(lons), min(lats), max(lons), max(lats))
+
+    def vertices(self) -> Iterable[Point]:
+        yield from self.points
+        for line in self.lines:
+            yield from line
+        for polygon in self.polygons:
+            for ring in polygon:
+                yield from ring
+
+    def segments(self) -> Iterable[Tuple[Point, Point]]:
+        for line in self.lines:
+            yield from zip(line, line[1:])
+        for polygon in self.polygons:
+            for ring in polygon:
+                yield from zip(ring, ring[1:])
+
+    def covers(self, point: Point) -> bool:
+        """Whether a point lies in one of the polygons, on a line or on a point."""
+        for polygon in self.polygons:
+            if _in_ring(point, polygon[0]) and not any(
+                _in_ring(point, hole) for hole in polygon[1:]
+            ):
+                return True
+        for a, b in self.segments():
+            if _segment_distance(point, a, b, point[1]) < 1e-3:
+                return True
+        return point in self.points
+
+    def distance(self, point: Point) -> float:
+        """Distance in meters from a point to the nearest part of the shape."""
+        if self.polygons and self.covers(point):
+            return 0.0
+        best = math.inf
+        for p in self.points:
+            best = min(best, _distance(point, p))
+        for a, b in self.segments():
+            best = min(best, _segment_distance(point, a, b, point[1]))
+        return best
+
+    def intersects(self, other: "Shape") -> bool:
+        if not _bbox_overlap(self.bbox, other.bbox):
+            return False
+        if any(other.covers(p) for p in self.vertices()):
+            return True
+        if any(self.covers(p) for p in other.vertices()):
+            return True
+        other_segments = list(other.segments())
+        return any(
+            _segments_cross(a, b, c, d)
+            for a, b in self.segments()
+            for c, d in other_segments
+        )
+
+    def within(self, other: "Shape") -> bool:
+        if not all(other.covers(p) for p in self.vertices()):
+            return False
+        if not other.polygons:
+            return True
+        # All vertices inside is not enough for concave polygons and holes:
+        # no edge may leave the polygon between two vertices...
+        other_segments = list(other.segments())
+        for a, b in self.segments():
+            middle = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+            if not other.covers(middle) or any(
+                _segments_cross(a, b, c, d) for c, d in other_segments
+            ):
+                return False
+        # ...and no hole of the other polygon may lie inside this one
+        return not any(
+            self._interior_covers(p)
+            for polygon in other.polygons
+            for hole in polygon[1:]
+            for p in hole
+        )
+
+    def _interior_covers(self, point: Point) -> bool:
+        return any(
+            _in_ring(point, polygon[0])
+            and not any(_in_ring(point, hole) for hole in polygon[1:])
+            for polygon in self.polygons
+        )
+
+
+def _point(coordinates: Any) -> Point:
+    return (float(coordinates[0]), float(coordinates[1]))
+
+
+def _to_meters(point: Point, lat0: float) -> Tuple[float, float]:
+    # Equirectangular projection around lat0, in meters
+    return (
+        EARTH_RADIUS * math.radians(point[0]) * math.cos(math.radians(lat0)),
+        EARTH_RADIUS * math.radians(point[1]),
+    )
+
+
+def _distance(a: Point, b: Point) -> float:
+    """Haversine distance in meters."""
+    lat1, lat2 = math.radians(a[1]), math.radians(b[1])
+    dlat = lat2 - lat1
+    dlon = math.radians(b[0] - a[0])
+    h = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _segment_distance(p: Point, a: Point, b: Point, lat0: float) -> float:
+    px, py = _to_meters(p, lat0)
+    ax, ay = _to_meters(a, lat0)
+    bx, by = _to_meters(b, lat0)
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = (
+        0.0
+        if length == 0
+        else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+    )
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _in_ring(point: Point, ring: List[Point]) -> bool:
+    # Ray casting
+    x, y = point
+    inside = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+def _orientation(a: Point, b: Point, c: Point) -> float:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _segments_cross(a: Point, b: Point, c: Point, d: Point) -> bool:
+    d1, d2 = _orientation(c, d, a), _orientation(c, d, b)
+    d3, d4 = _orientation(a, b, c), _orientation(a, b, d)
+    return ((d1 > 0) != (d2 > 0)) and ((d3 > 0) != (d4 > 0))
+
+
+def _bbox_overlap(a: Tuple, b: Tuple) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def parse_georel(georel: str) -> Optional[Tuple[str, Dict[str, float]]]:
+    """
+    Split an NGSI-LD georel into relation and modifiers.
+
+    Returns None for relations the local index does not evaluate
+    (equals, disjoint, overlaps, contains).
+
+    Example:
+        parse_georel("near;maxDistance==2000")  # -> ("near", {"maxDistance": 2000.0})
+    """
+    match = _GEOREL.match(georel.replace(" ", ""))
+    if match is None:
+        return None
+    modifiers = {}
+    for modifier in filter(None, match.group(2).split(";")):
+        name, value = modifier.split("==")
+        modifiers[name] = float(value)
+    return match.group(1), modifiers
+
+
+def select_attributes(
+    entity: Dict[str, Any], attrs: Optional[str] = None, key_values: bool = False
+) -> Dict[str, Any]:
+    """
+    Copy of a normalized entity reduced to `attrs` (comma-separated, id and
+    type always kept), optionally in keyValues (simplified) form - what
+    Orion-LD returns for pick/attrs and format=simplified.
+    """
+    wanted = set(attrs.split(",")) if attrs else None
+    selected: Dict[str, Any] = {}
+    for name, attribute in entity.items():
+        if name in ("id", "type", "@context"):
+            selected[name] = attribute
+        elif wanted is None or name in wanted:
+            if key_values and isinstance(attribute, dict):
+                attribute = attribute.get("value", attribute.get("object", attribute))
+            selected[name] = copy.deepcopy(attribute)
+    return selected
+
+
+class SpatialIndex:
+    """
+    In-memory grid index over the geometries of one entity type.
+
+    Entities are bucketed into square cells of `cell_size` degrees by the
+    bounding box of their geo-property, so near/within/intersects queries
+    only test the entities of the cells the query touches. The index holds
+    the normalized entities: it is filled once with load() and kept in sync
+    by NGSI-LD notifications (handle_notification), which suits mostly
+    static types such as RoadSegment, Building and Device. Writes made
+    through BaseService are applied as soon as the broker accepts them, so
+    a service reads its own writes without waiting for a notification.
+
+    Usage:
+        index = get_spatial_index("RoadSegment")
+        await index.load(road_segment_service)
+        nearest = index.query("near;maxDistance==500", "Point", "[106.7,10.8]")
+    """
+
+    def __init__(
+        self, entity_type: str, cell_size: float = 0.01, geoproperty: str = "location"
+    ):
+        self.entity_type = entity_type
+        self.cell_size = cell_size
+        self.geoproperty = geoproperty
+
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        self._shapes: Dict[str, Shape] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+
+        self.ready = False  # Loaded, so queries can be answered locally
+        self.loaded_at: Optional[float] = None
+        self.notified_at: Optional[float] = None
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def _cell_range(self, bbox: Tuple) -> Iterable[Tuple[int, int]]:
+        x0, y0 = math.floor(bbox[0] / self.cell_size), math.floor(
+            bbox[1] / self.cell_size
+        )
+        x1, y1 = math.floor(bbox[2] / self.cell_size), math.floor(
+            bbox[3] / self.cell_size
+        )
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield (x, y)
+
+    def upsert(self, entity: Dict[str, Any]) -> None:
+        """
+        Add or update an entity; attributes are merged into the indexed copy.
+        """
+        entity_id = entity.get("id")
+        if not entity_id:
+            return
+        merged = {**self._entities.get(entity_id, {}), **entity}
+        self.remove(entity_id)
+
+        geometry = merged.get(self.geoproperty)
+        if isinstance(geometry, dict) and "value" in geometry:
+            geometry = geometry["value"]
+        self._entities[entity_id] = merged
+        if not isinstance(geometry, dict):
+            return
+        try:
+            shape = Shape(geometry)
+        except (ValueError, TypeError, IndexError) as e:
+            logger.warning(f"Not indexing geometry of {entity_id}: {e}")
+            return
+        self._shapes[entity_id] = shape
+        for cell in self._cell_range(shape.bbox):
+            self._cells.setdefault(cell, set()).add(entity_id)
+
+    def replace(self, entity: Dict[str, Any]) -> None:
+        """Index an entity in place of its previous version (no merge)."""
+        entity_id = entity.get("id")
+        if entity_id:
+            self.remove(entity_id)
+        self.upsert(entity)
+
+    def update(self, entity_id: str, attributes: Dict[str, Any]) -> None:
+        """Merge attributes into an indexed entity; unknown entities are ignored."""
+        if entity_id in self._entities:
+            self.upsert({**attributes, "id": entity_id})
+
+    def remove_attribute(self, entity_id: str, name: str) -> None:
+        """Drop an attribute of an indexed entity (re-indexing its geometry)."""
+        entity = self._entities.get(entity_id)
+        if entity is not None and name in entity:
+            self.replace({k: v for k, v in entity.items() if k != name})
+
+    def remove(self, entity_id: str) -> None:
+        """Drop an entity from the index."""
+        self._entities.pop(entity_id, None)
+        shape = self._shapes.pop(entity_id, None)
+        if shape is None:
+            return
+        for cell in self._cell_range(shape.bbox):
+            ids = self._cells.get(cell)
+            if ids is not None:
+                ids.discard(entity_id)
+                if not ids:
+                    del self._cells[cell]
+
+    def clear(self) -> None:
+        self._entities.clear()
+        self._shapes.clear()
+        self._cells.clear()
+        self.ready = False
+
+    async def load(self, service) -> int:
+        """
+        (Re)build the index from every entity of the type in the broker.
+
+        Args:
+            service: BaseService used to page through the entities
+
+        Returns:
+            Number of entities indexed
+        """
+        self.clear()
+        async for entity in service.iter_entities(type=self.entity_type):
+            self.upsert(entity)
+        self.ready = True
+        self.loaded_at = time.time()
+        logger.info(f"Spatial index for {self.entity_type}: {len(self)} entities")
+        return len(self)
+
+    def handle_notification(self, notification: Dict[str, Any]) -> int:
+        """
+        Apply the entities of an NGSI-LD notification (normalized format).
+
+        Entities carrying `deletedAt` are removed, others are upserted.
+
+        Returns:
+            Number of entities applied
+        """
+        applied = 0
+        for entity in notification.get("data", []):
+            if entity.get("type") not in (None, self.entity_type):
+                continue
+            if entity.get("deletedAt"):
+                self.remove(entity.get("id"))
+            else:
+                self.upsert(entity)
+            applied += 1
+        self.notified_at = time.time()
+        return applied
+
+    def _candidates(self, bbox: Optional[Tuple]) -> Iterable[str]:
+        if bbox is None:
+            return list(self._shapes)
+        ids: Set[str] = set()
+        for cell in self._cell_range(bbox):
+            ids.update(self._cells.get(cell, ()))
+        return ids
+
+    def query(
+        self, georel: str, geometry: Optional[str], coordinates: Any
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Evaluate an NGSI-LD geo-query locally.
+
+        Args:
+            georel: near;maxDistance==N / near;minDistance==N, within or intersects
+            geometry: Query geometry type
+            coordinates: Query coordinates (JSON string or list)
+
+        Returns:
+            Matching (indexed, normalized) entities - nearest first for near -
+            or None when the query cannot be answered locally
+        """
+        parsed = parse_georel(georel)
+        if parsed is None:
+            return None
+        relation, modifiers = parsed
+        if isinstance(coordinates, str):
+            coordinates = json.loads(coordinates)
+        target = Shape({"type": geometry, "coordinates": coordinates})
+
+        if relation == "near":
+            if geometry != "Point":
+                return None
+            point = target.points[0]
+            max_distance = modifiers.get("maxDistance")
+            min_distance = modifiers.get("minDistance", 0.0)
+            bbox = None
+            if max_distance is not None:
+                dlat = math.degrees(max_distance / EARTH_RADIUS)
+                dlon = dlat / max(math.cos(math.radians(point[1])), 1e-6)
+                bbox = (
+                    point[0] - dlon,
+                    point[1] - dlat,
+                    point[0] + dlon,
+                    point[1] + dlat,
+                )
+            matches = []
+            for entity_id in self._candidates(bbox):
+                distance = self._shapes[entity_id].distance(point)
+                if distance >= min_distance and (
+                    max_distance is None or distance <= max_distance
+                ):
+                    matches.append((distance, entity_id))
+            matches.sort()
+            ids = [entity_id for _, entity_id in matches]
+        else:
+            test = Shape.within if relation == "within" else Shape.intersects
+            ids = [
+                entity_id
+                for entity_id in self._candidates(target.bbox)
+                if test(self._shapes[entity_id], target)
+            ]
+            ids.sort()
+
+        self.hits += 1
+        return [self._entities[entity_id] for entity_id in ids]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entity_type": self.entity_type,
+            "ready": self.ready,
+            "entities": len(self._entities),
+            "indexed_geometries": len(self._shapes),
+            "cells": len(self._cells),
+            "hits": self.hits,
+            "loaded_at": self.loaded_at,
+            "notified_at": self.notified_at,
+        }
+
+
+# entity type -> index, shared by all service singletons
+spatial_indexes: Dict[str, SpatialIndex] = {
+    entity_type: SpatialIndex(entity_type, cell_size=settings.spatial_index_cell_size)
+    for entity_type in settings.spatial_index_types
+}
+
+
+def get_spatial_index(entity_type: Optional[str]) -> Optional[SpatialIndex]:
+    """Return the index of an entity type, or None if the type is not indexed."""
+    return spatial_indexes.get(entity_type) if entity_type else None
+
+
+async def warm_spatial_indexes(services: Iterable[Any]) -> None:
+    """
+    Load the index of each service's entity type.
+
+    A type that fails to load keeps being answered by the broker.
+    """
+    for service in services:
+        index = get_spatial_index(service.entity_type)
+        if index is None:
+            continue
+        try:
+            await index.load(service)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Spatial index for {index.entity_type} not loaded: {e}")
@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from app.core.config import settings
+
 from .base_service import BaseService
 
 logger = logging.getLogger(__name__)
@@ -419,6 +421,149 @@ class SubscriptionService(BaseService):
             notifier_info=[{"key": "MQTT-QoS", "value": mqtt_qos}],
         )
 
+    async def subscribe_cache_invalidation(
+        self,
+        entity_types: Optional[List[str]] = None,
+        notification_uri: Optional[str] = None,
+    ) -> List[httpx.Response]:
+        """
+        Subscribe the entity cache to changes of the cached entity types.
+
+        Orion-LD then notifies the backend whenever such an entity changes and
+        the notification endpoint drops the stale cache entries, so entries
+        can use long TTLs without serving outdated data.
+
+        Args:
+            entity_types: Entity types to watch (default: every type with a
+                          positive TTL in the entity cache)
+            notification_uri: Notification endpoint
+                              (default: settings.entity_cache_notification_uri)
+
+        Returns:
+            One httpx.Response per created subscription
+
+        Example:
+            await service.subscribe_cache_invalidation(["Building", "RoadSegment"])
+        """
+        if entity_types is None:
+            entity_types = [t for t, ttl in self.cache.ttls.items() if ttl > 0]
+        uri = notification_uri or settings.entity_cache_notification_uri
+
+        responses = []
+        for entity_type in entity_types:
+            responses.append(
+                await self.create_subscription(
+                    description=f"Entity cache invalidation for {entity_type}",
+                    entities=[{"type": entity_type}],
+                    notification_uri=uri,
+                    notification_format="keyValues",
+                )
+            )
+        return responses
+
+    async def subscribe_history(
+        self,
+        entity_types: Optional[List[str]] = None,
+        notification_uri: Optional[str] = None,
+    ) -> List[httpx.Response]:
+        """
+        Subscribe QuantumLeap to changes so it records the entity history.
+
+        Historical queries (see historical_service) are answered from what
+        QuantumLeap received through these subscriptions.
+
+        Args:
+            entity_types: Entity types to record (default: settings.history_entity_types)
+            notification_uri: QuantumLeap notify endpoint
+                              (default: settings.quantumleap_notification_uri)
+
+        Returns:
+            One httpx.Response per created subscription
+
+        Example:
+            await service.subscribe_history(["WaterQualityObserved"])
+        """
+        uri = notification_uri or settings.quantumleap_notification_uri
+
+        responses = []
+        for entity_type in entity_types or settings.history_entity_types:
+            responses.append(
+                await self.create_subscription(
+                    description=f"QuantumLeap history for {entity_type}",
+                    entities=[{"type": entity_type}],
+                    notification_uri=uri,
+                    notification_format="normalized",
+                )
+            )
+        return responses
+
+    async def subscribe_spatial_index(
+        self,
+        entity_types: Optional[List[str]] = None,
+        notification_uri: Optional[str] = None,
+    ) -> List[httpx.Response]:
+        """
+        Subscribe the local spatial index to changes of the indexed types.
+
+        Args:
+            entity_types: Entity types to keep in sync
+                          (default: settings.spatial_index_types)
+            notification_uri: Notification endpoint
+                              (default: settings.spatial_index_notification_uri)
+
+        Returns:
+            One httpx.Response per created subscription
+
+        Example:
+            await service.subscribe_spatial_index(["RoadSegment"])
+        """
+        uri = notification_uri or settings.spatial_index_notification_uri
+
+        responses = []
+        for entity_type in entity_types or settings.spatial_index_types:
+            responses.append(
+                await self.create_subscription(
+                    description=f"Spatial index sync for {entity_type}",
+                    entities=[{"type": entity_type}],
+                    notification_uri=uri,
+                    notification_format="normalized",
+                )
+            )
+        return responses
+
+    async def subscribe_rollups(
+        self,
+        entity_types: Optional[List[str]] = None,
+        notification_uri: Optional[str] = None,
+    ) -> List[httpx.Response]:
+        """
+        Subscribe the traffic KPI rollups to new traffic observations.
+
+        Args:
+            entity_types: Entity types to fold in (default: settings.rollup_entity_types)
+            notification_uri: Notification endpoint
+                              (default: settings.rollup_notification_uri)
+
+        Returns:
+            One httpx.Response per created subscription
+
+        Example:
+            await service.subscribe_rollups(["TrafficFlowObserved"])
+        """
+        uri = notification_uri or settings.rollup_notification_uri
+
+        responses = []
+        for entity_type in entity_types or settings.rollup_entity_types:
+            responses.append(
+                await self.create_subscription(
+                    description=f"Traffic KPI rollups for {entity_type}",
+                    entities=[{"type": entity_type}],
+                    notification_uri=uri,
+                    notification_format="normalized",
+                )
+            )
+        return responses
+
 
 # Singleton instance
 subscription_service = SubscriptionService()
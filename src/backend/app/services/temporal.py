@@ -0,0 +1,219 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Helpers for slicing, paginating and stitching NGSI-LD temporal queries.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+# Entity keys that are not attributes
+_ENTITY_KEYS = {"id", "type", "@context"}
+
+# NGSI-LD temporal pagination: "Content-Range: date-time <start>-<end>/<size>"
+_CONTENT_RANGE = re.compile(
+    r"date-?time\s+(\d{4}-\d{2}-\d{2}T[^/]*?)-(\d{4}-\d{2}-\d{2}T[^/]*)/", re.I
+)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp; naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime as the UTC ISO 8601 form Orion-LD expects."""
+    return (
+        value.astimezone(timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def split_time_range(
+    time_at: str, end_time_at: str, window: timedelta
+) -> List[Tuple[str, str]]:
+    """
+    Split [time_at, end_time_at) into consecutive windows of at most `window`.
+
+    Example:
+        split_time_range("2025-11-01T00:00:00Z", "2025-11-02T00:00:00Z",
+                         timedelta(hours=12))
+        # -> [("2025-11-01T00:00:00.000Z", "2025-11-01T12:00:00.000Z"),
+        #     ("2025-11-01T12:00:00.000Z", "2025-11-02T00:00:00.000Z")]
+    """
+    start = parse_timestamp(time_at)
+    end = parse_timestamp(end_time_at)
+    if window.total_seconds() <= 0 or end <= start:
+        return [(time_at, end_time_at)]
+
+    windows = []
+    while start < end:
+        window_end = min(start + window, end)
+        windows.append((format_timestamp(start), format_timestamp(window_end)))
+        start = window_end
+    return windows
+
+
+def parse_content_range(response: httpx.Response) -> Optional[Tuple[str, str]]:
+    """
+    Return the (first, last) timestamps of a partial (206) temporal response.
+
+    None when the response is complete.
+    """
+    if response.status_code != 206:
+        return None
+    match = _CONTENT_RANGE.search(response.headers.get("Content-Range", ""))
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+
+def next_page_params(
+    params: Dict[str, Any], content_range: Tuple[str, str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Query parameters for the page after a partial temporal response.
+
+    Results are returned oldest first, or newest first with `lastN`; the next
+    page starts after the newest (or before the oldest) instance returned.
+
+    The next page starts at (not after) the boundary instance, so other
+    instances at that same instant are fetched too; the duplicates are
+    dropped by merge_temporal_entities().
+
+    Returns:
+        The next page's parameters, or None if the range would not advance
+    """
+    oldest, newest = sorted(content_range, key=parse_timestamp)
+    timerel = params.get("timerel")
+    next_params = dict(params)
+
+    if params.get("lastN"):
+        if timerel == "after":
+            next_params["timerel"] = "between"
+            next_params["endTimeAt"] = oldest
+        elif timerel == "before":
+            next_params["timeAt"] = oldest
+        else:
+            next_params["endTimeAt"] = oldest
+    else:
+        if timerel == "before":
+            next_params["timerel"] = "between"
+            next_params["endTimeAt"] = params.get("timeAt")
+        next_params["timeAt"] = newest
+
+    if all(
+        _same_instant(next_params.get(name), params.get(name))
+        for name in ("timeAt", "endTimeAt")
+    ) and next_params.get("timerel") == params.get("timerel"):
+        return None
+    return next_params
+
+
+def _time_key(value: Any) -> Tuple[int, Any]:
+    # Instants compare as datetimes, whatever their precision
+    # ("...:00Z" and "...:00.000Z" are the same); unparsable values sort last
+    if isinstance(value, str):
+        try:
+            return 0, parse_timestamp(value)
+        except ValueError:
+            pass
+    return 1, str(value)
+
+
+def _same_instant(a: Any, b: Any) -> bool:
+    return _time_key(a) == _time_key(b)
+
+
+def _instances(attribute: Any) -> List[Dict[str, Any]]:
+    if isinstance(attribute, list):
+        return attribute
+    return [attribute]
+
+
+def _merge_attribute(current: Any, new: Any) -> Any:
+    # Simplified representation (options=temporalValues): {"values": [[v, t]]}
+    if isinstance(current, dict) and isinstance(current.get("values"), list):
+        if isinstance(new, dict) and isinstance(new.get("values"), list):
+            current["values"].extend(new["values"])
+        return current
+    return _instances(current) + _instances(new)
+
+
+def _sort_attribute(attribute: Any, timeproperty: str) -> Any:
+    if isinstance(attribute, dict) and isinstance(attribute.get("values"), list):
+        seen = set()
+        values = []
+        for pair in sorted(attribute["values"], key=lambda p: _time_key(p[-1])):
+            key = (repr(pair[0]), _time_key(pair[-1]))
+            if key not in seen:
+                seen.add(key)
+                values.append(pair)
+        attribute["values"] = values
+        return attribute
+
+    instances = _instances(attribute)
+    if len(instances) < 2:
+        return attribute
+
+    seen_instances: Set[Any] = set()
+    unique = []
+    for instance in sorted(instances, key=lambda i: _time_key(i.get(timeproperty))):
+        instance_key = instance.get("instanceId") or (
+            _time_key(instance.get(timeproperty)),
+            repr(instance.get("value", instance.get("object"))),
+        )
+        if instance_key not in seen_instances:
+            seen_instances.add(instance_key)
+            unique.append(instance)
+    return unique
+
+
+def merge_temporal_entities(
+    pages: Iterable[List[Dict[str, Any]]], timeproperty: str = "observedAt"
+) -> List[Dict[str, Any]]:
+    """
+    Stitch temporal query results from several windows or pages.
+
+    Instances of the same entity attribute are concatenated, ordered by
+    `timeproperty` and de-duplicated (window and page boundaries may return
+    the same instance twice). Entities keep the order of first appearance.
+
+    Args:
+        pages: Temporal entity lists, one per window/page
+        timeproperty: Instance timestamp used for ordering
+
+    Returns:
+        One temporal entity per entity ID
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for page in pages:
+        for entity in page:
+            entity_id = entity["id"]
+            target = merged.get(entity_id)
+            if target is None:
+                merged[entity_id] = dict(entity)
+                continue
+            for name, attribute in entity.items():
+                if name in _ENTITY_KEYS:
+                    continue
+                if name in target:
+                    target[name] = _merge_attribute(target[name], attribute)
+                else:
+                    target[name] = attribute
+
+    for entity in merged.values():
+        for name in list(entity):
+            if name not in _ENTITY_KEYS:
+                entity[name] = _sort_attribute(entity[name], timeproperty)
+    return list(merged.values())
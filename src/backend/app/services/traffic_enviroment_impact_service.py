@@ -11,6 +11,7 @@ import httpx
 from app.models.TrafficEnvironmentImpact import TrafficEnvironmentImpact
 
 from .base_service import BaseService
+from .historical_service import historical_service
 
 logger = logging.getLogger(__name__)
 
@@ -477,6 +478,12 @@ class TrafficEnvironmentImpactService(BaseService):
         """
         Query traffic environment impacts by observation time range.
 
+        Served from QuantumLeap (the latest recorded version of each
+        entity, filtered on dateObservedFrom/dateObservedTo); counts,
+        lookups without a start time and lookups QuantumLeap cannot answer
+        (unreachable, or not holding every entity) scan Orion-LD's current
+        state instead.
+
         Args:
             start_time: Start time in ISO8601 format (inclusive)
             end_time: End time in ISO8601 format (inclusive)
@@ -496,6 +503,23 @@ class TrafficEnvironmentImpactService(BaseService):
             # Get entities observed after a specific time
             recent = await service.get_by_time_range(start_time="2025-11-17T08:00:00Z")
         """
+        if not kwargs.get("count"):
+            conditions = []
+            if start_time is not None:
+                conditions.append(("dateObservedFrom", ">=", start_time))
+            if end_time is not None:
+                conditions.append(("dateObservedTo", "<=", end_time))
+            offset = int(kwargs.get("offset") or 0)
+            records = await historical_service.current_state(
+                self,
+                conditions,
+                pick=kwargs.get("pick"),
+                format=kwargs.get("format"),
+                limit=limit + offset if limit else None,
+            )
+            if records is not None:
+                return records[offset:]
+
         query_parts = []
         if start_time is not None:
             query_parts.append(f'dateObservedFrom>="{start_time}"')
@@ -12,6 +12,7 @@ import httpx
 from app.models.WaterQualityObserved import WaterQualityObserved
 
 from .base_service import BaseService
+from .historical_service import historical_service
 
 logger = logging.getLogger(__name__)
 
@@ -481,6 +482,11 @@ class WaterQualityService(BaseService):
         """
         Get recent WaterQualityObserved entities since a specific time.
 
+        Served from QuantumLeap (the latest recorded version of each
+        entity, filtered on dateObserved); scans Orion-LD's current state
+        instead when QuantumLeap is unreachable or does not hold every
+        entity, e.g. before POST /subscriptions/quick/history was called.
+
         Args:
             since: ISO8601 timestamp (e.g., "2025-11-15T00:00:00Z")
             limit: Maximum number of results
@@ -498,6 +504,12 @@ class WaterQualityService(BaseService):
                 pick="id,type,dateObserved,pH,temperature,turbidity"
             )
         """
+        records = await historical_service.current_state(
+            self, [("dateObserved", ">", since)], pick=pick, format=format, limit=limit
+        )
+        if records is not None:
+            return records
+
         q = f"dateObserved>'{since}'"
         result = await self.get_all(
             q=q, limit=limit, format=format, pick=pick, count=False
@@ -0,0 +1,173 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.core.config import settings
+
+from .entity_cache import entity_type_from_id
+
+if TYPE_CHECKING:
+    from .base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Every buffer created in the process, flushed together on shutdown
+_buffers: List["AttributeUpdateBuffer"] = []
+
+
+class AttributeUpdateBuffer:
+    """
+    Write-behind buffer that merges attribute PATCHes into batch updates.
+
+    Updates are collected per entity for `flush_interval` seconds or until
+    `max_entities` entities are pending, merged so the last write wins per
+    attribute, and sent as one POST /entityOperations/update.
+
+    Ordering: flushes run one at a time, so updates to the same entity reach
+    the broker in the order they were buffered. Direct (unbuffered) writes to
+    the same entity are not ordered against buffered ones.
+
+    Usage:
+        buffer = AttributeUpdateBuffer(service)
+        await buffer.update(
+            "urn:ngsi-ld:TrafficLight:4066470692",
+            {"forcePhase": {"type": "Property", "value": 1}},
+        )
+        ...
+        await buffer.close()  # flush on shutdown
+    """
+
+    def __init__(
+        self,
+        service: "BaseService",
+        flush_interval: Optional[float] = None,
+        max_entities: Optional[int] = None,
+    ):
+        self.service = service
+        self.flush_interval = (
+            settings.write_behind_flush_interval
+            if flush_interval is None
+            else flush_interval
+        )
+        self.max_entities = max_entities or settings.write_behind_max_entities
+
+        # entity_id -> merged entity fragment ({"id", "type", attrs...})
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._waiters: Dict[str, List["asyncio.Future[bool]"]] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None  # Created inside the loop
+        self._timer: Optional["asyncio.Task[None]"] = None
+
+        _buffers.append(self)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of entities waiting to be flushed."""
+        return len(self._pending)
+
+    def update(
+        self,
+        entity_id: str,
+        attrs_data: Dict[str, Any],
+        entity_type: Optional[str] = None,
+    ) -> "asyncio.Future[bool]":
+        """
+        Buffer an attribute update.
+
+        Args:
+            entity_id: The entity identifier
+            attrs_data: Attributes to update (same shape as a PATCH /attrs body)
+            entity_type: Entity type (default: service type or parsed from the URN)
+
+        Returns:
+            Future resolved with True once the update was written, or False
+            if the broker rejected it. Awaiting it is optional.
+        """
+        entity = self._pending.get(entity_id)
+        if entity is None:
+            entity = {
+                "id": entity_id,
+                "type": entity_type
+                or self.service.entity_type
+                or entity_type_from_id(entity_id),
+            }
+            self._pending[entity_id] = entity
+
+        for name, value in attrs_data.items():
+            if name != "@context":
+                entity[name] = value
+
+        waiter: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(entity_id, []).append(waiter)
+
+        if len(self._pending) >= self.max_entities:
+            asyncio.ensure_future(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.ensure_future(self._flush_later())
+        return waiter
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # Disarm before flushing: updates buffered while the batch is in
+        # flight must schedule their own flush
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send all pending updates as one batch update."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            entities = list(self._pending.values())
+            waiters = self._waiters
+            self._pending = OrderedDict()
+            self._waiters = {}
+
+            failed: Dict[str, Any] = {}
+            try:
+                response = await self.service.batch_update(entities)
+                if response.status_code == 207:
+                    failed = {
+                        e.get("entityId"): e.get("error")
+                        for e in self.service._json(response).get("errors", [])
+                    }
+            except Exception as e:
+                logger.error(
+                    f"Write-behind flush of {len(entities)} entities failed: {e}"
+                )
+                failed = {entity["id"]: str(e) for entity in entities}
+
+            for entity_id, error in failed.items():
+                logger.error(f"Write-behind update of {entity_id} failed: {error}")
+
+            for entity_id, entity_waiters in waiters.items():
+                for waiter in entity_waiters:
+                    if not waiter.done():
+                        waiter.set_result(entity_id not in failed)
+
+            logger.debug(
+                f"Write-behind flushed {len(entities)} entities "
+                f"({len(failed)} failed)"
+            )
+
+    async def close(self) -> None:
+        """Flush pending updates and stop the timer."""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+        if self in _buffers:
+            _buffers.remove(self)
+
+
+async def flush_write_buffers() -> None:
+    """Flush every write-behind buffer (FastAPI lifespan shutdown)."""
+    for buffer in list(_buffers):
+        await buffer.close()
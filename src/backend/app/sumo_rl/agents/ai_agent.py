@@ -13,11 +13,16 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from app.core.http_client import get_http_client
+from app.services.base_service import BaseService
 from app.sumo_rl.config import config
 from app.sumo_rl.models.dqn_model import DQNModel
 
 logger = logging.getLogger(__name__)
 
+# Commands are sent without a custom @context (attribute names stay core terms)
+NGSI_LD_CORE_CONTEXT = "https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld"
+
 
 class AIGreenWaveAgent:
     """
@@ -25,8 +30,20 @@ class AIGreenWaveAgent:
     Receives traffic data → Makes decisions → Sends commands
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.config = config
+        # None = use the app-wide connection pool (app.core.http_client)
+        self._http_client = http_client
+        # forcePhase commands go through the write-behind buffer (batch updates)
+        self._commands = BaseService(
+            orion_url=self.config.orion_url,
+            context_url=NGSI_LD_CORE_CONTEXT,
+            client=http_client,
+        )
         self.model = DQNModel(
             model_path=model_path or self.config.model_path,
             state_size=self.config.state_size,
@@ -38,6 +55,12 @@ class AIGreenWaveAgent:
         logger.info(f"  Loaded: {self.model.loaded}")
         logger.info(f"  Orion: {self.config.orion_url}")
     
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the injected HTTP client or the shared application pool."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            return self._http_client
+        return await get_http_client()
+
     def process_notification(self, notification_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process notification from Orion-LD
@@ -106,10 +129,13 @@ class AIGreenWaveAgent:
         """
         Send traffic light command to Orion-LD
         
+        Commands are buffered: several commands within one flush window are
+        merged (last phase wins) into a single batch update.
+        
         Args:
             next_phase: Target phase index
         """
-        url = f"{self.config.orion_url}/entities/urn:ngsi-ld:TrafficLight:{self.config.tls_id}/attrs"
+        entity_id = f"urn:ngsi-ld:TrafficLight:{self.config.tls_id}"
         payload = {
             "forcePhase": {
                 "type": "Property",
@@ -118,21 +144,13 @@ class AIGreenWaveAgent:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    url,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=5.0
-                )
+            written = await self._commands.buffer_attribute_update(entity_id, payload)
+            
+            if written:
+                logger.info(f"[AI Agent] ✅ Sent command: forcePhase={next_phase}")
+            else:
+                logger.warning(f"[AI Agent] Command rejected by Orion at {self.config.orion_url}")
                 
-                if response.status_code in [204, 200]:
-                    logger.info(f"[AI Agent] ✅ Sent command: forcePhase={next_phase}")
-                else:
-                    logger.warning(f"[AI Agent] Command response: {response.status_code}")
-                    
-        except httpx.ConnectError:
-            logger.error(f"[AI Agent] Cannot connect to Orion at {self.config.orion_url}")
         except Exception as e:
             logger.error(f"[AI Agent] Error sending command: {e}")
     
@@ -151,19 +169,19 @@ class AIGreenWaveAgent:
         url = f"{self.config.orion_url}/{path}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                if method == "GET":
-                    response = await client.get(url, headers={"Accept": "application/json"}, timeout=5.0)
-                elif method == "PATCH":
-                    response = await client.patch(url, json=data, headers={"Content-Type": "application/json"}, timeout=5.0)
-                else:
-                    raise ValueError(f"Unsupported method: {method}")
+            client = await self._get_client()
+            if method == "GET":
+                response = await client.get(url, headers={"Accept": "application/json"}, timeout=5.0)
+            elif method == "PATCH":
+                response = await client.patch(url, json=data, headers={"Content-Type": "application/json"}, timeout=5.0)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                return {"error": response.text, "status_code": response.status_code}
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    return {"error": response.text, "status_code": response.status_code}
-                    
         except Exception as e:
             logger.error(f"[AI Agent] Proxy error: {e}")
             raise
@@ -0,0 +1,521 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Compact traffic state - NumPy tables and a binary delta encoding
+
+A CompactState holds one simulation step as three structured arrays
+(traffic lights, lanes, vehicles) plus a few scalars. Signal states such
+as "GGrrGGrr" repeat from step to step, so they are interned once per
+connection and stored as indices; the per-light dicts of the API are
+parsed once per distinct signal state and shared.
+
+DeltaEncoder turns a sequence of states into binary frames that carry only
+what changed since the previous frame: removed and added rows, then per
+field the rows whose value changed. A keyframe (delta against nothing) is
+written first and every `keyframe_interval` frames, so a stored stream can
+be read from any keyframe.
+
+Frame layout (little endian):
+    header   magic, version, flags, seq, base seq, time, vehicle counters
+    strings  signal states interned since the previous frame
+    tables   traffic lights, lanes, vehicles; each:
+             removed row indices, added rows (ids + records),
+             per field: changed row indices + new values
+"""
+
+import io
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+
+TLS_DTYPE = np.dtype(
+    [
+        ("phase", "<i4"),
+        ("phase_duration", "<f8"),  # Seconds
+        ("next_switch", "<f8"),  # Simulation time of the next phase switch
+        ("signal", "<u4"),  # Index into the StringTable
+    ]
+)
+LANE_DTYPE = np.dtype(
+    [
+        ("halting", "<i4"),  # Vehicles with speed < 0.1 m/s
+        ("waiting_time", "<f4"),  # Seconds, summed over the lane's vehicles
+        ("occupancy", "<f4"),  # 0-1
+    ]
+)
+VEHICLE_DTYPE = np.dtype([("speed", "<f4")])  # m/s
+
+_MAGIC = b"TSNP"
+_VERSION = 1
+_KEYFRAME = 0x01
+# magic, version, flags, seq, base, time, loaded, departed, arrived, main TLS
+_HEADER = struct.Struct("<4sBBIId3ii")
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+
+
+def parse_lights(signal_state: str) -> List[Dict[str, Any]]:
+    """Parse signal state (GGrrrrGGrrrr etc) to human readable"""
+    lights = []
+    for i, state in enumerate(signal_state):
+        color = "unknown"
+        if state in ["G", "g"]:
+            color = "green"
+        elif state in ["y", "Y"]:
+            color = "yellow"
+        elif state in ["r", "R"]:
+            color = "red"
+        elif state in ["o", "O"]:
+            color = "off"
+
+        lights.append({"index": i, "state": state, "color": color})
+    return lights
+
+
+class StringTable:
+    """
+    Append-only table of interned strings (signal states).
+
+    Indices never change, so states can keep referring to them while the
+    owning connector interns new strings on the worker thread.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._lights: Dict[int, List[Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[index]
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def lights(self, index: int) -> List[Dict[str, Any]]:
+        """Parsed lights of a signal state; shared, so must not be modified."""
+        lights = self._lights.get(index)
+        if lights is None:
+            lights = self._lights[index] = parse_lights(self.values[index])
+        return lights
+
+
+class Table:
+    """Row IDs and their records (a read-only structured array)."""
+
+    __slots__ = ("ids", "records")
+
+    def __init__(self, ids: Tuple[str, ...], records: np.ndarray):
+        records.flags.writeable = False
+        self.ids = ids
+        self.records = records
+
+    @classmethod
+    def empty(cls, dtype: np.dtype) -> "Table":
+        return cls((), np.empty(0, dtype=dtype))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class CompactState:
+    """
+    Traffic state of one simulation step.
+
+    Never modified once built. `to_dict()` returns the same dictionary
+    TraCIConnector.get_traffic_state() always has.
+    """
+
+    __slots__ = (
+        "time",
+        "loaded",
+        "departed",
+        "arrived",
+        "main_tls",
+        "tls",
+        "lanes",
+        "vehicles",
+        "strings",
+    )
+
+    def __init__(
+        self,
+        time: float,
+        loaded: int,
+        departed: int,
+        arrived: int,
+        main_tls: int,
+        tls: Table,
+        lanes: Table,
+        vehicles: Table,
+        strings: StringTable,
+    ):
+        self.time = time
+        self.loaded = loaded
+        self.departed = departed
+        self.arrived = arrived
+        self.main_tls = main_tls  # Row of the main TLS in `tls`, -1 if unknown
+        self.tls = tls
+        self.lanes = lanes
+        self.vehicles = vehicles
+        self.strings = strings
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the record arrays."""
+        return (
+            self.tls.records.nbytes
+            + self.lanes.records.nbytes
+            + self.vehicles.records.nbytes
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        tls = self.tls.records
+        phases = tls["phase"].tolist()
+        durations = tls["phase_duration"].tolist()
+        switches = tls["next_switch"].tolist()
+        signals = tls["signal"].tolist()
+
+        # Detailed state for ALL traffic lights
+        traffic_lights = []
+        for i, tls_id in enumerate(self.tls.ids):
+            time_until_switch = max(0, switches[i] - self.time)
+            traffic_lights.append(
+                {
+                    "id": tls_id,
+                    "current_phase": phases[i],
+                    "phase_duration": round(durations[i], 1),
+                    "time_until_switch": round(time_until_switch, 1),
+                    "signal_state": self.strings[signals[i]],
+                    "lights": self.strings.lights(signals[i]),
+                    "is_main": i == self.main_tls,
+                }
+            )
+
+        # Vehicle metrics
+        speeds = self.vehicles.records["speed"].astype(np.float64)
+        vehicle_count = len(speeds)
+        if vehicle_count > 0:
+            avg_speed = float(speeds.mean())
+            max_speed = float(speeds.max())
+            min_speed = float(speeds.min())
+        else:
+            avg_speed = max_speed = min_speed = 0.0
+
+        # Lane metrics (lanes of the main TLS)
+        lanes = self.lanes.records
+        lane_count = len(lanes)
+        queue_length = int(lanes["halting"].sum())
+        waiting_time = float(lanes["waiting_time"].sum(dtype=np.float64))
+        total_occupancy = float(lanes["occupancy"].sum(dtype=np.float64))
+        avg_occupancy = total_occupancy / lane_count if lane_count else 0.0
+
+        main = self.main_tls
+        return {
+            "simulation_time": self.time,
+            "current_phase": phases[main] if main >= 0 else None,
+            "phase_duration": durations[main] if main >= 0 else None,
+            "vehicle_count": vehicle_count,
+            "avg_speed": round(avg_speed, 2),
+            "max_speed": round(max_speed, 2),
+            "min_speed": round(min_speed, 2),
+            "queue_length": queue_length,
+            "waiting_time": round(waiting_time, 2),
+            "avg_occupancy": round(avg_occupancy * 100, 2),
+            "loaded_vehicles": self.loaded,
+            "departed_vehicles": self.departed,
+            "arrived_vehicles": self.arrived,
+            "traffic_lights": traffic_lights,
+            "total_traffic_lights": len(traffic_lights),
+            "controlled_lanes": lane_count,
+        }
+
+
+# --- Binary encoding ---
+
+
+def _write_ids(out: io.BytesIO, ids: Iterable[str]) -> None:
+    for value in ids:
+        data = value.encode("utf-8")
+        out.write(_LENGTH.pack(len(data)))
+        out.write(data)
+
+
+def _write_indices(out: io.BytesIO, indices: np.ndarray) -> None:
+    out.write(_COUNT.pack(len(indices)))
+    out.write(indices.astype("<u4").tobytes())
+
+
+def _encode_table(out: io.BytesIO, old: Table, new: Table) -> Table:
+    # Returns the table as the decoder rebuilds it: kept rows in their old
+    # order, then the added ones
+    kept_old: Union[slice, np.ndarray]
+    kept_new: Union[slice, np.ndarray]
+    if old.ids == new.ids:
+        removed = added = np.empty(0, dtype=np.intp)
+        kept_old = kept_new = slice(None)
+        ids = new.ids
+        records = new.records
+    else:
+        new_index = {row_id: i for i, row_id in enumerate(new.ids)}
+        old_index = {row_id: i for i, row_id in enumerate(old.ids)}
+        kept = [
+            (i, new_index[row_id])
+            for i, row_id in enumerate(old.ids)
+            if row_id in new_index
+        ]
+        kept_old = np.array([i for i, _ in kept], dtype=np.intp)
+        kept_new = np.array([j for _, j in kept], dtype=np.intp)
+        removed = np.array(
+            [i for i, row_id in enumerate(old.ids) if row_id not in new_index],
+            dtype=np.intp,
+        )
+        added = np.array(
+            [j for j, row_id in enumerate(new.ids) if row_id not in old_index],
+            dtype=np.intp,
+        )
+        ids = tuple(old.ids[i] for i in kept_old) + tuple(new.ids[j] for j in added)
+        records = np.concatenate([new.records[kept_new], new.records[added]])
+
+    _write_indices(out, removed)
+    out.write(_COUNT.pack(len(added)))
+    _write_ids(out, (new.ids[j] for j in added))
+    out.write(new.records[added].tobytes())
+
+    previous = old.records[kept_old]
+    current = new.records[kept_new]
+    for name in new.records.dtype.names:
+        changed = np.flatnonzero(previous[name] != current[name])
+        _write_indices(out, changed)
+        out.write(current[name][changed].tobytes())
+    return Table(ids, records)
+
+
+class DeltaEncoder:
+    """
+    Encode successive CompactStates as binary delta frames.
+
+    Usage:
+        encoder = DeltaEncoder()
+        for snapshot in worker.snapshots():
+            fp.write(encoder.encode(snapshot.compact))
+    """
+
+    def __init__(self, keyframe_interval: Optional[int] = None):
+        self.keyframe_interval = (
+            settings.sumo_keyframe_interval
+            if keyframe_interval is None
+            else keyframe_interval
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Make the next frame a keyframe."""
+        self._seq = 0
+        self._since_keyframe = 0
+        self._strings: Optional[StringTable] = None
+        self._sent_strings = 0
+        self._tables: Tuple[Table, Table, Table] = (
+            Table.empty(TLS_DTYPE),
+            Table.empty(LANE_DTYPE),
+            Table.empty(VEHICLE_DTYPE),
+        )
+
+    def encode(self, state: CompactState) -> bytes:
+        keyframe = (
+            self._strings is not state.strings
+            or self._since_keyframe >= self.keyframe_interval > 0
+        )
+        if keyframe:
+            base = 0
+            self._strings, self._sent_strings = state.strings, 0
+            self._since_keyframe = 0
+            old = (
+                Table.empty(TLS_DTYPE),
+                Table.empty(LANE_DTYPE),
+                Table.empty(VEHICLE_DTYPE),
+            )
+        else:
+            base = self._seq
+            self._since_keyframe += 1
+            old = self._tables
+        self._seq += 1
+
+        out = io.BytesIO()
+        out.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                _KEYFRAME if keyframe else 0,
+                self._seq,
+                base,
+                state.time,
+                state.loaded,
+                state.departed,
+                state.arrived,
+                state.main_tls,
+            )
+        )
+        # Strings the worker interned meanwhile are sent early; that's harmless
+        strings = state.strings.values[self._sent_strings :]
+        out.write(_COUNT.pack(len(strings)))
+        _write_ids(out, strings)
+        self._sent_strings += len(strings)
+
+        self._tables = (
+            _encode_table(out, old[0], state.tls),
+            _encode_table(out, old[1], state.lanes),
+            _encode_table(out, old[2], state.vehicles),
+        )
+        return out.getvalue()
+
+
+class _Reader:
+    def __init__(self, data: Union[bytes, memoryview]):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def count(self) -> int:
+        return self.unpack(_COUNT)[0]
+
+    def ids(self, count: int) -> List[str]:
+        ids = []
+        for _ in range(count):
+            (length,) = self.unpack(_LENGTH)
+            ids.append(bytes(self.data[self.pos : self.pos + length]).decode("utf-8"))
+            self.pos += length
+        return ids
+
+    def array(self, dtype: np.dtype, count: int) -> np.ndarray:
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.pos)
+        self.pos += array.nbytes
+        return array
+
+    def indices(self) -> np.ndarray:
+        return self.array(np.dtype("<u4"), self.count()).astype(np.intp)
+
+
+def _decode_table(reader: _Reader, old: Table) -> Table:
+    removed = reader.indices()
+    added_count = reader.count()
+    added_ids = reader.ids(added_count)
+    added = reader.array(old.records.dtype, added_count)
+
+    if len(removed):
+        dropped = set(removed.tolist())
+        ids = tuple(row_id for i, row_id in enumerate(old.ids) if i not in dropped)
+        records = np.delete(old.records, removed)
+    else:
+        ids = old.ids
+        records = old.records.copy()
+    for name in records.dtype.names or ():
+        changed = reader.indices()
+        records[name][changed] = reader.array(records.dtype[name], len(changed))
+    if added_count:
+        ids = ids + tuple(added_ids)
+        records = np.concatenate([records, added])
+    return Table(ids, records)
+
+
+class DeltaDecoder:
+    """
+    Rebuild CompactStates from the frames of one DeltaEncoder.
+
+    Raises:
+        ValueError: On a malformed frame, or a delta whose base frame was
+            not the last one decoded (decoding must start at a keyframe)
+    """
+
+    def __init__(self) -> None:
+        self._seq: Optional[int] = None
+        self._strings = StringTable()
+        self._tables: Tuple[Table, Table, Table] = (
+            Table.empty(TLS_DTYPE),
+            Table.empty(LANE_DTYPE),
+            Table.empty(VEHICLE_DTYPE),
+        )
+
+    def decode(self, frame: Union[bytes, memoryview]) -> CompactState:
+        reader = _Reader(frame)
+        try:
+            (
+                magic,
+                version,
+                flags,
+                seq,
+                base,
+                time,
+                loaded,
+                departed,
+                arrived,
+                main_tls,
+            ) = reader.unpack(_HEADER)
+        except struct.error as e:
+            raise ValueError(f"Truncated snapshot frame: {e}") from e
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a snapshot frame (or an unsupported version)")
+
+        if flags & _KEYFRAME:
+            self._strings = StringTable()
+            old = (
+                Table.empty(TLS_DTYPE),
+                Table.empty(LANE_DTYPE),
+                Table.empty(VEHICLE_DTYPE),
+            )
+        elif self._seq is None or base != self._seq:
+            raise ValueError(
+                f"Delta frame {seq} expects frame {base}, last decoded {self._seq}"
+            )
+        else:
+            old = self._tables
+
+        for value in reader.ids(reader.count()):
+            self._strings.intern(value)
+        tls, lanes, vehicles = (_decode_table(reader, table) for table in old)
+        self._tables = (tls, lanes, vehicles)
+        self._seq = seq
+        return CompactState(
+            time, loaded, departed, arrived, main_tls, *self._tables, self._strings
+        )
+
+
+def encode_stream(
+    states: Iterable[CompactState], keyframe_interval: Optional[int] = None
+) -> bytes:
+    """Length-prefixed frames of `states`, starting with a keyframe."""
+    encoder = DeltaEncoder(keyframe_interval)
+    out = io.BytesIO()
+    for state in states:
+        frame = encoder.encode(state)
+        out.write(_COUNT.pack(len(frame)))
+        out.write(frame)
+    return out.getvalue()
+
+
+def decode_stream(data: bytes) -> Iterator[CompactState]:
+    """States of an encode_stream() buffer, in order."""
+    decoder = DeltaDecoder()
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        (length,) = _COUNT.unpack_from(view, pos)
+        pos += _COUNT.size
+        yield decoder.decode(view[pos : pos + length])
+        pos += length
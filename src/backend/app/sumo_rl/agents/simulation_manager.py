@@ -0,0 +1,218 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Simulation Manager - run several SUMO instances side by side
+
+Each simulation has its own labelled TraCI connection, worker thread and
+snapshot stream, so Nga4ThuDuc, NguyenThaiSon and QuangTrung can run at the
+same time - each SUMO process on its own port and CPU core - and API calls
+are routed to one of them by simulation ID.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.sumo_rl.agents.simulation_worker import SimulationWorker
+from app.sumo_rl.agents.smart_traffic_controller import SmartTrafficController
+from app.sumo_rl.agents.snapshot_broadcaster import SnapshotBroadcaster
+from app.sumo_rl.agents.traci_connector import TraCIConnector
+
+logger = logging.getLogger(__name__)
+
+# Simulation used by the /sumo/... routes that take no simulation ID
+DEFAULT_SIMULATION = "default"
+
+
+class Simulation:
+    """
+    One running SUMO instance and everything attached to it.
+
+    Usage:
+        simulation = simulation_manager.get("QuangTrung")
+        simulation.worker.latest().state
+        await simulation.worker.call(simulation.connector.set_phase, 1)
+    """
+
+    def __init__(
+        self,
+        simulation_id: str,
+        connector: TraCIConnector,
+        broadcaster: SnapshotBroadcaster,
+    ):
+        self.id = simulation_id
+        self.connector = connector
+        self.worker = SimulationWorker(connector)
+        self.broadcaster = broadcaster
+        # Smart controllers for each traffic light (one per TLS)
+        self.controllers: Dict[str, SmartTrafficController] = {}
+        self.started_at = time.time()
+
+    @property
+    def running(self) -> bool:
+        return self.worker.is_alive()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            **self.connector.get_scenario_info(),
+            "running": self.running,
+            "real_time_factor": self.worker.real_time_factor,
+            "error": self.worker.error,
+            "started_at": self.started_at,
+        }
+
+
+class SimulationManager:
+    """
+    Launch, track and stop SUMO simulations by ID.
+
+    Must be used from the event loop; blocking TraCI setup runs in threads.
+    An ID and its capacity slot are reserved before the setup is awaited,
+    so concurrent launches can neither exceed `max_simulations` nor start
+    two SUMO processes under one ID (orphaning the first).
+
+    Usage:
+        simulation = await simulation_manager.launch("NguyenThaiSon")
+        await simulation_manager.connect("sumo-simulation", 8813, "Nga4ThuDuc")
+        simulation_manager.list()
+        await simulation_manager.stop(simulation.id)
+    """
+
+    def __init__(self, max_simulations: Optional[int] = None):
+        self.max_simulations = max_simulations or settings.sumo_max_simulations
+        self._simulations: Dict[str, Simulation] = {}
+        # IDs reserved by a launch/connect that is still starting
+        self._starting: Set[str] = set()
+        # Kept across restarts, so streaming clients survive a reconnect
+        self._broadcasters: Dict[str, SnapshotBroadcaster] = {}
+
+    def get(self, simulation_id: str) -> Optional[Simulation]:
+        """Running simulation with this ID, or None."""
+        simulation = self._simulations.get(simulation_id)
+        return simulation if simulation is not None and simulation.running else None
+
+    def list(self) -> List[Simulation]:
+        return list(self._simulations.values())
+
+    def broadcaster(self, simulation_id: str) -> SnapshotBroadcaster:
+        """Snapshot stream of a simulation, whether it is running yet or not."""
+        broadcaster = self._broadcasters.get(simulation_id)
+        if broadcaster is None:
+            broadcaster = self._broadcasters[simulation_id] = SnapshotBroadcaster()
+        return broadcaster
+
+    def _reserve(self, simulation_id: str) -> None:
+        """Claim an ID and a capacity slot; release with _starting.discard()."""
+        if simulation_id in self._starting:
+            raise RuntimeError(f"Simulation '{simulation_id}' is already starting")
+        others = (set(self._simulations) | self._starting) - {simulation_id}
+        if len(others) >= self.max_simulations:
+            raise RuntimeError(
+                f"At most {self.max_simulations} simulations can run at once"
+            )
+        self._starting.add(simulation_id)
+
+    async def launch(
+        self,
+        scenario: str,
+        simulation_id: Optional[str] = None,
+        gui: bool = False,
+        port: Optional[int] = None,
+    ) -> Simulation:
+        """
+        Start a new SUMO process for a scenario.
+
+        Args:
+            scenario: Scenario name (see TraCIConnector.SCENARIOS)
+            simulation_id: ID to route calls by (default: the scenario name,
+                suffixed when that is taken)
+            gui: Use sumo-gui
+            port: TraCI port (default: any free port)
+
+        Raises:
+            RuntimeError: If SUMO could not be started, too many simulations
+                run or the ID is already starting
+        """
+        if simulation_id is None:
+            simulation_id, n = scenario, 1
+            while simulation_id in self._simulations or simulation_id in self._starting:
+                n += 1
+                simulation_id = f"{scenario}-{n}"
+        self._reserve(simulation_id)
+        try:
+            await self.stop(simulation_id)
+            connector = TraCIConnector(label=simulation_id)
+            if not await asyncio.to_thread(connector.start_sumo, scenario, gui, port):
+                raise RuntimeError(f"Failed to start SUMO for scenario {scenario}")
+            return self._run(simulation_id, connector)
+        finally:
+            self._starting.discard(simulation_id)
+
+    async def connect(
+        self,
+        host: str,
+        port: int,
+        scenario: str,
+        simulation_id: str = DEFAULT_SIMULATION,
+    ) -> Simulation:
+        """
+        Attach to a SUMO instance started elsewhere (--remote-port).
+
+        Replaces the simulation running under `simulation_id`, if any.
+
+        Raises:
+            RuntimeError: If the connection failed, too many simulations run
+                or the ID is already starting
+        """
+        self._reserve(simulation_id)
+        try:
+            await self.stop(simulation_id)
+            connector = TraCIConnector(label=simulation_id)
+            if not await asyncio.to_thread(connector.connect, host, port, scenario):
+                raise RuntimeError(f"Failed to connect to SUMO at {host}:{port}")
+            return self._run(simulation_id, connector)
+        finally:
+            self._starting.discard(simulation_id)
+
+    def _run(self, simulation_id: str, connector: TraCIConnector) -> Simulation:
+        simulation = Simulation(
+            simulation_id, connector, self.broadcaster(simulation_id)
+        )
+        simulation.broadcaster.attach(simulation.worker)
+        simulation.worker.start()
+        self._simulations[simulation_id] = simulation
+        logger.info(
+            f"Simulation '{simulation_id}' running "
+            f"({len(self._simulations)} of at most {self.max_simulations})"
+        )
+        return simulation
+
+    async def stop(self, simulation_id: str) -> bool:
+        """
+        Stop a simulation and close its connection.
+
+        Returns:
+            False if no simulation had this ID
+        """
+        simulation = self._simulations.pop(simulation_id, None)
+        if simulation is None:
+            return False
+        await asyncio.to_thread(simulation.worker.stop)
+        broadcaster = self._broadcasters.get(simulation_id)
+        if broadcaster is not None and not broadcaster.subscribers:
+            del self._broadcasters[simulation_id]
+        logger.info(f"Simulation '{simulation_id}' stopped")
+        return True
+
+    async def stop_all(self) -> None:
+        await asyncio.gather(*(self.stop(s) for s in list(self._simulations)))
+
+
+# Shared by the SUMO control routes
+simulation_manager = SimulationManager()
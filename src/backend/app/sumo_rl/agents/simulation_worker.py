@@ -0,0 +1,272 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Simulation Worker - background thread that owns the TraCI connection
+
+The worker steps SUMO at a configurable real-time factor and publishes
+each traffic state as an immutable snapshot to a ring buffer. Every other
+TraCI call (set phase, AI control, ...) is sent to it over a command queue,
+so the FastAPI event loop never blocks on the TraCI socket and the global
+traci connection is only ever used from one thread.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.sumo_rl.agents.compact_state import CompactState
+from app.sumo_rl.agents.traci_connector import TraCIConnector
+
+logger = logging.getLogger(__name__)
+
+# Queued to end the worker loop
+_STOP = object()
+
+
+class SimulationSnapshot:
+    """
+    Traffic state of one simulation step, as published by the worker.
+
+    Snapshots are never modified once published, so readers on any thread
+    can hold on to them; `seq` increases by one per published snapshot.
+
+    The ring buffer keeps the CompactState; `state` builds the dictionary
+    on each access, so readers should keep the result instead of asking
+    again.
+    """
+
+    __slots__ = ("seq", "simulation_time", "wall_time", "compact")
+    seq: int
+    simulation_time: float
+    wall_time: float
+    compact: CompactState
+
+    def __init__(self, seq: int, compact: CompactState):
+        object.__setattr__(self, "seq", seq)
+        object.__setattr__(self, "simulation_time", compact.time)
+        object.__setattr__(self, "wall_time", time.time())
+        object.__setattr__(self, "compact", compact)
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        return self.compact.to_dict()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SimulationSnapshot is immutable")
+
+    def __repr__(self) -> str:
+        return f"SimulationSnapshot(seq={self.seq}, time={self.simulation_time})"
+
+
+class SimulationWorker:
+    """
+    Step a connected SUMO simulation on a dedicated thread.
+
+    With a real-time factor of 1.0 one simulated second passes per wall
+    second; 2.0 runs twice as fast, 0 only steps on request (POST /sumo/step).
+    Steps that take longer than their slot are not caught up in a burst.
+
+    Usage:
+        worker = SimulationWorker(connector)
+        worker.start()
+        worker.latest().state               # non-blocking read
+        await worker.call(connector.set_phase, 1)
+        worker.stop()                       # also closes the connection
+    """
+
+    def __init__(
+        self,
+        connector: TraCIConnector,
+        real_time_factor: Optional[float] = None,
+        step_length: Optional[float] = None,
+        buffer_size: Optional[int] = None,
+    ):
+        self.connector = connector
+        self.real_time_factor = (
+            settings.sumo_real_time_factor
+            if real_time_factor is None
+            else real_time_factor
+        )
+        self.step_length = step_length or settings.sumo_step_length
+        self._snapshots: Deque[SimulationSnapshot] = deque(
+            maxlen=buffer_size or settings.sumo_snapshot_buffer_size
+        )
+        self._commands: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._seq = 0
+        self._close_on_stop = True
+        # Called on the worker thread with every published snapshot
+        self._listeners: List[Callable[[SimulationSnapshot], None]] = []
+        # Set when the connection is lost; the worker then stops stepping
+        self.error: Optional[str] = None
+
+    # --- Reading snapshots (any thread) ---
+
+    def latest(self) -> Optional[SimulationSnapshot]:
+        """Most recent snapshot, or None before the first one."""
+        try:
+            return self._snapshots[-1]
+        except IndexError:
+            return None
+
+    def snapshots(self, since: int = 0) -> List[SimulationSnapshot]:
+        """Buffered snapshots with seq > since, oldest first."""
+        return [s for s in list(self._snapshots) if s.seq > since]
+
+    def add_listener(self, listener: Callable[[SimulationSnapshot], None]) -> None:
+        """
+        Call `listener(snapshot)` for every snapshot published from now on.
+
+        Listeners run on the worker thread and must return quickly (e.g.
+        hand the snapshot to an event loop with call_soon_threadsafe).
+        """
+        self._listeners.append(listener)
+
+    # --- Commands (any thread) ---
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue `fn(*args, **kwargs)` to run on the worker thread.
+
+        Returns:
+            Future resolved with the call's result or exception
+        """
+        future: Future = Future()
+        self._commands.put((future, fn, args, kwargs))
+        return future
+
+    async def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn` on the worker thread and await its result without blocking
+        the event loop.
+
+        Raises:
+            asyncio.TimeoutError: After settings.sumo_command_timeout seconds
+        """
+        future = self.submit(fn, *args, **kwargs)
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=settings.sumo_command_timeout
+        )
+
+    def set_real_time_factor(self, factor: float) -> None:
+        """Change the stepping speed (0 = manual stepping only)."""
+        self.submit(setattr, self, "real_time_factor", max(0.0, factor))
+
+    # --- Worker thread ---
+
+    def step(self) -> Optional[SimulationSnapshot]:
+        """
+        Advance the simulation one step and publish its snapshot.
+
+        Runs on the worker thread; from elsewhere use `call(worker.step)`.
+        """
+        if self.connector.step() is None:
+            self._fail("Failed to step simulation")
+            return None
+        return self.publish()
+
+    def publish(self) -> Optional[SimulationSnapshot]:
+        """Read the current traffic state and append it to the ring buffer."""
+        state = self.connector.get_compact_state()
+        if state is None:
+            self._fail("Failed to get traffic state")
+            return None
+        self._seq += 1
+        snapshot = SimulationSnapshot(self._seq, state)
+        # deque.append is atomic; readers never see a partial snapshot
+        self._snapshots.append(snapshot)
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {e}")
+        return snapshot
+
+    def _fail(self, message: str) -> None:
+        if self.error is None:
+            logger.error(f"Simulation worker stopped stepping: {message}")
+        self.error = message
+
+    def _execute(self, command) -> None:
+        future, fn, args, kwargs = command
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _run(self) -> None:
+        self.publish()
+        next_step = time.monotonic()
+        while True:
+            timeout = None  # Manual stepping: wait for commands only
+            if self.real_time_factor > 0 and self.error is None:
+                timeout = max(0.0, next_step - time.monotonic())
+            try:
+                command = self._commands.get(timeout=timeout)
+            except queue.Empty:
+                command = None
+
+            if command is _STOP:
+                break
+            if command is not None:
+                self._execute(command)
+                continue
+
+            self.step()
+            # Slow steps push the schedule back instead of bursting to catch up
+            next_step = max(
+                next_step + self.step_length / self.real_time_factor,
+                time.monotonic(),
+            )
+
+        # Commands queued after stop() fail instead of waiting forever
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            if command is not _STOP:
+                command[0].cancel()
+        if self._close_on_stop:
+            self.connector.close()
+        logger.info("Simulation worker stopped")
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        """Start the worker thread; it publishes a first snapshot right away."""
+        self._thread = threading.Thread(
+            target=self._run, name="sumo-simulation-worker", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Simulation worker started (real-time factor {self.real_time_factor}, "
+            f"step length {self.step_length}s)"
+        )
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, close_connection: bool = True, timeout: float = 5.0) -> None:
+        """
+        Stop the worker thread, waiting up to `timeout` seconds.
+
+        Blocks the calling thread; use run_in_threadpool from async code.
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._close_on_stop = close_connection
+        self._commands.put(_STOP)
+        thread.join(timeout)
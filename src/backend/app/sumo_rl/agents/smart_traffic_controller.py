@@ -11,7 +11,7 @@ Thuật toán điều hướng giao thông ĐÚNG:
 - Đảm bảo không xung đột (không cho tất cả đèn xanh cùng lúc!)
 """
 import logging
-from typing import Dict
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +34,14 @@ class SmartTrafficController:
     4. Đảm bảo thời gian tối thiểu cho mỗi phase (tránh nhấp nháy)
     """
     
-    def __init__(self, tls_id: str, min_green_time: int = 10):
+    def __init__(self, tls_id: str, min_green_time: int = 10, connection: Optional[Any] = None):
         """
         Args:
             tls_id: Traffic light system ID
             min_green_time: Thời gian tối thiểu cho đèn xanh (giây)
+            connection: TraCI connection of the simulation (default: global traci)
         """
+        self.traci: Optional[Any] = connection if connection is not None else (traci if _TRACI_AVAILABLE else None)
         self.tls_id = tls_id
         self.min_green_time = min_green_time
         self.current_phase = 0
@@ -47,15 +49,15 @@ class SmartTrafficController:
         
     def get_lane_metrics(self, lane_id: str) -> Dict:
         """Lấy metrics của một lane"""
-        if not _TRACI_AVAILABLE:
+        if self.traci is None:
             return {}
             
         try:
             return {
-                'occupancy': traci.lane.getLastStepOccupancy(lane_id),
-                'queue_length': traci.lane.getLastStepHaltingNumber(lane_id),
-                'waiting_time': traci.lane.getWaitingTime(lane_id),
-                'vehicle_count': traci.lane.getLastStepVehicleNumber(lane_id)
+                'occupancy': self.traci.lane.getLastStepOccupancy(lane_id),
+                'queue_length': self.traci.lane.getLastStepHaltingNumber(lane_id),
+                'waiting_time': self.traci.lane.getWaitingTime(lane_id),
+                'vehicle_count': self.traci.lane.getLastStepVehicleNumber(lane_id)
             }
         except Exception as e:
             logger.error(f"Failed to get metrics for lane {lane_id}: {e}")
@@ -63,15 +65,15 @@ class SmartTrafficController:
     
     def calculate_phase_priority(self, phase_index: int) -> float:
         """Tính độ ưu tiên của một phase dựa trên traffic metrics"""
-        if not _TRACI_AVAILABLE:
+        if self.traci is None:
             return 0.0
             
         try:
-            logic = traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
+            logic = self.traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
             phase = logic.phases[phase_index]
             state = phase.state
             
-            controlled_lanes = traci.trafficlight.getControlledLanes(self.tls_id)
+            controlled_lanes = self.traci.trafficlight.getControlledLanes(self.tls_id)
             green_lanes = [
                 lane for i, lane in enumerate(controlled_lanes) 
                 if i < len(state) and state[i] in ['G', 'g']
@@ -112,18 +114,18 @@ class SmartTrafficController:
     
     def select_best_phase(self) -> int:
         """Chọn phase tối ưu dựa trên traffic conditions"""
-        if not _TRACI_AVAILABLE:
+        if self.traci is None:
             return 0
             
         try:
-            current_time = traci.simulation.getTime()
+            current_time = self.traci.simulation.getTime()
             time_in_phase = current_time - self.phase_start_time
             
             if time_in_phase < self.min_green_time:
                 logger.debug(f"Keeping phase {self.current_phase} (only {time_in_phase}s elapsed)")
                 return self.current_phase
             
-            logic = traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
+            logic = self.traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
             num_phases = len(logic.phases)
             
             priorities = {}
@@ -156,15 +158,15 @@ class SmartTrafficController:
     
     def get_phase_explanation(self, phase_index: int) -> str:
         """Giải thích phase này cho phép xe đi theo hướng nào"""
-        if not _TRACI_AVAILABLE:
+        if self.traci is None:
             return "Unknown"
             
         try:
-            logic = traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
+            logic = self.traci.trafficlight.getAllProgramLogics(self.tls_id)[0]
             phase = logic.phases[phase_index]
             state = phase.state
             
-            controlled_lanes = traci.trafficlight.getControlledLanes(self.tls_id)
+            controlled_lanes = self.traci.trafficlight.getControlledLanes(self.tls_id)
             
             green_directions = []
             for i, signal in enumerate(state):
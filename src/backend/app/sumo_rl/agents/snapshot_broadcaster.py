@@ -0,0 +1,255 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Snapshot Broadcaster - push simulation snapshots to WebSocket/SSE clients
+
+One producer: the simulation worker hands each snapshot to the event loop,
+where it is diffed and encoded once per distinct field selection - not once
+per client - so a step costs the same for one viewer or a thousand.
+
+Clients only ever receive the newest frame: a client still busy sending
+when new steps arrive skips the frames in between and gets a full state
+next, since the deltas it missed can no longer be applied.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from app.services.serialization import json_serializer
+from app.sumo_rl.agents.simulation_worker import SimulationSnapshot, SimulationWorker
+
+logger = logging.getLogger(__name__)
+
+# Message types, as understood by the dashboard's useWebSocket hook
+FULL = "simulation_update"
+DELTA = "simulation_delta"
+
+
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON Merge Patch (RFC 7386) turning `old` into `new`.
+
+    Changed keys carry their new value (nested objects are patched
+    recursively), removed keys are null and arrays are replaced whole.
+
+    Example:
+        merge_patch({"a": 1, "b": {"c": 2}}, {"a": 1, "b": {"c": 3}})
+        # -> {"b": {"c": 3}}
+    """
+    patch: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            patch[key] = merge_patch(previous, value)
+        else:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+class _Frame:
+    # One published step of a channel; encodings are built on first use and
+    # shared by every client of the channel
+    __slots__ = ("seq", "base", "timestamp", "state", "patch", "_encoded")
+
+    def __init__(
+        self,
+        seq: int,
+        base: Optional[int],
+        timestamp: float,
+        state: Dict[str, Any],
+        patch: Optional[Dict[str, Any]],
+    ):
+        self.seq = seq
+        self.base = base
+        self.timestamp = timestamp
+        self.state = state
+        self.patch = patch
+        self._encoded: Dict[str, str] = {}
+
+    def encode(self, kind: str) -> str:
+        """JSON message of this frame as a full state or a delta."""
+        message = self._encoded.get(kind)
+        if message is None:
+            message = json_serializer.dumps(
+                {
+                    "type": kind,
+                    "seq": self.seq,
+                    "base": self.base if kind == DELTA else None,
+                    "timestamp": int(self.timestamp * 1000),
+                    "data": self.patch if kind == DELTA else self.state,
+                }
+            ).decode("utf-8")
+            self._encoded[kind] = message
+        return message
+
+
+class _Channel:
+    # Clients that selected the same fields share one channel
+    def __init__(self, fields: Optional[FrozenSet[str]]) -> None:
+        self.fields = fields
+        self.frame: Optional[_Frame] = None
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+
+    def publish(
+        self, seq: int, snapshot: SimulationSnapshot, state: Dict[str, Any]
+    ) -> None:
+        if self.fields is not None:
+            state = {k: v for k, v in state.items() if k in self.fields}
+        previous = self.frame
+        patch = merge_patch(previous.state, state) if previous else None
+        if previous is not None and not patch:
+            return  # Nothing this channel shows has changed
+        self.frame = _Frame(
+            seq,
+            previous.seq if previous else None,
+            snapshot.wall_time,
+            state,
+            patch,
+        )
+        # Wake every waiting client at once, then arm a fresh event
+        event, self.changed = self.changed, asyncio.Event()
+        event.set()
+
+
+class SnapshotSubscription:
+    """
+    One client's view of the stream.
+
+    Usage:
+        subscription = broadcaster.subscribe(fields=["vehicle_count"])
+        try:
+            while True:
+                kind, message = await subscription.next_frame()
+                await websocket.send_text(message)
+        finally:
+            subscription.close()
+    """
+
+    def __init__(
+        self, broadcaster: "SnapshotBroadcaster", fields: Optional[Iterable[str]]
+    ) -> None:
+        self._broadcaster = broadcaster
+        self._channel: Optional[_Channel] = None
+        self._last_seq: Optional[int] = None
+        self.select(fields)
+
+    @property
+    def fields(self) -> Optional[FrozenSet[str]]:
+        return self._channel.fields if self._channel else None
+
+    def select(self, fields: Optional[Iterable[str]]) -> None:
+        """Switch to another field selection (None = every field)."""
+        if self._channel is not None:
+            self._broadcaster._release(self._channel)
+        self._channel = self._broadcaster._acquire(fields)
+        # The next frame of the new channel is sent in full
+        self._last_seq = None
+
+    async def next_frame(self) -> Tuple[str, str]:
+        """
+        Wait for a frame newer than the last one returned.
+
+        Returns:
+            (kind, message): kind is FULL or DELTA, message the JSON text
+        """
+        while True:
+            channel = self._channel
+            if channel is None:
+                raise RuntimeError("Subscription is closed")
+            frame = channel.frame
+            if frame is not None and frame.seq != self._last_seq:
+                kind = (
+                    DELTA
+                    if self._last_seq is not None and frame.base == self._last_seq
+                    else FULL
+                )
+                self._last_seq = frame.seq
+                return kind, frame.encode(kind)
+            await channel.changed.wait()
+
+    def close(self) -> None:
+        if self._channel is not None:
+            self._broadcaster._release(self._channel)
+            self._channel = None
+
+
+class SnapshotBroadcaster:
+    """
+    Fan simulation snapshots out to any number of streaming clients.
+
+    Usage:
+        broadcaster = simulation_manager.broadcaster(simulation_id)
+        broadcaster.attach(worker)  # from the event loop
+        worker.start()
+    """
+
+    def __init__(self) -> None:
+        self._channels: Dict[Optional[FrozenSet[str]], _Channel] = {}
+        self._seq = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.latest: Optional[SimulationSnapshot] = None
+
+    @property
+    def subscribers(self) -> int:
+        return sum(channel.subscribers for channel in self._channels.values())
+
+    def attach(self, worker: SimulationWorker) -> None:
+        """
+        Stream the snapshots of `worker`. Must be called on the event loop
+        the clients are served from.
+        """
+        self._loop = asyncio.get_running_loop()
+        worker.add_listener(self._on_snapshot)
+
+    def _on_snapshot(self, snapshot: SimulationSnapshot) -> None:
+        # Worker thread: hand over to the event loop, do nothing else here
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.publish, snapshot)
+
+    def publish(self, snapshot: SimulationSnapshot) -> None:
+        """Publish a snapshot to every channel (event loop thread)."""
+        seq = next(self._seq)
+        state = snapshot.state  # Built on access: once for all channels
+        for channel in self._channels.values():
+            channel.publish(seq, snapshot, state)
+        self.latest = snapshot
+
+    def subscribe(self, fields: Optional[Iterable[str]] = None) -> SnapshotSubscription:
+        """
+        Start streaming to a new client.
+
+        Args:
+            fields: Top-level state fields to receive (default: all)
+        """
+        return SnapshotSubscription(self, fields)
+
+    def _acquire(self, fields: Optional[Iterable[str]]) -> _Channel:
+        key = frozenset(fields) if fields else None
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _Channel(key)
+            # New channels start from the current state instead of waiting a step
+            if self.latest is not None:
+                channel.publish(next(self._seq), self.latest, self.latest.state)
+        channel.subscribers += 1
+        return channel
+
+    def _release(self, channel: _Channel) -> None:
+        channel.subscribers -= 1
+        if channel.subscribers <= 0:
+            self._channels.pop(channel.fields, None)
@@ -8,8 +8,22 @@ TraCI Connector - Connect to running SUMO instance
 Không cần SUMO_HOME, chỉ cần SUMO đang chạy với --remote-port
 """
 import logging
+import math
 import os
-from typing import Any, Dict, Optional
+import socket
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.sumo_rl.agents.compact_state import (
+    LANE_DTYPE,
+    TLS_DTYPE,
+    VEHICLE_DTYPE,
+    CompactState,
+    StringTable,
+    Table,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +31,50 @@ logger = logging.getLogger(__name__)
 _TRACI_AVAILABLE = False
 try:
     import traci
+    import traci.constants as tc
+
+    # Variables SUMO pushes with every simulation step once subscribed
+    SIMULATION_VARS = (
+        tc.VAR_TIME,
+        tc.VAR_LOADED_VEHICLES_NUMBER,
+        tc.VAR_DEPARTED_VEHICLES_NUMBER,
+        tc.VAR_ARRIVED_VEHICLES_NUMBER,
+    )
+    TLS_VARS = (
+        tc.TL_CURRENT_PHASE,
+        tc.TL_PHASE_DURATION,
+        tc.TL_RED_YELLOW_GREEN_STATE,
+        tc.TL_NEXT_SWITCH,
+    )
+    LANE_VARS = (
+        tc.LAST_STEP_VEHICLE_HALTING_NUMBER,
+        tc.VAR_WAITING_TIME,
+        tc.LAST_STEP_OCCUPANCY,
+    )
+    VEHICLE_VARS = (tc.VAR_SPEED,)
     _TRACI_AVAILABLE = True
 except ImportError:
     logger.warning("TraCI not available - SUMO features will be disabled")
 
 
+# traci.start()/connect() update the module's pool of labelled connections
+_TRACI_POOL_LOCK = threading.Lock()
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused TCP port for a new SUMO instance"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
 class TraCIConnector:
     """
     Connect to running SUMO simulation via TraCI
     User phải start SUMO trước với: sumo-gui -c <config> --remote-port 8813
+    
+    Each connector owns its own labelled TraCI connection (self.conn), so
+    several connectors can drive different SUMO instances side by side.
     """
     
     SCENARIOS = {
@@ -43,23 +92,49 @@ class TraCIConnector:
         }
     }
     
-    def __init__(self):
-        """Initialize TraCI connector"""
+    def __init__(self, label: str = 'default'):
+        """
+        Initialize TraCI connector
+        
+        Args:
+            label: Name of this connector's TraCI connection (one per simulation)
+        """
+        self.label = label
+        self.conn: Optional[Any] = None  # traci.connection.Connection
         self.connected = False
-        self.scenario = None
-        self.tls_id = None
-        self.host = None
-        self.port = None
-        self.sumo_process = None  # Store SUMO process if we start it
+        self.scenario: Optional[str] = None
+        self.tls_id: Optional[str] = None
+        self.host: Optional[str] = None
+        self.port: Optional[int] = None
+        self.sumo_process: Optional[Any] = None  # Store SUMO process if we start it
+        # Objects subscribed by _subscribe(), read back by get_compact_state()
+        self._tls_ids: Tuple[str, ...] = ()
+        self._main_tls_index = -1
+        self._controlled_lanes: Tuple[str, ...] = ()
+        self._vehicle_anchor: Optional[str] = None
+        # Signal states seen on this connection (see compact_state.py)
+        self._strings = StringTable()
     
-    def start_sumo(self, scenario: str = 'Nga4ThuDuc', gui: bool = False, port: int = 8813) -> bool:
+    @property
+    def connection(self) -> Any:
+        """
+        This connector's open TraCI connection
+        
+        Raises:
+            RuntimeError: If no connection is open
+        """
+        if self.conn is None:
+            raise RuntimeError(f"TraCI connection '{self.label}' is not open")
+        return self.conn
+    
+    def start_sumo(self, scenario: str = 'Nga4ThuDuc', gui: bool = False, port: Optional[int] = 8813) -> bool:
         """
         Start new SUMO process using traci.start()
         
         Args:
             scenario: Scenario name
             gui: Use sumo-gui (True) or sumo (False)
-            port: TraCI port
+            port: TraCI port (None = any free port)
             
         Returns:
             True if started successfully
@@ -98,15 +173,17 @@ class TraCIConnector:
             sumo_cmd = [
                 sumo_binary,
                 '-c', config_file,
-                '--remote-port', str(port),
                 '--step-length', '1.0',
                 '--no-warnings', 'true'
             ]
             
-            logger.info(f"Starting SUMO with: {' '.join(sumo_cmd)}")
+            port = port or _free_port()
+            logger.info(f"Starting SUMO with: {' '.join(sumo_cmd)} (port {port}, label {self.label})")
             
-            # Start SUMO using traci.start()
-            traci.start(sumo_cmd)
+            # Start SUMO using traci.start() - it adds --remote-port itself
+            with _TRACI_POOL_LOCK:
+                traci.start(sumo_cmd, port=port, label=self.label)
+                self.conn = traci.getConnection(self.label)
             
             # Get scenario info
             if scenario in self.SCENARIOS:
@@ -114,15 +191,17 @@ class TraCIConnector:
                 self.tls_id = self.SCENARIOS[scenario]['tls_id']
             else:
                 # Try to detect TLS from simulation
-                tls_list = traci.trafficlight.getIDList()
+                tls_list = self.connection.trafficlight.getIDList()
                 if tls_list:
                     self.tls_id = tls_list[0]
                     logger.warning(f"Unknown scenario '{scenario}', using first TLS: {self.tls_id}")
                 else:
                     logger.error("No traffic lights found in simulation")
-                    traci.close()
+                    self._close_connection()
                     return False
             
+            self._subscribe()
+            
             self.connected = True
             self.host = 'localhost'
             self.port = port
@@ -160,12 +239,11 @@ class TraCIConnector:
             try:
                 if self.connected:
                     logger.info("Closing existing TraCI connection...")
-                    traci.close()
                     self.connected = False
                 else:
                     # Even if self.connected is False, try closing in case of stale connection
                     logger.info("Force closing any stale TraCI connections...")
-                    traci.close()
+                self._close_connection()
             except Exception as e:
                 logger.debug(f"No existing connection to close: {e}")
             
@@ -173,23 +251,24 @@ class TraCIConnector:
             
             # Connect to TraCI - this blocks until SUMO responds
             # BUT SUMO won't respond until simulation starts!
-            # Solution: use traci.init with numRetries=10 (wait ~10s)
-            traci.init(port=port, host=host, numRetries=10)
-            traci.setOrder(1) # Order 1: Backend (Passive/Slave) -> Does not block simulation
+            # Solution: use traci.connect with numRetries=10 (wait ~10s)
+            with _TRACI_POOL_LOCK:
+                self.conn = traci.connect(port=port, host=host, numRetries=10, label=self.label)
+            self.connection.setOrder(1) # Order 1: Backend (Passive/Slave) -> Does not block simulation
             
             logger.info("TraCI init successful, starting simulation...")
             
             # CRITICAL: Do one simulation step to actually start SUMO
             # Without this, SUMO is connected but paused at t=0
-            traci.simulationStep()
+            self.connection.simulationStep()
             
-            logger.info(f"Simulation started at time: {traci.simulation.getTime()}")
+            logger.info(f"Simulation started at time: {self.connection.simulation.getTime()}")
             
             # Get scenario info
-            detected_tls_list = traci.trafficlight.getIDList()
+            detected_tls_list = self.connection.trafficlight.getIDList()
             if not detected_tls_list:
                 logger.error("No traffic lights found in simulation")
-                traci.close()
+                self._close_connection()
                 return False
 
             target_tls_id = None
@@ -210,6 +289,8 @@ class TraCIConnector:
 
             self.tls_id = target_tls_id
             
+            self._subscribe()
+            
             self.connected = True
             self.host = host
             self.port = port
@@ -234,7 +315,7 @@ class TraCIConnector:
             
         try:
             # Test connection by getting simulation time
-            traci.simulation.getTime()
+            self.connection.simulation.getTime()
             return True
         except Exception:
             self.connected = False
@@ -251,128 +332,129 @@ class TraCIConnector:
             return None
             
         try:
-            traci.simulationStep()
-            return traci.simulation.getTime()
+            self.connection.simulationStep()
+            # Subscribed values arrive with the step response
+            return self.connection.simulation.getSubscriptionResults()[tc.VAR_TIME]
         except Exception as e:
             logger.error(f"Failed to step simulation: {e}")
             return None
     
-    def get_traffic_state(self) -> Optional[Dict[str, Any]]:
+    def _subscribe(self) -> None:
         """
-        Get current traffic state from SUMO - ALL TRAFFIC LIGHTS
+        Subscribe to every variable get_compact_state() reads.
+        
+        SUMO then sends all of them with each simulationStep response, so
+        reading the state costs no extra socket round trips:
+        - simulation: time and loaded/departed/arrived vehicle counts
+        - every traffic light: phase, phase duration, signal state, next switch
+        - lanes controlled by the main TLS: halting number, waiting time, occupancy
+        - vehicles: speed, through a context subscription around one junction
+          whose radius spans the whole network (vehicles come and go, so they
+          cannot be subscribed one by one up front)
+        """
+        self.connection.simulation.subscribe(SIMULATION_VARS)
+        
+        self._tls_ids = tuple(self.connection.trafficlight.getIDList())
+        for tls_id in self._tls_ids:
+            self.connection.trafficlight.subscribe(tls_id, TLS_VARS)
+        self._main_tls_index = self._tls_ids.index(self.tls_id) if self.tls_id in self._tls_ids else -1
+        self._strings = StringTable()
+        
+        # Use dict.fromkeys to drop duplicates but keep the lane order
+        self._controlled_lanes = tuple(dict.fromkeys(self.connection.trafficlight.getControlledLanes(self.tls_id)))
+        for lane in self._controlled_lanes:
+            self.connection.lane.subscribe(lane, LANE_VARS)
+        
+        (xmin, ymin), (xmax, ymax) = self.connection.simulation.getNetBoundary()
+        self._vehicle_anchor = self.connection.junction.getIDList()[0]
+        self.connection.junction.subscribeContext(
+            self._vehicle_anchor,
+            tc.CMD_GET_VEHICLE_VARIABLE,
+            math.hypot(xmax - xmin, ymax - ymin),
+            VEHICLE_VARS
+        )
+        
+        logger.info(
+            f"Subscribed to {len(self._tls_ids)} traffic lights, "
+            f"{len(self._controlled_lanes)} lanes and all vehicles"
+        )
+    
+    def refresh_traffic_light(self, tls_id: Optional[str] = None) -> None:
+        """
+        Re-subscribe a TLS (default: the main one) so its subscribed values
+        reflect a phase change made between steps (the response carries the
+        current values). Call it after every setPhase on the connection.
+        """
+        tls_id = tls_id or self.tls_id
+        if tls_id in self._tls_ids:
+            self.connection.trafficlight.subscribe(tls_id, TLS_VARS)
+    
+    def get_compact_state(self) -> Optional[CompactState]:
+        """
+        Get current traffic state from SUMO as NumPy tables
+        
+        Values come from the subscriptions made at connect time and are
+        refreshed by every simulation step, so this makes no TraCI calls
+        beyond the connection check. Signal states are interned, so a state
+        costs a few bytes per traffic light, lane and vehicle.
         
         Returns:
-            Dictionary with traffic metrics including ALL traffic lights state
+            CompactState (see compact_state.py), or None if not connected
         """
         if not self.is_connected():
             return None
             
         try:
-            # Get ALL traffic lights in the simulation
-            all_tls_ids = traci.trafficlight.getIDList()
-            
-            # Get detailed state for ALL traffic lights
-            traffic_lights = []
-            for tls_id in all_tls_ids:
-                current_phase = traci.trafficlight.getPhase(tls_id)
-                phase_duration = traci.trafficlight.getPhaseDuration(tls_id)
-                
-                # Get the actual signal state (GGrrrrGGrrrr etc)
-                signal_state = traci.trafficlight.getRedYellowGreenState(tls_id)
-                
-                # Get time until next switch
-                next_switch = traci.trafficlight.getNextSwitch(tls_id)
-                current_time = traci.simulation.getTime()
-                time_until_switch = max(0, next_switch - current_time)
-                
-                # Parse signal state to human readable
-                lights = []
-                for i, state in enumerate(signal_state):
-                    color = "unknown"
-                    if state in ['G', 'g']:
-                        color = "green"
-                    elif state in ['y', 'Y']:
-                        color = "yellow"
-                    elif state in ['r', 'R']:
-                        color = "red"
-                    elif state in ['o', 'O']:
-                        color = "off"
-                    
-                    lights.append({
-                        "index": i,
-                        "state": state,
-                        "color": color
-                    })
-                
-                traffic_lights.append({
-                    "id": tls_id,
-                    "current_phase": current_phase,
-                    "phase_duration": round(phase_duration, 1),
-                    "time_until_switch": round(time_until_switch, 1),
-                    "signal_state": signal_state,
-                    "lights": lights,
-                    "is_main": tls_id == self.tls_id  # Mark the main controlled TLS
-                })
-            
-            # Get vehicle metrics
-            vehicle_ids = traci.vehicle.getIDList()
-            vehicle_count = len(vehicle_ids)
-            
-            # Calculate average speed
-            if vehicle_count > 0:
-                speeds = [traci.vehicle.getSpeed(vid) for vid in vehicle_ids]
-                avg_speed = sum(speeds) / len(speeds)
-                max_speed = max(speeds)
-                min_speed = min(speeds)
-            else:
-                avg_speed = max_speed = min_speed = 0.0
-            
-            # Get lane metrics for MAIN TLS only
-            controlled_lanes = traci.trafficlight.getControlledLanes(self.tls_id)
-            
-            # Queue length (vehicles waiting)
-            queue_length = 0
-            waiting_time = 0.0
-            
-            for lane in set(controlled_lanes):  # Use set to avoid duplicates
-                queue_length += traci.lane.getLastStepHaltingNumber(lane)
-                waiting_time += traci.lane.getWaitingTime(lane)
-            
-            # Occupancy
-            total_occupancy = 0.0
-            for lane in set(controlled_lanes):
-                total_occupancy += traci.lane.getLastStepOccupancy(lane)
-            
-            avg_occupancy = total_occupancy / len(set(controlled_lanes)) if controlled_lanes else 0.0
-            
-            # Count loaded/departed/arrived vehicles
-            loaded_vehicles = traci.simulation.getLoadedNumber()
-            departed_vehicles = traci.simulation.getDepartedNumber()
-            arrived_vehicles = traci.simulation.getArrivedNumber()
-            
-            return {
-                'simulation_time': traci.simulation.getTime(),
-                'current_phase': traci.trafficlight.getPhase(self.tls_id),
-                'phase_duration': traci.trafficlight.getPhaseDuration(self.tls_id),
-                'vehicle_count': vehicle_count,
-                'avg_speed': round(avg_speed, 2),
-                'max_speed': round(max_speed, 2),
-                'min_speed': round(min_speed, 2),
-                'queue_length': queue_length,
-                'waiting_time': round(waiting_time, 2),
-                'avg_occupancy': round(avg_occupancy * 100, 2),
-                'loaded_vehicles': loaded_vehicles,
-                'departed_vehicles': departed_vehicles,
-                'arrived_vehicles': arrived_vehicles,
-                'traffic_lights': traffic_lights,
-                'total_traffic_lights': len(traffic_lights),
-                'controlled_lanes': len(set(controlled_lanes))
-            }
+            simulation = self.connection.simulation.getSubscriptionResults()
+            tls_results = self.connection.trafficlight.getAllSubscriptionResults()
+            lane_results = self.connection.lane.getAllSubscriptionResults()
+            vehicles = self.connection.junction.getContextSubscriptionResults(self._vehicle_anchor) or {}
+            
+            # ALL traffic lights
+            tls = np.empty(len(self._tls_ids), dtype=TLS_DTYPE)
+            rows = [tls_results[tls_id] for tls_id in self._tls_ids]
+            tls["phase"] = [row[tc.TL_CURRENT_PHASE] for row in rows]
+            tls["phase_duration"] = [row[tc.TL_PHASE_DURATION] for row in rows]
+            tls["next_switch"] = [row[tc.TL_NEXT_SWITCH] for row in rows]
+            tls["signal"] = [self._strings.intern(row[tc.TL_RED_YELLOW_GREEN_STATE]) for row in rows]
+            
+            # Lanes of the MAIN TLS only
+            lanes = np.empty(len(self._controlled_lanes), dtype=LANE_DTYPE)
+            rows = [lane_results[lane] for lane in self._controlled_lanes]
+            lanes["halting"] = [row[tc.LAST_STEP_VEHICLE_HALTING_NUMBER] for row in rows]
+            lanes["waiting_time"] = [row[tc.VAR_WAITING_TIME] for row in rows]
+            lanes["occupancy"] = [row[tc.LAST_STEP_OCCUPANCY] for row in rows]
+            
+            speeds = np.empty(len(vehicles), dtype=VEHICLE_DTYPE)
+            speeds["speed"] = [values[tc.VAR_SPEED] for values in vehicles.values()]
+            
+            return CompactState(
+                time=simulation[tc.VAR_TIME],
+                loaded=simulation[tc.VAR_LOADED_VEHICLES_NUMBER],
+                departed=simulation[tc.VAR_DEPARTED_VEHICLES_NUMBER],
+                arrived=simulation[tc.VAR_ARRIVED_VEHICLES_NUMBER],
+                main_tls=self._main_tls_index,
+                tls=Table(self._tls_ids, tls),
+                lanes=Table(self._controlled_lanes, lanes),
+                vehicles=Table(tuple(vehicles), speeds),
+                strings=self._strings
+            )
             
         except Exception as e:
             logger.error(f"Failed to get traffic state: {e}")
             return None
     
+    def get_traffic_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get current traffic state from SUMO - ALL TRAFFIC LIGHTS
+        
+        Returns:
+            Dictionary with traffic metrics including ALL traffic lights state
+            (get_compact_state() as a dict)
+        """
+        state = self.get_compact_state()
+        return state.to_dict() if state is not None else None
+    
     def set_phase(self, phase_index: int) -> bool:
         """
         Set traffic light phase with SAFE TRANSITION
@@ -392,15 +474,16 @@ class TraCIConnector:
             return False
             
         try:
-            current_phase = traci.trafficlight.getPhase(self.tls_id)
+            current_phase = self.connection.trafficlight.getPhase(self.tls_id)
             
             # Get all phases to understand the signal program
-            all_phases = traci.trafficlight.getAllProgramLogics(self.tls_id)
+            all_phases = self.connection.trafficlight.getAllProgramLogics(self.tls_id)
             
             if not all_phases:
                 # Fallback: direct phase change (not recommended)
                 logger.warning("No phase program found, setting phase directly")
-                traci.trafficlight.setPhase(self.tls_id, phase_index)
+                self.connection.trafficlight.setPhase(self.tls_id, phase_index)
+                self.refresh_traffic_light()
                 return True
             
             program = all_phases[0]  # Get first (usually only) program
@@ -441,20 +524,21 @@ class TraCIConnector:
                 if yellow_phase is not None:
                     logger.info(f"🟡 Safe transition: {current_phase} -> {yellow_phase} (yellow) -> {phase_index}")
                     # Step 1: Set to yellow
-                    traci.trafficlight.setPhase(self.tls_id, yellow_phase)
-                    traci.trafficlight.setPhaseDuration(self.tls_id, 3.0)  # 3 seconds yellow
+                    self.connection.trafficlight.setPhase(self.tls_id, yellow_phase)
+                    self.connection.trafficlight.setPhaseDuration(self.tls_id, 3.0)  # 3 seconds yellow
                     
                     # Note: The actual red phase will be set after yellow expires
                     # We set the next phase in the program
                     logger.info(f"⏳ Yellow light active for 3 seconds before switching to phase {phase_index}")
                 else:
                     logger.warning("⚠️ No yellow phase found in signal program - unsafe direct transition!")
-                    traci.trafficlight.setPhase(self.tls_id, phase_index)
+                    self.connection.trafficlight.setPhase(self.tls_id, phase_index)
             else:
                 # Safe transition - can change directly
                 logger.info(f"✅ Safe transition: {current_phase} -> {phase_index}")
-                traci.trafficlight.setPhase(self.tls_id, phase_index)
+                self.connection.trafficlight.setPhase(self.tls_id, phase_index)
             
+            self.refresh_traffic_light()
             return True
             
         except Exception as e:
@@ -465,24 +549,40 @@ class TraCIConnector:
         """Get current scenario information"""
         return {
             'connected': self.connected,
+            'label': self.label,
             'scenario': self.scenario,
             'tls_id': self.tls_id,
             'host': self.host,
             'port': self.port,
-            'description': self.SCENARIOS.get(self.scenario, {}).get('description', 'Unknown')
+            'description': self.SCENARIOS.get(self.scenario or '', {}).get('description', 'Unknown')
         }
     
+    def _close_connection(self) -> None:
+        """Close this connector's TraCI connection, including a stale one left under its label"""
+        conn, self.conn = self.conn, None
+        with _TRACI_POOL_LOCK:
+            if conn is None:
+                try:
+                    conn = traci.getConnection(self.label)
+                except traci.TraCIException:
+                    return
+            conn.close()
+    
     def close(self):
         """Close TraCI connection"""
         if self.connected:
             try:
-                traci.close()
-                logger.info("TraCI connection closed")
+                self._close_connection()
+                logger.info(f"TraCI connection '{self.label}' closed")
             except Exception:
                 pass
             
             self.connected = False
             self.scenario = None
             self.tls_id = None
+            self._tls_ids = ()
+            self._main_tls_index = -1
+            self._controlled_lanes = ()
+            self._vehicle_anchor = None
             self.host = None
             self.port = None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Bulk-import NDJSON or CSV files of entities into Orion-LD.
+
+Rows are validated against the Smart Data Models in app/models by a pool of
+worker processes and sent with chunked, concurrent batch upserts. Progress
+is checkpointed next to the file (<file>.checkpoint.json), so running the
+same command again after an interruption resumes where it stopped.
+
+Usage:
+    python scripts/import_entities.py air-quality data/air_quality_2025-01-01.csv
+    python scripts/import_entities.py devices devices.ndjson --workers 4
+    python scripts/import_entities.py road-segments roads.jsonl --restart
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path so we can import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.http_client import close_http_client  # noqa: E402
+from app.services.bulk_import import (  # noqa: E402
+    DATASETS,
+    ROW_FORMATS,
+    import_entities,
+)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Import NDJSON/CSV entities into Orion-LD"
+    )
+    parser.add_argument("dataset", choices=sorted(DATASETS), help="Entity dataset")
+    parser.add_argument("path", help="NDJSON (.ndjson/.jsonl) or CSV file")
+    parser.add_argument(
+        "--format", choices=ROW_FORMATS, help="Row format (default: from extension)"
+    )
+    parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: <path>.checkpoint.json)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore an existing checkpoint and import from the first row",
+    )
+    parser.add_argument("--workers", type=int, help="Validation processes (0 = inline)")
+    parser.add_argument("--window", type=int, help="Rows per upload window")
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Replace existing entities instead of updating their attributes",
+    )
+    args = parser.parse_args()
+
+    checkpoint = args.checkpoint or f"{args.path}.checkpoint.json"
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    service, model = DATASETS[args.dataset]
+    try:
+        report = await import_entities(
+            service,
+            model,
+            args.path,
+            row_format=args.format,
+            checkpoint_path=checkpoint,
+            window_rows=args.window,
+            workers=args.workers,
+            options="replace" if args.replace else "update",
+        )
+    finally:
+        await close_http_client()
+
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        print("Interrupted - run the same command again to resume")
+        sys.exit(130)
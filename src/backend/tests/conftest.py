@@ -0,0 +1,36 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Shared test fixtures.
+"""
+
+import httpx
+import pytest
+
+from app.services.base_service import BaseService
+
+
+@pytest.fixture
+def make_service():
+    """
+    Factory for BaseServices whose HTTP client is served by a handler.
+
+    Usage:
+        service = make_service(handler, entity_type="Device", coalesce_gets=False)
+
+    Keyword arguments other than `orion_url` are set as service attributes.
+    """
+
+    def factory(
+        handler, orion_url: str = "http://orion/ngsi-ld/v1", **attributes
+    ) -> BaseService:
+        service = BaseService(orion_url=orion_url)
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        for name, value in attributes.items():
+            setattr(service, name, value)
+        return service
+
+    return factory
@@ -0,0 +1,92 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for NumPy aggregation of environmental time series.
+"""
+
+import httpx
+import pytest
+
+from app.services.aggregation import SeriesAccumulator, aggregate_attribute
+
+OBSERVATIONS = [
+    {"id": "a", "pm25": 10.0, "dateObserved": "2025-11-15T08:05:00Z"},
+    {
+        "id": "b",
+        "pm25": {"type": "Property", "value": 20},
+        "dateObserved": "2025-11-15T08:40:00Z",
+    },
+    {"id": "c", "pm25": 30.0, "dateObserved": "2025-11-15T09:10:00Z"},
+    {"id": "d", "pm25": None, "dateObserved": "2025-11-15T09:20:00Z"},
+]
+
+
+class TestSeriesAccumulator:
+    """Test summaries and rollups over accumulated pages."""
+
+    def test_summary_and_hourly_buckets(self):
+        """Test statistics across pages and per hour, skipping missing values."""
+        acc = SeriesAccumulator("pm25", time_attribute="dateObserved")
+        acc.add_page(OBSERVATIONS[:2])
+        acc.add_page(OBSERVATIONS[2:])
+
+        summary = acc.summary([50])
+        assert summary["count"] == 3
+        assert (summary["min"], summary["max"], summary["mean"]) == (10, 30, 20)
+        assert summary["percentiles"] == {"p50": 20}
+        assert acc.skipped == 1
+
+        assert acc.buckets("hour") == [
+            {
+                "start": "2025-11-15T08:00:00Z",
+                "count": 2,
+                "min": 10,
+                "max": 20,
+                "mean": 15,
+            },
+            {
+                "start": "2025-11-15T09:00:00Z",
+                "count": 1,
+                "min": 30,
+                "max": 30,
+                "mean": 30,
+            },
+        ]
+
+    def test_no_pages_give_empty_rollups(self):
+        """Test that an empty range yields no buckets or groups, not an error."""
+        acc = SeriesAccumulator("pm25", time_attribute="dateObserved", group_by="id")
+
+        assert acc.summary() == {"count": 0}
+        assert acc.buckets("hour") == []
+        assert acc.groups() == []
+        with pytest.raises(ValueError):
+            SeriesAccumulator("pm25").buckets("hour")
+
+
+class TestAggregateAttribute:
+    """Test aggregation over a service's paged entities."""
+
+    @pytest.mark.asyncio
+    async def test_streams_projected_pages(self, make_service):
+        """Test that only the needed attributes are requested within the range."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=OBSERVATIONS)
+
+        service = make_service(handler, entity_type="AirQualityObserved")
+
+        result = await aggregate_attribute(
+            service, "pm25", "dateObserved", start_time="2025-11-15T00:00:00Z"
+        )
+
+        assert result["summary"]["count"] == 3
+        params = requests[0].url.params
+        assert params["pick"] == "id,type,pm25,dateObserved"
+        assert params["format"] == "simplified"
+        assert params["q"] == 'dateObserved>="2025-11-15T00:00:00Z"'
@@ -0,0 +1,106 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for chunked batch operations in BaseService.
+"""
+
+import json
+
+import httpx
+import pytest
+
+
+def entities(count: int):
+    return [
+        {"id": f"urn:ngsi-ld:Device:{i:03d}", "type": "Device"} for i in range(count)
+    ]
+
+
+class TestBatchChunking:
+    """Test splitting, merging and retrying of entityOperations requests."""
+
+    @pytest.mark.asyncio
+    async def test_small_batch_is_sent_in_one_request(self, make_service):
+        """Test that a batch within the chunk size keeps a single request."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content))
+            return httpx.Response(201, json=[e["id"] for e in calls[-1]])
+
+        service = make_service(handler, batch_retry_backoff=0)
+        response = await service.batch_create(entities(3))
+
+        assert len(calls) == 1
+        assert response.status_code == 201
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_large_batch_is_chunked_and_merged(self, make_service):
+        """Test that chunk responses are merged into one 207 result."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            chunk = json.loads(request.content)
+            calls.append(chunk)
+            ids = [e["id"] for e in chunk]
+            if "urn:ngsi-ld:Device:004" in ids:
+                return httpx.Response(
+                    207,
+                    json={
+                        "success": [i for i in ids if i != "urn:ngsi-ld:Device:004"],
+                        "errors": [
+                            {
+                                "entityId": "urn:ngsi-ld:Device:004",
+                                "error": {"title": "Already exists", "status": 409},
+                            }
+                        ],
+                    },
+                )
+            return httpx.Response(201, json=ids)
+
+        service = make_service(handler, batch_retry_backoff=0)
+        service.batch_chunk_size = 2
+        response = await service.batch_create(entities(5))
+
+        assert [len(chunk) for chunk in calls] == [2, 2, 1]
+        assert response.status_code == 207
+        body = response.json()
+        assert len(body["success"]) == 4
+        assert [e["entityId"] for e in body["errors"]] == ["urn:ngsi-ld:Device:004"]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_only_failed_ids_are_retried(self, make_service):
+        """Test that transient per-entity errors re-send only those entities."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            chunk = json.loads(request.content)
+            calls.append([e["id"] for e in chunk])
+            ids = calls[-1]
+            if len(calls) <= 2 and "urn:ngsi-ld:Device:001" in ids:
+                return httpx.Response(
+                    207,
+                    json={
+                        "success": [i for i in ids if i != "urn:ngsi-ld:Device:001"],
+                        "errors": [
+                            {
+                                "entityId": "urn:ngsi-ld:Device:001",
+                                "error": {"title": "Unavailable", "status": 503},
+                            }
+                        ],
+                    },
+                )
+            return httpx.Response(204)
+
+        service = make_service(handler, batch_retry_backoff=0)
+        service.batch_chunk_size = 2
+        response = await service.batch_update(entities(4))
+
+        assert calls[-1] == ["urn:ngsi-ld:Device:001"]
+        assert response.status_code == 204
+        await service.close()
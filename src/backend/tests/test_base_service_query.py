@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for query helpers in BaseService.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+TOTAL = 7
+
+
+def paged_handler(calls):
+    """Serve TOTAL Device entities honouring limit/offset/count."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        calls.append(dict(params))
+        offset, limit = int(params["offset"]), int(params["limit"])
+        page = [
+            {"id": f"urn:ngsi-ld:Device:{i}", "type": "Device"}
+            for i in range(offset, min(offset + limit, TOTAL))
+        ]
+        headers = {"NGSILD-Results-Count": str(TOTAL)} if "count" in params else {}
+        return httpx.Response(200, json=page, headers=headers)
+
+    return handler
+
+
+class TestIterEntities:
+    """Test the auto-paginating entity iterator."""
+
+    @pytest.mark.asyncio
+    async def test_walks_all_pages(self, make_service):
+        """Test that every entity is yielded and paging stops at the total."""
+        calls = []
+        service = make_service(paged_handler(calls), entity_type="Device")
+
+        ids = [e["id"] async for e in service.iter_all(page_size=3)]
+
+        assert ids == [f"urn:ngsi-ld:Device:{i}" for i in range(TOTAL)]
+        assert [c["offset"] for c in calls] == ["0", "3", "6"]
+        assert calls[0]["count"] == "true" and "count" not in calls[1]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_limit_caps_total_results(self, make_service):
+        """Test that 'limit' caps the yielded entities across pages."""
+        calls = []
+        service = make_service(paged_handler(calls), entity_type="Device")
+
+        ids = [e["id"] async for e in service.iter_all(page_size=3, limit=4)]
+
+        assert len(ids) == 4
+        assert [c["limit"] for c in calls] == ["3", "1"]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_requires_a_filter(self, make_service):
+        """Test that an unfiltered query is rejected before any request."""
+        service = make_service(paged_handler([]), entity_type="Device")
+
+        with pytest.raises(ValueError):
+            async for _ in service.iter_entities(limit=5):
+                pass
+        await service.close()
+
+
+class TestRequestCoalescing:
+    """Test single-flight deduplication of identical GET requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_gets_share_one_request(self, make_service):
+        """Test that concurrent identical GETs hit the broker once."""
+        calls = []
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(str(request.url))
+            await release.wait()
+            return httpx.Response(200, json=[{"id": "urn:ngsi-ld:Device:1"}])
+
+        service = make_service(handler, entity_type="Device")
+        service.entity_type = None
+        waiters = [
+            asyncio.ensure_future(service.query_entities(type="Sensor", limit=5))
+            for _ in range(5)
+        ]
+        other = asyncio.ensure_future(service.query_entities(type="Sensor", limit=6))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        results = await asyncio.gather(*waiters, other)
+
+        assert len(calls) == 2
+        assert all(r == results[0] for r in results)
+        await service.close()
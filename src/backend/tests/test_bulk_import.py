@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for NDJSON/CSV bulk imports with checkpoints.
+"""
+
+import json
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.AirQualityObserved import AirQualityObserved
+from app.services.bulk_import import COMPLETED, import_entities, row_to_entity
+
+CSV = """id,pm25,dateObserved,refDevice,location_lon,location_lat,address.addressLocality
+urn:ngsi-ld:AirQualityObserved:1,12.5,2025-01-01T10:00:00Z,urn:ngsi-ld:Device:7,106.7,10.8,Thu Duc
+urn:ngsi-ld:AirQualityObserved:2,not-a-number,2025-01-01T10:00:00Z,,,,
+urn:ngsi-ld:AirQualityObserved:3,8,2025-01-01T11:00:00Z,,,,
+,1,2025-01-01T11:00:00Z,,,,
+urn:ngsi-ld:AirQualityObserved:5,3,2025-01-01T12:00:00Z,,,,
+"""
+
+
+class TestBulkImport:
+    """Test row mapping, validation and resumable uploads."""
+
+    def test_rows_map_to_normalized_entities(self):
+        """Test that a flat CSV row becomes a validated NGSI-LD entity."""
+        entity = row_to_entity(
+            {
+                "id": "urn:ngsi-ld:AirQualityObserved:1",
+                "pm25": "12.5",
+                "dateObserved": "2025-01-01T10:00:00Z",
+                "refDevice": "urn:ngsi-ld:Device:7",
+                "location_lon": "106.7",
+                "location_lat": "10.8",
+                "no2": "",
+            },
+            AirQualityObserved,
+            "AirQualityObserved",
+        )
+        assert entity == {
+            "id": "urn:ngsi-ld:AirQualityObserved:1",
+            "type": "AirQualityObserved",
+            "pm25": {"type": "Property", "value": 12.5},
+            "dateObserved": {
+                "type": "Property",
+                "value": {"@type": "DateTime", "@value": "2025-01-01T10:00:00Z"},
+            },
+            "refDevice": {"type": "Relationship", "object": "urn:ngsi-ld:Device:7"},
+            "location": {
+                "type": "GeoProperty",
+                "value": {"type": "Point", "coordinates": [106.7, 10.8]},
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_interrupted_import_resumes(self, tmp_path, make_service):
+        """Test that a rerun after a broker outage continues after the checkpoint."""
+        source = tmp_path / "air.csv"
+        source.write_text(CSV)
+        checkpoint = str(tmp_path / "air.checkpoint.json")
+        uploads = []
+        outage = {"active": True}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            batch = json.loads(request.content)
+            if len(uploads) == 1 and outage["active"]:
+                outage["active"] = False
+                return httpx.Response(503, json={"title": "Unavailable"})
+            uploads.append([entity["id"][-1] for entity in batch])
+            return httpx.Response(204)
+
+        service = make_service(
+            handler, entity_type="AirQualityObserved", retry_max_attempts=0
+        )
+
+        run = dict(checkpoint_path=checkpoint, window_rows=2, workers=0)
+        with pytest.raises(httpx.HTTPStatusError):
+            await import_entities(service, AirQualityObserved, str(source), **run)
+        report = await import_entities(service, AirQualityObserved, str(source), **run)
+
+        assert uploads == [["1"], ["3"], ["5"]]
+        assert report.status == COMPLETED
+        assert report.resumed_from == 2
+        assert (report.rows_done, report.imported, report.invalid) == (5, 3, 2)
+        assert [error["row"] for error in report.errors] == [2, 4]
+
+    def test_oversized_upload_is_rejected(self, tmp_path, monkeypatch):
+        """Test that an upload over the size cap gets 413 and leaves no file."""
+        monkeypatch.setattr("app.core.config.settings.import_directory", str(tmp_path))
+        monkeypatch.setattr("app.core.config.settings.import_max_upload_bytes", 10)
+
+        def chunks():
+            yield CSV.encode()
+
+        response = TestClient(app).post(
+            "/api/v1/imports/air-quality?format=csv", content=chunks()
+        )
+
+        assert response.status_code == 413
+        assert os.listdir(tmp_path) == []
+
+    def test_resuming_an_unknown_entity_type_is_not_found(self, tmp_path, monkeypatch):
+        """Test that a checkpoint of a type no dataset imports gives 404."""
+        monkeypatch.setattr("app.core.config.settings.import_directory", str(tmp_path))
+        (tmp_path / "abc.checkpoint.json").write_text(
+            json.dumps({"format": "csv", "report": {"entityType": "Unknown"}})
+        )
+
+        response = TestClient(app).post("/api/v1/imports/abc/resume")
+
+        assert response.status_code == 404
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for request retries and the per-endpoint circuit breaker.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.circuit_breaker import (
+    CircuitOpenError,
+    circuit_breakers,
+    get_circuit_breaker,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    circuit_breakers.clear()
+    yield
+    circuit_breakers.clear()
+
+
+class TestRetryPolicy:
+    """Test which failures are retried and how long to wait."""
+
+    @pytest.mark.asyncio
+    async def test_get_is_retried_until_success(self, make_service):
+        """Test that a GET survives transient 503s and honors Retry-After."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            if len(calls) < 3:
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"id": "urn:ngsi-ld:Device:001"})
+
+        service = make_service(handler, retry_backoff_base=0)
+        service.coalesce_gets = False
+        response = await service._make_request("GET", "entities/x")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_on_5xx(self, make_service):
+        """Test that non-idempotent requests fail after a single attempt."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            return httpx.Response(503)
+
+        service = make_service(handler, retry_backoff_base=0)
+        with pytest.raises(httpx.HTTPStatusError):
+            await service._make_request("POST", "entities", json_payload={})
+
+        assert len(calls) == 1
+        await service.close()
+
+
+class TestCircuitBreaker:
+    """Test opening, failing fast and exposing breaker state."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, make_service):
+        """Test that an unhealthy endpoint is not contacted while open."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            raise httpx.ConnectError("refused", request=request)
+
+        service = make_service(handler, retry_backoff_base=0)
+        service.retry_max_attempts = 0
+        for _ in range(5):
+            with pytest.raises(httpx.ConnectError):
+                await service._make_request("POST", "entities", json_payload={})
+
+        with pytest.raises(CircuitOpenError):
+            await service._make_request("POST", "entities", json_payload={})
+
+        assert len(calls) == 5
+        state = circuit_breakers["http://orion/ngsi-ld/v1/entities"].snapshot()
+        assert state["state"] == "open"
+        assert state["rejected"] == 1
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_releases_half_open_circuit(self, make_service):
+        """Test that a cancelled half-open trial reopens the circuit for a new trial."""
+        started = asyncio.Event()
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            started.set()
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={})
+
+        service = make_service(hang, retry_max_attempts=0)
+        breaker = get_circuit_breaker("http://orion/ngsi-ld/v1/entities")
+        breaker.state, breaker.opened_at = "open", 0.0  # Reset timeout elapsed
+
+        trial = asyncio.create_task(
+            service._make_request("POST", "entities", json_payload={})
+        )
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        assert breaker.snapshot()["state"] == "open"
+        breaker.opened_at = 0.0
+        breaker.before_request()  # The next trial is let through
+        assert breaker.state == "half_open"
+        await service.close()
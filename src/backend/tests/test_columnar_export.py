@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for flattening entities into typed columns and Parquet/Arrow export.
+"""
+
+import io
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.models.AirQualityObserved import AirQualityObserved
+from app.services.columnar_export import ColumnBuffer, column_kinds, export_columnar
+
+NORMALIZED = {
+    "id": "urn:ngsi-ld:AirQualityObserved:1",
+    "type": "AirQualityObserved",
+    "pm25": {"type": "Property", "value": 12},
+    "dateObserved": {
+        "type": "Property",
+        "value": {"@type": "DateTime", "@value": "2025-01-01T10:00:00Z"},
+    },
+    "refDevice": {"type": "Relationship", "object": "urn:ngsi-ld:Device:7"},
+    "location": {
+        "type": "GeoProperty",
+        "value": {"type": "Point", "coordinates": [106.7, 10.8]},
+    },
+}
+SIMPLIFIED = {
+    "id": "urn:ngsi-ld:AirQualityObserved:2",
+    "type": "AirQualityObserved",
+    "pm25": "n/a",
+    "dateObserved": "2025-01-01T12:00:00+02:00",
+    "address": {"addressLocality": "Ho Chi Minh"},
+}
+
+
+class TestColumnarExport:
+    """Test typed flattening and streaming Parquet/Arrow writers."""
+
+    def test_entities_flatten_into_typed_columns(self):
+        """Test Property, Relationship and GeoProperty flattening and nulls."""
+        kinds = column_kinds(AirQualityObserved)
+        assert kinds["pm25"] == "float"
+        assert kinds["dateObserved"] == "timestamp"
+
+        buffer = ColumnBuffer(kinds)
+        buffer.extend([NORMALIZED, SIMPLIFIED])
+        columns = buffer.take()
+
+        assert columns["pm25"] == [12.0, None]
+        assert columns["dateObserved"] == [
+            datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+            datetime(2025, 1, 1, 10, tzinfo=timezone.utc),
+        ]
+        assert columns["refDevice"] == ["urn:ngsi-ld:Device:7", None]
+        assert columns["location_lon"] == [106.7, None]
+        assert columns["address"] == [None, '{"addressLocality":"Ho Chi Minh"}']
+        assert buffer.rows == 0
+
+    @pytest.mark.asyncio
+    async def test_parquet_round_trip(self, make_service):
+        """Test that pages are written as row groups readable by pyarrow."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=[NORMALIZED, SIMPLIFIED])
+
+        service = make_service(handler, entity_type="AirQualityObserved")
+
+        chunks = [
+            chunk
+            async for chunk in export_columnar(
+                service, AirQualityObserved, columns=["pm25", "location"]
+            )
+        ]
+        table = pq.read_table(io.BytesIO(b"".join(chunks)))
+
+        assert table.column_names == [
+            "id",
+            "type",
+            "pm25",
+            "location",
+            "location_lon",
+            "location_lat",
+        ]
+        assert table.column("pm25").to_pylist() == [12.0, None]
@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the compact traffic state and its binary delta encoding.
+"""
+
+import numpy as np
+import pytest
+
+from app.sumo_rl.agents.compact_state import (
+    LANE_DTYPE,
+    TLS_DTYPE,
+    VEHICLE_DTYPE,
+    CompactState,
+    DeltaDecoder,
+    DeltaEncoder,
+    StringTable,
+    Table,
+    decode_stream,
+    encode_stream,
+)
+
+TLS_IDS = tuple(f"tls{i}" for i in range(50))
+LANE_IDS = ("l1", "l2")
+
+
+def make_state(strings, time, speeds, phase=0):
+    tls = np.zeros(len(TLS_IDS), dtype=TLS_DTYPE)
+    tls["phase"] = phase
+    tls["phase_duration"] = 30.0
+    tls["next_switch"] = 50.0
+    tls["signal"] = strings.intern("GGrr" if phase == 0 else "rrGG")
+    lanes = np.zeros(len(LANE_IDS), dtype=LANE_DTYPE)
+    lanes["halting"] = [3, 1]
+    vehicles = np.empty(len(speeds), dtype=VEHICLE_DTYPE)
+    vehicles["speed"] = list(speeds.values())
+    return CompactState(
+        time,
+        len(speeds),
+        len(speeds),
+        0,
+        0,
+        Table(TLS_IDS, tls),
+        Table(LANE_IDS, lanes),
+        Table(tuple(speeds), vehicles),
+        strings,
+    )
+
+
+class TestCompactState:
+    """Test that the compact state encodes changes only and decodes losslessly."""
+
+    def test_to_dict(self):
+        """Test the dictionary keeps the get_traffic_state() layout."""
+        state = make_state(StringTable(), 42.0, {"v1": 10.0, "v2": 4.0})
+
+        data = state.to_dict()
+        assert (data["simulation_time"], data["current_phase"]) == (42.0, 0)
+        assert (data["vehicle_count"], data["avg_speed"]) == (2, 7.0)
+        assert (data["queue_length"], data["controlled_lanes"]) == (4, 2)
+        main, other = data["traffic_lights"][:2]
+        assert main["is_main"] and not other["is_main"]
+        assert main["time_until_switch"] == 8.0
+        assert main["lights"][2] == {"index": 2, "state": "r", "color": "red"}
+
+    def test_delta_round_trip(self):
+        """Test that deltas carry changes only and rebuild every state."""
+        strings = StringTable()
+        states = [
+            make_state(strings, 1.0, {"v1": 10.0, "v2": 4.0}),
+            make_state(strings, 2.0, {"v1": 10.0, "v2": 5.0}),
+            make_state(strings, 3.0, {"v2": 5.0, "v3": 1.0}, phase=1),
+        ]
+        encoder = DeltaEncoder(keyframe_interval=0)
+        frames = [encoder.encode(state) for state in states]
+        # One changed speed instead of 50 traffic lights, 2 lanes, 2 vehicles
+        assert len(frames[1]) < len(frames[0]) / 4
+
+        decoded = list(decode_stream(encode_stream(states)))
+        for original, state in zip(states, decoded):
+            assert state.to_dict() == original.to_dict()
+            assert sorted(state.vehicles.ids) == sorted(original.vehicles.ids)
+
+        decoder = DeltaDecoder()
+        with pytest.raises(ValueError):
+            decoder.decode(frames[1])  # Must start at a keyframe
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for ETag/Last-Modified revalidation of entity read routes.
+"""
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.api.responses import etag_matches
+from app.main import app
+from app.services.building_service import building_service
+from app.services.entity_cache import EntityCache
+
+
+class TestConditionalGet:
+    """Test that unchanged entities are answered with 304 Not Modified."""
+
+    def test_etag_matching(self):
+        """Test weak comparison, lists and the wildcard."""
+        assert etag_matches('W/"a", "b"', '"b"')
+        assert etag_matches('W/"a"', '"a"')
+        assert etag_matches("*", '"a"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"a"')
+
+    def test_revalidation_is_served_from_cache(self, monkeypatch):
+        """Test that a matching If-None-Match costs no broker request or body."""
+        entity_id = "urn:ngsi-ld:Building:001"
+        body = (
+            b'{"id":"urn:ngsi-ld:Building:001","type":"Building",'
+            b'"modifiedAt":"2025-03-01T10:00:00.000Z"}'
+        )
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=body)
+
+        monkeypatch.setattr(
+            building_service,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(
+            building_service, "cache", EntityCache(ttls={"Building": 60})
+        )
+        client = TestClient(app)
+        url = f"/api/v1/buildings/{entity_id}?options=sysAttrs"
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        second = client.get(url, headers={"If-None-Match": etag})
+        since = client.get(
+            url, headers={"If-Modified-Since": first.headers["Last-Modified"]}
+        )
+
+        assert first.status_code == 200
+        assert first.content == body
+        assert first.headers["Last-Modified"] == "Sat, 01 Mar 2025 10:00:00 GMT"
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+        assert since.status_code == 304
+        assert len(requests) == 1
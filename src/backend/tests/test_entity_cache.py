@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the in-process entity cache.
+"""
+
+from app.services.entity_cache import EntityCache, entity_type_from_id, make_cache_key
+
+
+class TestEntityCache:
+    """Test TTL, LRU eviction and invalidation of EntityCache."""
+
+    def test_entity_type_from_urn(self):
+        """Test extracting the entity type from an NGSI-LD URN."""
+        assert entity_type_from_id("urn:ngsi-ld:Building:001") == "Building"
+        assert entity_type_from_id("not-a-urn") is None
+
+    def test_types_without_ttl_are_not_cached(self):
+        """Test that only entity types with a positive TTL are stored."""
+        cache = EntityCache(ttls={"Building": 60})
+        cache.set(make_cache_key("query", params={"type": "Device"}), [], "Device")
+        assert cache.stats()["entries"] == 0
+
+    def test_returned_values_are_copies(self):
+        """Test that mutating a cache hit does not corrupt the cached entry."""
+        cache = EntityCache(ttls={"Building": 60})
+        key = make_cache_key("entity", "urn:ngsi-ld:Building:001")
+        cache.set(key, {"name": "A"}, "Building", "urn:ngsi-ld:Building:001")
+
+        hit = cache.get(key)
+        hit["name"] = "B"
+
+        assert cache.get(key) == {"name": "A"}
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = EntityCache(max_entries=2, ttls={"Building": 60})
+        keys = [make_cache_key("query", params={"q": i}) for i in range(3)]
+        cache.set(keys[0], [0], "Building")
+        cache.set(keys[1], [1], "Building")
+        cache.get(keys[0])
+        cache.set(keys[2], [2], "Building")
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == [0]
+
+    def test_notification_invalidates_entity_and_type_queries(self):
+        """Test that a notification drops the entity and queries over its type."""
+        cache = EntityCache(ttls={"Building": 60, "RoadSegment": 60})
+        entity_key = make_cache_key("entity", "urn:ngsi-ld:Building:001")
+        building_query = make_cache_key("query", params={"type": "Building"})
+        road_query = make_cache_key("query", params={"type": "RoadSegment"})
+        cache.set(entity_key, {}, "Building", "urn:ngsi-ld:Building:001")
+        cache.set(building_query, [], "Building")
+        cache.set(road_query, [], "RoadSegment")
+
+        cache.handle_notification(
+            {"data": [{"id": "urn:ngsi-ld:Building:001", "type": "Building"}]}
+        )
+
+        assert cache.get(entity_key) is None
+        assert cache.get(building_query) is None
+        assert cache.get(road_query) == []
+
+    def test_read_in_flight_during_write_is_not_stored(self):
+        """Test that a value fetched before an invalidation is not cached after it."""
+        cache = EntityCache(ttls={"Building": 60})
+        entity_id = "urn:ngsi-ld:Building:001"
+        key = make_cache_key("entity", entity_id)
+
+        generation = cache.generation("Building")
+        cache.invalidate_entity(entity_id)  # A write lands mid-read
+        cache.set(key, {"name": "old"}, "Building", entity_id, generation)
+        assert cache.get(key) is None
+
+        cache.set(key, {"name": "new"}, "Building", entity_id, cache.generation(None))
+        assert cache.get(key) == {"name": "new"}
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for concurrent composite queries.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.base_service import BaseService
+from app.services.fanout import ERROR, OK, TIMEOUT, UNAVAILABLE, QueryPart, fan_out
+
+
+class TestFanOut:
+    """Test bounded concurrency, deadlines and partial results."""
+
+    @pytest.mark.asyncio
+    async def test_partial_results_with_part_status(self, make_service):
+        """Test that slow and failing parts do not hold back the others."""
+        in_flight = 0
+        peak = 0
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.2 if request.url.params["type"] == "Device" else 0.05)
+            in_flight -= 1
+            return httpx.Response(200, json=[{"id": "urn:ngsi-ld:X:1"}])
+
+        def down(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        def broken(request: httpx.Request) -> httpx.Response:
+            raise RuntimeError("bug")
+
+        def service(entity_type: str, handler) -> BaseService:
+            # One broker URL per type: each gets its own circuit breaker
+            return make_service(
+                handler,
+                orion_url=f"http://orion-{entity_type.lower()}/ngsi-ld/v1",
+                entity_type=entity_type,
+                retry_max_attempts=0,
+            )
+
+        parts = [
+            QueryPart("air", service("AirQualityObserved", slow)),
+            QueryPart("flow", service("TrafficFlowObserved", slow)),
+            QueryPart("devices", service("Device", slow), timeout=0.1),
+            QueryPart("impact", service("TrafficEnvironmentImpact", down)),
+            QueryPart("buildings", service("Building", broken)),
+        ]
+        result = await fan_out(parts, max_concurrency=2, timeout=1.0)
+
+        statuses = {name: part["status"] for name, part in result["parts"].items()}
+        assert statuses == {
+            "air": OK,
+            "flow": OK,
+            "devices": TIMEOUT,
+            "impact": UNAVAILABLE,
+            "buildings": ERROR,
+        }
+        assert result["parts"]["air"]["data"] == [{"id": "urn:ngsi-ld:X:1"}]
+        assert result["complete"] is False
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_includes_waiting_for_a_slot(self, make_service):
+        """Test that a part queued behind a slow one times out on schedule."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.3 if request.url.params["type"] == "Slow" else 0)
+            return httpx.Response(200, json=[])
+
+        slow = make_service(handler, entity_type="Slow")
+        fast = make_service(handler, entity_type="Fast")
+
+        result = await fan_out(
+            [QueryPart("slow", slow), QueryPart("fast", fast, timeout=0.1)],
+            max_concurrency=1,
+            timeout=1.0,
+        )
+
+        assert result["parts"]["slow"]["status"] == OK
+        assert result["parts"]["fast"]["status"] == TIMEOUT
+        assert result["parts"]["fast"]["elapsed_ms"] < 250
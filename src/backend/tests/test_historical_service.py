@@ -0,0 +1,145 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for historical queries served by the in-memory QuantumLeap stand-in.
+"""
+
+import pytest
+
+from app.services import carbon_footprint_service as carbon_module
+from app.services.historical_service import InMemoryQuantumLeap, QuantumLeapService
+
+
+def footprint(entity_id: str, co2: float, emitted_at: str):
+    return {
+        "id": entity_id,
+        "type": "CarbonFootprint",
+        "CO2eq": {"type": "Property", "value": co2, "observedAt": emitted_at},
+        "emissionDate": {"type": "Property", "value": emitted_at},
+        "refDevice": {"type": "Relationship", "object": "urn:ngsi-ld:Device:1"},
+        "location": {
+            "type": "GeoProperty",
+            "value": {"type": "Point", "coordinates": [106.7, 10.8]},
+        },
+    }
+
+
+def broker_count(monkeypatch, count: int) -> list:
+    """Let the broker report `count` CarbonFootprints; returns the queries."""
+    service = carbon_module.carbon_footprint_service
+    queries = []
+
+    async def query_entities(**params):
+        assert params["count"] is True
+        return count
+
+    async def get_all(**params):
+        queries.append(params["q"])
+        return [{"id": "urn:ngsi-ld:CarbonFootprint:2"}]
+
+    monkeypatch.setattr(service, "query_entities", query_entities)
+    monkeypatch.setattr(service, "get_all", get_all)
+    return queries
+
+
+@pytest.fixture
+def history():
+    store = InMemoryQuantumLeap()
+    store.ingest(
+        [
+            footprint("urn:ngsi-ld:CarbonFootprint:1", 10.0, "2025-11-15T08:10:00Z"),
+            footprint("urn:ngsi-ld:CarbonFootprint:1", 20.0, "2025-11-15T08:40:00Z"),
+            footprint("urn:ngsi-ld:CarbonFootprint:1", 60.0, "2025-11-15T09:05:00Z"),
+        ]
+    )
+    return QuantumLeapService(store=store)
+
+
+class TestHistoricalService:
+    """Test time-range and aggregation queries."""
+
+    @pytest.mark.asyncio
+    async def test_history_in_time_range(self, history):
+        """Test that versions in the range come back oldest first."""
+        records = await history.get_history(
+            "CarbonFootprint", from_date="2025-11-15T08:30:00Z"
+        )
+
+        assert [r["CO2eq"] for r in records] == [20.0, 60.0]
+        assert records[0]["observedAt"] == "2025-11-15T08:40:00Z"
+
+    @pytest.mark.asyncio
+    async def test_hourly_average(self, history):
+        """Test aggrMethod/aggrPeriod bucketing."""
+        series = await history.aggregate("CarbonFootprint", "CO2eq", "avg", "hour")
+
+        assert series[0]["index"] == [
+            "2025-11-15T08:00:00.000Z",
+            "2025-11-15T09:00:00.000Z",
+        ]
+        assert series[0]["values"] == [15.0, 60.0]
+
+    @pytest.mark.asyncio
+    async def test_get_recent_uses_history(self, history, monkeypatch):
+        """Test that get_recent reads the latest version, filtered on emissionDate."""
+        monkeypatch.setattr(carbon_module, "historical_service", history)
+        queries = broker_count(monkeypatch, 1)
+        service = carbon_module.carbon_footprint_service
+
+        recent = await service.get_recent(
+            since="2025-11-15T09:00:00Z", format="simplified", pick="id,CO2eq"
+        )
+        normalized = await service.get_recent(since="2025-11-15T09:00:00Z")
+
+        assert recent == [
+            {
+                "id": "urn:ngsi-ld:CarbonFootprint:1",
+                "type": "CarbonFootprint",
+                "CO2eq": 60.0,
+            }
+        ]
+        # Same shape as the broker's entities
+        assert "observedAt" not in normalized[0]
+        assert normalized[0]["CO2eq"] == {"type": "Property", "value": 60.0}
+        assert normalized[0]["refDevice"] == {
+            "type": "Relationship",
+            "object": "urn:ngsi-ld:Device:1",
+        }
+        assert normalized[0]["location"]["type"] == "GeoProperty"
+        assert queries == []
+
+    @pytest.mark.asyncio
+    async def test_get_recent_falls_back_without_history(self, monkeypatch):
+        """Test that an empty QuantumLeap (no subscription yet) scans the broker."""
+        service = carbon_module.carbon_footprint_service
+        empty = QuantumLeapService(store=InMemoryQuantumLeap())
+        monkeypatch.setattr(carbon_module, "historical_service", empty)
+        queries = broker_count(monkeypatch, 1)
+
+        recent = await service.get_recent(since="2025-11-15T09:00:00Z")
+
+        assert recent == [{"id": "urn:ngsi-ld:CarbonFootprint:2"}]
+        assert queries == ["emissionDate>'2025-11-15T09:00:00Z'"]
+
+    @pytest.mark.asyncio
+    async def test_history_that_cannot_answer_is_not_used(self, history, monkeypatch):
+        """Test partial, truncated and unbounded reads are left to the broker."""
+        since = [("emissionDate", ">", "2025-11-15T09:00:00Z")]
+
+        # The broker knows an entity QuantumLeap never recorded
+        assert await history.get_current("CarbonFootprint", since) is not None
+        assert (
+            await history.get_current("CarbonFootprint", since, expected_entities=2)
+            is None
+        )
+        # Without a lower bound the whole history would be read
+        until = [("emissionDate", "<", "2025-11-15T09:00:00Z")]
+        assert await history.get_current("CarbonFootprint", until) is None
+        # More versions in range than may be fetched: the latest may be missing
+        monkeypatch.setattr(
+            "app.services.historical_service.settings.history_max_records", 1
+        )
+        assert await history.get_current("CarbonFootprint", since) is None
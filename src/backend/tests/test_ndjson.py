@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for NDJSON streaming of list routes and response compression.
+"""
+
+import gzip
+import json
+
+import httpx
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, negotiate_encoding
+from app.main import app
+from app.services.road_segment_service import road_segment_service
+
+
+def road(number: int) -> dict:
+    return {"id": f"urn:ngsi-ld:RoadSegment:{number}", "type": "RoadSegment"}
+
+
+class TestNdjsonStreaming:
+    """Test opt-in NDJSON and negotiated compression on list routes."""
+
+    def test_pages_are_streamed_one_entity_per_line(self, monkeypatch):
+        """Test that every page is walked and the stream is gzip-compressed."""
+        monkeypatch.setattr("app.services.base_service.settings.orion_page_size", 2)
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            offset = int(request.url.params["offset"])
+            page = [road(n) for n in range(offset, min(offset + 2, 3))]
+            return httpx.Response(200, json=page, headers={"NGSILD-Results-Count": "3"})
+
+        monkeypatch.setattr(
+            road_segment_service,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        response = TestClient(app).get(
+            "/api/v1/road-segments/?q=roadClass==MAJOR_CITY_ROAD",
+            headers={
+                "Accept": "application/x-ndjson",
+                "Accept-Encoding": "gzip;q=0.8, unknown",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"][-1] for line in lines] == ["0", "1", "2"]
+        assert len(requests) == 2
+        if negotiate_encoding("gzip") == "gzip":
+            assert response.headers["content-encoding"] == "gzip"
+
+    def test_encoded_relays_and_small_bodies_are_not_recompressed(self, monkeypatch):
+        """Test that a broker body relayed still gzip-encoded passes through."""
+        body = json.dumps([road(n) for n in range(100)]).encode()
+        encoded = gzip.compress(body)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                content=encoded,
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Encoding": "gzip",
+                },
+            )
+
+        monkeypatch.setattr(
+            road_segment_service,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        client = TestClient(app)
+        relayed = client.get(
+            "/api/v1/road-segments/", headers={"Accept-Encoding": "gzip"}
+        )
+        small = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert relayed.headers["content-encoding"] == "gzip"
+        assert relayed.json()[99]["id"] == "urn:ngsi-ld:RoadSegment:99"
+        assert "content-encoding" not in small.headers
+        assert negotiate_encoding("gzip;q=0") is None
+
+    def test_compressed_response_has_weak_etag(self):
+        """Test that a compressed body does not keep the identity's strong ETag."""
+        body = json.dumps([road(n) for n in range(100)]).encode()
+        api = FastAPI()
+        api.add_middleware(CompressionMiddleware, minimum_size=10)
+
+        @api.get("/entity")
+        def entity():
+            return Response(body, headers={"ETag": '"abc"'})
+
+        client = TestClient(api)
+        compressed = client.get("/entity", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/entity", headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == 'W/"abc"'
+        assert compressed.content == body
+        assert identity.headers["etag"] == '"abc"'
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for streaming pass-through of GET list routes.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.road_segment_service import road_segment_service
+from app.services.spatial_index import SpatialIndex, spatial_indexes
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Upstream body delivered in chunks, like a network response."""
+
+    def __init__(self, *chunks: bytes):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestPassThrough:
+    """Test that list routes relay Orion's body and headers unchanged."""
+
+    def test_road_segments_are_relayed(self, monkeypatch):
+        """Test that the body bytes and NGSILD-Results-Count reach the client."""
+        body = b'[{"id":"urn:ngsi-ld:RoadSegment:001","type":"RoadSegment"}]'
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                stream=ChunkedStream(body[:20], body[20:]),
+                headers={
+                    "Content-Type": "application/json",
+                    "NGSILD-Results-Count": "42",
+                },
+            )
+
+        monkeypatch.setattr(
+            road_segment_service,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        response = TestClient(app).get("/api/v1/road-segments/?limit=1")
+
+        assert response.status_code == 200
+        assert response.content == body
+        assert response.headers["NGSILD-Results-Count"] == "42"
+        assert requests[0].url.params["type"] == "RoadSegment"
+        assert requests[0].url.params["limit"] == "1"
+
+    def test_indexed_geo_query_is_not_sent_to_the_broker(self, monkeypatch):
+        """Test that a list GET the spatial index can answer stays local."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=[])
+
+        index = SpatialIndex("RoadSegment")
+        index.upsert(
+            {
+                "id": "urn:ngsi-ld:RoadSegment:001",
+                "type": "RoadSegment",
+                "location": {
+                    "type": "GeoProperty",
+                    "value": {"type": "Point", "coordinates": [106.7, 10.8]},
+                },
+            }
+        )
+        index.ready = True
+        monkeypatch.setitem(spatial_indexes, "RoadSegment", index)
+        monkeypatch.setattr(
+            road_segment_service,
+            "_client",
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+        response = TestClient(app).get(
+            "/api/v1/road-segments/",
+            params={
+                "georel": "near;maxDistance==500",
+                "geometry": "Point",
+                "coordinates": "[106.701,10.8]",
+            },
+        )
+
+        assert response.status_code == 200
+        assert [e["id"] for e in response.json()] == ["urn:ngsi-ld:RoadSegment:001"]
+        assert requests == []
+
+    @pytest.mark.asyncio
+    async def test_identical_list_gets_are_coalesced(self, make_service):
+        """Test that concurrent identical list GETs share one broker request."""
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, stream=ChunkedStream(b'[{"id":"x"}]'))
+
+        service = make_service(handler, entity_type="AirQualityObserved")
+        first, second = await asyncio.gather(
+            service.stream_entities(type="AirQualityObserved", limit=5),
+            service.stream_entities(type="AirQualityObserved", limit=5),
+        )
+        assert first is second
+        assert len(requests) == 1
+
+        service.coalesce_gets = False
+        streamed = await service.stream_entities(type="AirQualityObserved")
+        assert not streamed.is_stream_consumed
+        await streamed.aclose()
+        await service.close()
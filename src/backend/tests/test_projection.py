@@ -0,0 +1,59 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for declared-field projections pushed down to Orion-LD.
+"""
+
+import httpx
+import pytest
+
+from app.services.projection import Projection
+
+
+class TestProjection:
+    """Test pick/format pushdown and typed records."""
+
+    def test_explicit_parameters_win(self):
+        """Test that a caller's own pick or format is kept."""
+        projection = Projection("pm25", "id", "no2")
+        assert projection.apply({"type": "AirQualityObserved"}) == {
+            "type": "AirQualityObserved",
+            "pick": "id,type,pm25,no2",
+            "format": "simplified",
+        }
+        assert projection.apply({"pick": "id,pm10", "options": "sysAttrs"}) == {
+            "pick": "id,pm10",
+            "options": "sysAttrs",
+        }
+
+    @pytest.mark.asyncio
+    async def test_select_returns_records(self, make_service):
+        """Test that select() sends the projection and builds named tuples."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                json=[
+                    {
+                        "id": "urn:ngsi-ld:Device:1",
+                        "type": "Device",
+                        "batteryLevel": 0.4,
+                    },
+                    {"id": "urn:ngsi-ld:Device:2", "type": "Device"},
+                ],
+            )
+
+        service = make_service(handler, entity_type="Device")
+
+        records = await service.select("batteryLevel,deviceState", limit=2)
+
+        params = requests[0].url.params
+        assert params["pick"] == "id,type,batteryLevel,deviceState"
+        assert params["format"] == "simplified"
+        assert records[0].batteryLevel == 0.4
+        assert records[1].deviceState is None
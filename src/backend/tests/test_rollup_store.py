@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the per-intersection traffic KPI rollups.
+"""
+
+from app.services.rollup_store import RollupStore
+
+NOTIFICATION = [
+    {
+        "id": "urn:ngsi-ld:TrafficFlowObserved:Nga4ThuDuc",
+        "type": "TrafficFlowObserved",
+        "queues": {"type": "Property", "value": [3, 5]},
+        "avgSpeed": {"type": "Property", "value": 8.0},
+        "dateObservedTo": {"type": "Property", "value": "2025-11-17T10:01:00Z"},
+    },
+    {
+        "id": "urn:ngsi-ld:TrafficFlowObserved:Nga4ThuDuc",
+        "type": "TrafficFlowObserved",
+        "queues": [2, 0],
+        "avgSpeed": 12.0,
+        "dateObservedTo": "2025-11-17T10:03:00Z",
+    },
+    {
+        "id": "urn:ngsi-ld:TrafficEnvironmentImpact:001",
+        "type": "TrafficEnvironmentImpact",
+        "co2": {"type": "Property", "value": 125.5},
+        "traffic": [
+            {
+                "type": "Property",
+                "value": {
+                    "refTrafficFlowObserved": "urn:ngsi-ld:TrafficFlowObserved:Nga4ThuDuc"
+                },
+            }
+        ],
+        "dateObservedTo": "2025-11-17T10:07:00Z",
+    },
+]
+
+
+class TestRollupStore:
+    """Test incremental bucketing and memory-mapped persistence."""
+
+    def test_buckets_and_summary(self):
+        """Test per-bucket KPIs and impacts joined to their flow's intersection."""
+        store = RollupStore(bucket_seconds=300, num_buckets=12)
+        assert store.ingest(NOTIFICATION) == 3
+
+        first, second = store.series("Nga4ThuDuc")
+        assert first["start"] == "2025-11-17T10:00:00.000Z"
+        assert first["queueLength"] == {"count": 2, "mean": 5.0, "min": 2.0, "max": 8.0}
+        assert first["avgSpeed"]["mean"] == 10.0
+        assert first["co2"] is None
+        assert second["co2"]["max"] == 125.5
+
+        summary = store.summary("Nga4ThuDuc", metrics=["queueLength", "co2"])
+        assert summary["buckets"] == 2
+        assert summary["queueLength"]["count"] == 2
+        assert summary["co2"]["count"] == 1
+        assert store.summary("unknown") is None
+
+    def test_ring_overwrites_old_buckets(self):
+        """Test that a bucket slot is reused once the ring wraps around."""
+        store = RollupStore(bucket_seconds=60, num_buckets=2)
+        store.ingest(NOTIFICATION[:1])  # 10:01
+        store.ingest([dict(NOTIFICATION[1], dateObservedTo="2025-11-17T10:03:00Z")])
+
+        buckets = store.series("Nga4ThuDuc")
+        assert [b["start"] for b in buckets] == ["2025-11-17T10:03:00.000Z"]
+
+        # Older than the bucket now holding its slot
+        store.ingest(NOTIFICATION[:1])
+        assert store.dropped == 1
+
+    def test_persists_to_memory_mapped_files(self, tmp_path):
+        """Test that a new store reopens the rings written by a previous one."""
+        store = RollupStore(str(tmp_path), bucket_seconds=300, num_buckets=12)
+        store.ingest(NOTIFICATION)
+        store.flush()
+
+        reopened = RollupStore(str(tmp_path), bucket_seconds=300, num_buckets=12)
+        assert reopened.intersections() == ["Nga4ThuDuc"]
+        assert reopened.series("Nga4ThuDuc") == store.series("Nga4ThuDuc")
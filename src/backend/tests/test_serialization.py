@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the pluggable JSON serializer and raw broker responses.
+"""
+
+import httpx
+import pytest
+
+from app.services.serialization import JsonSerializer, get_serializer
+
+
+class TestSerializer:
+    """Test serializer selection and request encoding."""
+
+    def test_stdlib_fallback_round_trip(self):
+        """Test that the stdlib codec produces compact UTF-8 bytes."""
+        serializer = get_serializer("json")
+        data = {"id": "urn:ngsi-ld:Device:001", "name": "Cảm biến"}
+
+        encoded = serializer.dumps(data)
+
+        assert type(serializer) is JsonSerializer
+        assert encoded == '{"id":"urn:ngsi-ld:Device:001","name":"Cảm biến"}'.encode()
+        assert serializer.loads(encoded) == data
+
+    @pytest.mark.asyncio
+    async def test_body_is_pre_serialized_with_content_type(self, make_service):
+        """Test that bodies are sent as bytes, keeping an explicit Content-Type."""
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append((request.headers["content-type"], request.content))
+            return httpx.Response(204)
+
+        service = make_service(handler, coalesce_gets=False)
+        await service._make_request("PATCH", "entities/x/attrs", json_payload={"a": 1})
+        await service._make_request(
+            "POST",
+            "entities",
+            headers=service.JSON_LD_CONTENT_HEADER,
+            json_payload={"id": "x"},
+        )
+
+        assert sent[0] == ("application/json", service.serializer.dumps({"a": 1}))
+        assert sent[1][0] == "application/ld+json"
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_raw_query_keeps_broker_bytes(self, make_service):
+        """Test that raw queries return the broker body without decoding."""
+        body = b'[{"id":"urn:ngsi-ld:Device:001","type":"Device"}]'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, content=body, headers={"NGSILD-Results-Count": "1"}
+            )
+
+        service = make_service(handler, coalesce_gets=False)
+        response = await service.query_entities_raw(type="Device", count=True)
+
+        assert response.content == body
+        assert response.headers["NGSILD-Results-Count"] == "1"
+        await service.close()
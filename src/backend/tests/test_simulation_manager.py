@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for running several simulations side by side.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.sumo_rl.agents import simulation_manager as manager_module
+from app.sumo_rl.agents.compact_state import (
+    LANE_DTYPE,
+    TLS_DTYPE,
+    VEHICLE_DTYPE,
+    CompactState,
+    StringTable,
+    Table,
+)
+from app.sumo_rl.agents.simulation_manager import SimulationManager
+
+
+class FakeConnector:
+    """Stands in for a TraCIConnector with its own labelled connection."""
+
+    startup_time = 0.0
+
+    def __init__(self, label="default"):
+        self.label = label
+        self.scenario = None
+        self.time = 0.0
+        self.closed = False
+
+    def start_sumo(self, scenario, gui=False, port=None):
+        time.sleep(self.startup_time)
+        self.scenario = scenario
+        return True
+
+    def connect(self, host, port, scenario):
+        self.scenario = scenario
+        return True
+
+    def step(self):
+        self.time += 1.0
+        return self.time
+
+    def get_compact_state(self):
+        return CompactState(
+            self.time,
+            0,
+            0,
+            0,
+            -1,
+            Table.empty(TLS_DTYPE),
+            Table.empty(LANE_DTYPE),
+            Table.empty(VEHICLE_DTYPE),
+            StringTable(),
+        )
+
+    def get_scenario_info(self):
+        return {"label": self.label, "scenario": self.scenario}
+
+    def close(self):
+        self.closed = True
+
+
+class TestSimulationManager:
+    """Test launching, routing and stopping simulations by ID."""
+
+    @pytest.mark.asyncio
+    async def test_simulations_run_side_by_side(self, monkeypatch):
+        """Test that each simulation gets its own connection and ID."""
+        monkeypatch.setattr(manager_module, "TraCIConnector", FakeConnector)
+        manager = SimulationManager(max_simulations=2)
+        try:
+            first = await manager.launch("QuangTrung")
+            second = await manager.launch("QuangTrung")
+            assert (first.id, second.id) == ("QuangTrung", "QuangTrung-2")
+            assert first.connector is not second.connector
+            assert second.connector.label == "QuangTrung-2"
+            assert manager.get("QuangTrung-2") is second
+            assert manager.broadcaster("QuangTrung") is first.broadcaster
+
+            with pytest.raises(RuntimeError):
+                await manager.launch("Nga4ThuDuc")
+
+            assert await manager.stop("QuangTrung") is True
+            assert first.connector.closed
+            assert manager.get("QuangTrung") is None
+            assert [s.id for s in manager.list()] == ["QuangTrung-2"]
+        finally:
+            await manager.stop_all()
+        assert manager.list() == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_launches_reserve_ids_and_capacity(self, monkeypatch):
+        """Test that launches racing through SUMO startup respect the limits."""
+        monkeypatch.setattr(manager_module, "TraCIConnector", FakeConnector)
+        monkeypatch.setattr(FakeConnector, "startup_time", 0.05)
+        manager = SimulationManager(max_simulations=2)
+        try:
+            results = await asyncio.gather(
+                manager.launch("QuangTrung"),
+                manager.launch("QuangTrung"),
+                manager.launch("QuangTrung"),
+                return_exceptions=True,
+            )
+            launched = [r.id for r in results if not isinstance(r, Exception)]
+            assert launched == ["QuangTrung", "QuangTrung-2"]
+            assert isinstance(results[2], RuntimeError)
+
+            await manager.stop("QuangTrung-2")
+            results = await asyncio.gather(
+                manager.launch("Nga4ThuDuc", simulation_id="main"),
+                manager.launch("Nga4ThuDuc", simulation_id="main"),
+                return_exceptions=True,
+            )
+            assert isinstance(results[1], RuntimeError)
+            assert [s.id for s in manager.list()] == ["QuangTrung", "main"]
+        finally:
+            await manager.stop_all()
@@ -0,0 +1,106 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the background simulation worker.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.sumo_rl.agents.compact_state import (
+    LANE_DTYPE,
+    TLS_DTYPE,
+    VEHICLE_DTYPE,
+    CompactState,
+    StringTable,
+    Table,
+)
+from app.sumo_rl.agents.simulation_worker import SimulationWorker
+
+
+def empty_state(time: float) -> CompactState:
+    return CompactState(
+        time,
+        0,
+        0,
+        0,
+        -1,
+        Table.empty(TLS_DTYPE),
+        Table.empty(LANE_DTYPE),
+        Table.empty(VEHICLE_DTYPE),
+        StringTable(),
+    )
+
+
+class FakeConnector:
+    """Counts steps and records which thread touched the connection."""
+
+    def __init__(self):
+        self.time = 0.0
+        self.threads = set()
+        self.closed = False
+
+    def step(self):
+        self.threads.add(threading.get_ident())
+        self.time += 1.0
+        return self.time
+
+    def get_compact_state(self):
+        self.threads.add(threading.get_ident())
+        return empty_state(self.time)
+
+    def set_phase(self, phase_index):
+        self.threads.add(threading.get_ident())
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+class TestSimulationWorker:
+    """Test background stepping, snapshots and the command queue."""
+
+    @pytest.mark.asyncio
+    async def test_steps_in_background(self):
+        """Test that snapshots are published without requests and commands run on the worker."""
+        connector = FakeConnector()
+        worker = SimulationWorker(
+            connector, real_time_factor=100.0, step_length=1.0, buffer_size=5
+        )
+        worker.start()
+        try:
+            assert await worker.call(connector.set_phase, 1) is True
+            deadline = time.monotonic() + 2
+            while worker.latest().seq < 8 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            snapshot = worker.latest()
+            assert snapshot.seq >= 8
+            assert snapshot.state["simulation_time"] == snapshot.simulation_time
+            with pytest.raises(AttributeError):
+                snapshot.seq = 0
+            # Ring buffer keeps only the newest snapshots
+            assert len(worker.snapshots()) == 5
+        finally:
+            worker.stop()
+        assert connector.closed
+        assert connector.threads == {worker._thread.ident}
+
+    @pytest.mark.asyncio
+    async def test_manual_stepping(self):
+        """Test that a real-time factor of 0 only steps on request."""
+        connector = FakeConnector()
+        worker = SimulationWorker(connector, real_time_factor=0)
+        worker.start()
+        try:
+            snapshot = await worker.call(worker.step)
+            time.sleep(0.05)
+            assert (snapshot.seq, snapshot.simulation_time) == (2, 1.0)
+            assert worker.latest() is snapshot
+        finally:
+            worker.stop(close_connection=False)
+        assert not connector.closed
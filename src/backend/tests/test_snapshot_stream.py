@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for live snapshot streaming over WebSocket.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import sumo_control_router
+from app.sumo_rl.agents.compact_state import (
+    LANE_DTYPE,
+    TLS_DTYPE,
+    VEHICLE_DTYPE,
+    CompactState,
+    StringTable,
+    Table,
+)
+from app.sumo_rl.agents.simulation_manager import SimulationManager
+from app.sumo_rl.agents.simulation_worker import SimulationSnapshot
+from app.sumo_rl.agents.snapshot_broadcaster import (
+    DELTA,
+    FULL,
+    SnapshotBroadcaster,
+)
+
+
+def snapshot(seq: int, speeds) -> SimulationSnapshot:
+    vehicles = np.empty(len(speeds), dtype=VEHICLE_DTYPE)
+    vehicles["speed"] = speeds
+    state = CompactState(
+        float(seq),
+        len(speeds),
+        len(speeds),
+        0,
+        -1,
+        Table.empty(TLS_DTYPE),
+        Table.empty(LANE_DTYPE),
+        Table(tuple(f"v{i}" for i in range(len(speeds))), vehicles),
+        StringTable(),
+    )
+    return SimulationSnapshot(seq, state)
+
+
+class TestSnapshotBroadcaster:
+    """Test shared encoding, deltas and frame dropping."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_and_dropped_frames(self):
+        """Test that clients share frames, get deltas and resync after drops."""
+        broadcaster = SnapshotBroadcaster()
+        fast = broadcaster.subscribe(fields=["vehicle_count", "simulation_time"])
+        slow = broadcaster.subscribe(fields=["simulation_time", "vehicle_count"])
+        assert len(broadcaster._channels) == 1
+
+        broadcaster.publish(snapshot(1, [9.0] * 3))
+        kind, first = await fast.next_frame()
+        assert kind == FULL
+        assert json.loads(first)["data"] == {"simulation_time": 1.0, "vehicle_count": 3}
+        # Encoded once, sent to both clients
+        assert (await slow.next_frame())[1] is first
+
+        broadcaster.publish(snapshot(2, [7.0] * 3))
+        kind, text = await fast.next_frame()
+        message = json.loads(text)
+        assert kind == DELTA
+        assert message["data"] == {"simulation_time": 2.0}
+        assert message["base"] == json.loads(first)["seq"]
+
+        # The slow client missed step 2, so step 3 cannot be a delta for it
+        broadcaster.publish(snapshot(3, [7.0] * 4))
+        assert (await fast.next_frame())[0] == DELTA
+        kind, text = await slow.next_frame()
+        assert kind == FULL
+        assert json.loads(text)["data"]["vehicle_count"] == 4
+
+        fast.close()
+        slow.close()
+        assert broadcaster.subscribers == 0
+
+
+class TestSimulationSocket:
+    """Test the /sumo/socket WebSocket endpoint."""
+
+    def test_socket_field_selection(self, monkeypatch):
+        """Test the initial full frame and re-subscribing to other fields."""
+        manager = SimulationManager()
+        monkeypatch.setattr(sumo_control_router, "simulation_manager", manager)
+        broadcaster = manager.broadcaster("QuangTrung")
+        broadcaster.publish(snapshot(1, [9.0] * 3))
+        app = FastAPI()
+        app.include_router(sumo_control_router.router)
+
+        with TestClient(app).websocket_connect(
+            "/sumo/simulations/QuangTrung/socket"
+        ) as websocket:
+            assert websocket.receive_json()["type"] == "connection"
+            message = websocket.receive_json()
+            assert message["type"] == FULL
+            assert message["data"]["avg_speed"] == 9.0
+
+            websocket.send_json(
+                {
+                    "type": "command",
+                    "data": {
+                        "command": "subscribe",
+                        "params": {"fields": ["avg_speed"]},
+                    },
+                }
+            )
+            message = websocket.receive_json()
+            assert (message["type"], message["data"]) == (FULL, {"avg_speed": 9.0})
+
+    def test_frame_ready_with_a_command_is_not_dropped(self, monkeypatch):
+        """Test that a frame completing with a subscribe command is still sent."""
+        manager = SimulationManager()
+        monkeypatch.setattr(sumo_control_router, "simulation_manager", manager)
+        manager.broadcaster("QuangTrung").publish(snapshot(1, [9.0] * 3))
+
+        async def wait_for_both(futures, return_when):
+            # Let the pending frame and the client's command complete together
+            return await asyncio.wait(futures, timeout=0.5)
+
+        monkeypatch.setattr(
+            sumo_control_router,
+            "asyncio",
+            SimpleNamespace(**{**vars(asyncio), "wait": wait_for_both}),
+        )
+        app = FastAPI()
+        app.include_router(sumo_control_router.router)
+
+        with TestClient(app).websocket_connect(
+            "/sumo/simulations/QuangTrung/socket"
+        ) as websocket:
+            assert websocket.receive_json()["type"] == "connection"
+            websocket.send_json(
+                {
+                    "type": "command",
+                    "data": {
+                        "command": "subscribe",
+                        "params": {"fields": ["avg_speed"]},
+                    },
+                }
+            )
+            first = websocket.receive_json()
+            second = websocket.receive_json()
+
+        assert first["type"] == FULL and first["data"]["vehicle_count"] == 3
+        assert (second["type"], second["data"]) == (FULL, {"avg_speed": 9.0})
@@ -0,0 +1,185 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the local spatial index and its use by geo-queries.
+"""
+
+import httpx
+import pytest
+
+from app.services.spatial_index import SpatialIndex, spatial_indexes
+
+
+def road(number: int, coordinates) -> dict:
+    return {
+        "id": f"urn:ngsi-ld:RoadSegment:{number}",
+        "type": "RoadSegment",
+        "name": {"type": "Property", "value": f"Road {number}"},
+        "location": {
+            "type": "GeoProperty",
+            "value": {"type": "LineString", "coordinates": coordinates},
+        },
+    }
+
+
+ROADS = [
+    road(1, [[106.700, 10.800], [106.702, 10.800]]),
+    road(2, [[106.710, 10.800], [106.712, 10.800]]),
+    road(3, [[106.800, 10.900], [106.802, 10.900]]),
+]
+
+
+class TestSpatialIndex:
+    """Test local near/within/intersects evaluation."""
+
+    def test_geo_relations(self):
+        """Test that near is ordered by distance and honours maxDistance."""
+        index = SpatialIndex("RoadSegment")
+        for entity in ROADS:
+            index.upsert(entity)
+
+        near = index.query("near;maxDistance==1500", "Point", "[106.703,10.8005]")
+        assert [e["id"][-1] for e in near] == ["1", "2"]
+
+        box = [
+            [
+                [106.69, 10.79],
+                [106.705, 10.79],
+                [106.705, 10.81],
+                [106.69, 10.81],
+                [106.69, 10.79],
+            ]
+        ]
+        assert [e["id"][-1] for e in index.query("within", "Polygon", box)] == ["1"]
+        crossing = [[106.711, 10.79], [106.711, 10.81]]
+        assert [
+            e["id"][-1] for e in index.query("intersects", "LineString", crossing)
+        ] == ["2"]
+        assert index.query("disjoint", "Point", "[106.7,10.8]") is None
+
+    def test_within_concave_polygon(self):
+        """Test that within uses the polygon's area, not only the vertices."""
+        index = SpatialIndex("RoadSegment")
+        for entity in ROADS[:2]:
+            index.upsert(entity)
+        # U shape: both ends of road 4 lie inside, but it spans the notch
+        u_shape = [
+            [
+                [106.699, 10.799],
+                [106.713, 10.799],
+                [106.713, 10.802],
+                [106.709, 10.802],
+                [106.709, 10.8005],
+                [106.703, 10.8005],
+                [106.703, 10.802],
+                [106.699, 10.802],
+                [106.699, 10.799],
+            ]
+        ]
+        notch_road = road(4, [[106.700, 10.801], [106.712, 10.801]])
+        index.upsert(notch_road)
+
+        within = index.query("within", "Polygon", u_shape)
+        assert [e["id"][-1] for e in within] == ["1", "2"]
+
+        holed = [
+            [[106.69, 10.79], [106.72, 10.79], [106.72, 10.81], [106.69, 10.81]],
+            [[106.7005, 10.7995], [106.7015, 10.7995], [106.7015, 10.8005]],
+        ]
+        assert [e["id"][-1] for e in index.query("within", "Polygon", holed)] == [
+            "2",
+            "4",
+        ]
+
+    def test_notifications_update_and_delete(self):
+        """Test that moved and deleted entities are re-indexed."""
+        index = SpatialIndex("RoadSegment")
+        index.upsert(ROADS[0])
+        moved = road(1, [[106.800, 10.900], [106.801, 10.900]])
+        index.handle_notification({"data": [moved, dict(ROADS[1], deletedAt="now")]})
+
+        assert index.query("near;maxDistance==100", "Point", "[106.701,10.8]") == []
+        assert len(index.query("near;maxDistance==100", "Point", "[106.8,10.9]")) == 1
+
+
+class TestIndexedGeoQueries:
+    """Test that BaseService answers geo-queries from a loaded index."""
+
+    @pytest.mark.asyncio
+    async def test_own_writes_are_indexed(self, make_service, monkeypatch):
+        """Test that a service's writes are visible to its next geo-query."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/entityOperations/upsert"):
+                return httpx.Response(
+                    207,
+                    json={
+                        "success": [ROADS[1]["id"]],
+                        "errors": [{"entityId": ROADS[2]["id"], "error": {}}],
+                    },
+                )
+            return httpx.Response(204)
+
+        index = SpatialIndex("RoadSegment")
+        index.ready = True
+        monkeypatch.setitem(spatial_indexes, "RoadSegment", index)
+        service = make_service(handler, entity_type="RoadSegment")
+
+        def near(point: str) -> list:
+            return index.query("near;maxDistance==100", "Point", point)
+
+        await service.create_entity(dict(ROADS[0]))
+        assert [e["id"] for e in near("[106.701,10.8]")] == [ROADS[0]["id"]]
+
+        moved = {"location": road(1, [[106.8, 10.9], [106.801, 10.9]])["location"]}
+        await service.update_entity_attributes(ROADS[0]["id"], moved)
+        assert near("[106.701,10.8]") == []
+        assert near("[106.8,10.9]")[0]["name"]["value"] == "Road 1"
+
+        await service.batch_upsert([dict(ROADS[1]), dict(ROADS[2])])
+        assert [e["id"] for e in near("[106.711,10.8]")] == [ROADS[1]["id"]]
+        assert near("[106.801,10.9]")[0]["id"] == ROADS[0]["id"]  # 3 failed
+
+        await service.delete_entity(ROADS[0]["id"])
+        assert near("[106.8,10.9]") == []
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_local_answer_and_broker_fallback(self, monkeypatch, make_service):
+        """Test local answers, and broker fallback for q and strong consistency."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=[])
+
+        index = SpatialIndex("RoadSegment")
+        for entity in ROADS:
+            index.upsert(entity)
+        index.ready = True
+        monkeypatch.setitem(spatial_indexes, "RoadSegment", index)
+
+        service = make_service(handler)
+        geo = {
+            "type": "RoadSegment",
+            "georel": "near;maxDistance==2000",
+            "geometry": "Point",
+            "coordinates": "[106.701,10.8]",
+        }
+
+        result = await service.query_entities(
+            **geo, pick="id,type,name", format="simplified", limit=1
+        )
+        assert result == [
+            {"id": "urn:ngsi-ld:RoadSegment:1", "type": "RoadSegment", "name": "Road 1"}
+        ]
+        assert await service.query_entities(**geo, count=True) == 2
+        assert requests == []
+
+        await service.query_entities(**geo, q='name=="Road 1"')
+        await service.query_entities(**geo, consistency="strong")
+        assert len(requests) == 2
+        assert "consistency" not in requests[1].url.params
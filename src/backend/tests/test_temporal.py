@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for windowed, paginated temporal queries.
+"""
+
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from app.services.temporal import (
+    merge_temporal_entities,
+    next_page_params,
+    split_time_range,
+)
+
+ENTITY_ID = "urn:ngsi-ld:AirQualityObserved:001"
+
+
+def instance(value, observed_at):
+    return {"type": "Property", "value": value, "observedAt": observed_at}
+
+
+class TestTemporalHelpers:
+    """Test range splitting and stitching of temporal results."""
+
+    def test_split_time_range(self):
+        """Test that a range is split into consecutive windows."""
+        windows = split_time_range(
+            "2025-11-01T00:00:00Z", "2025-11-01T10:00:00Z", timedelta(hours=4)
+        )
+
+        assert windows == [
+            ("2025-11-01T00:00:00.000Z", "2025-11-01T04:00:00.000Z"),
+            ("2025-11-01T04:00:00.000Z", "2025-11-01T08:00:00.000Z"),
+            ("2025-11-01T08:00:00.000Z", "2025-11-01T10:00:00.000Z"),
+        ]
+
+    def test_merge_orders_and_deduplicates(self):
+        """Test that instances are stitched in time order without duplicates."""
+        later = [
+            {
+                "id": ENTITY_ID,
+                "type": "AirQualityObserved",
+                "pm25": [instance(3, "2025-11-01T02:00:00Z")],
+            }
+        ]
+        earlier = [
+            {
+                "id": ENTITY_ID,
+                "type": "AirQualityObserved",
+                "pm25": [
+                    instance(1, "2025-11-01T00:00:00Z"),
+                    instance(2, "2025-11-01T01:00:00Z"),
+                ],
+            }
+        ]
+
+        merged = merge_temporal_entities([later, earlier, later])
+
+        assert len(merged) == 1
+        assert [i["value"] for i in merged[0]["pm25"]] == [1, 2, 3]
+
+    def test_mixed_precision_timestamps(self):
+        """Test ordering and paging by instant, not by timestamp text."""
+        page = [
+            {
+                "id": ENTITY_ID,
+                "pm25": [
+                    instance(2, "2025-11-01T00:00:00.500Z"),
+                    instance(1, "2025-11-01T00:00:00Z"),
+                    instance(1, "2025-11-01T00:00:00.000Z"),  # Same instance
+                ],
+            }
+        ]
+
+        merged = merge_temporal_entities([page])
+
+        assert [i["value"] for i in merged[0]["pm25"]] == [1, 2]
+        params = {"timerel": "after", "timeAt": "2025-11-01T00:00:00Z"}
+        same_instant = ("2025-11-01T00:00:00.000Z", "2025-11-01T00:00:00.000Z")
+        assert next_page_params(params, same_instant) is None
+        later = ("2025-11-01T00:00:00.000Z", "2025-11-01T00:00:00.500Z")
+        assert next_page_params(params, later)["timeAt"] == later[1]
+
+
+class TestTemporalQuery:
+    """Test window fan-out and pagination against the broker."""
+
+    @pytest.mark.asyncio
+    async def test_long_range_is_fetched_in_windows(self, make_service):
+        """Test that each window is requested and the series is stitched."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            time_at = request.url.params["timeAt"]
+            requested.append((time_at, request.url.params["endTimeAt"]))
+            entity = {
+                "id": ENTITY_ID,
+                "type": "AirQualityObserved",
+                "pm25": instance(len(requested), time_at),
+            }
+            return httpx.Response(200, json=[entity])
+
+        service = make_service(handler)
+        service.temporal_window = timedelta(hours=6)
+        result = await service.temporal_query(
+            "between",
+            "2025-11-01T00:00:00Z",
+            "2025-11-02T00:00:00Z",
+            type="AirQualityObserved",
+        )
+
+        assert len(requested) == 4
+        observed = [i["observedAt"] for i in result[0]["pm25"]]
+        assert observed == sorted(observed)
+        assert len(observed) == 4
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_partial_responses_are_followed(self, make_service):
+        """Test that a 206 Content-Range continues after the newest instance."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params["timeAt"])
+            if len(requested) == 1:
+                return httpx.Response(
+                    206,
+                    json=[
+                        {"id": ENTITY_ID, "pm25": instance(1, "2025-11-01T01:00:00Z")}
+                    ],
+                    headers={
+                        "Content-Range": "date-time 2025-11-01T00:00:00Z"
+                        "-2025-11-01T01:00:00Z/1"
+                    },
+                )
+            return httpx.Response(
+                200,
+                json=[{"id": ENTITY_ID, "pm25": instance(2, "2025-11-01T02:00:00Z")}],
+            )
+
+        service = make_service(handler)
+        result = await service.temporal_query(
+            "between", "2025-11-01T00:00:00Z", "2025-11-01T03:00:00Z"
+        )
+
+        assert requested[1] == "2025-11-01T01:00:00Z"
+        assert [i["value"] for i in result[0]["pm25"]] == [1, 2]
+        await service.close()
@@ -0,0 +1,142 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for subscription-based state collection in TraCIConnector.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+tc = pytest.importorskip("traci.constants")
+
+from app.sumo_rl.agents.traci_connector import TraCIConnector  # noqa: E402
+
+
+class FakeConnection:
+    """
+    Stands in for a TraCI connection: serves subscription results and fails
+    on any per-object getter, so a state read must not issue one.
+    """
+
+    def __init__(self):
+        self.subscribed = []
+        self.time = 42.0
+        self.tls = {
+            "A": {
+                tc.TL_CURRENT_PHASE: 2,
+                tc.TL_PHASE_DURATION: 30.0,
+                tc.TL_RED_YELLOW_GREEN_STATE: "Gr",
+                tc.TL_NEXT_SWITCH: 50.0,
+            },
+            "B": {
+                tc.TL_CURRENT_PHASE: 0,
+                tc.TL_PHASE_DURATION: 5.0,
+                tc.TL_RED_YELLOW_GREEN_STATE: "y",
+                tc.TL_NEXT_SWITCH: 40.0,
+            },
+        }
+        self.lanes = {
+            "l1": {
+                tc.LAST_STEP_VEHICLE_HALTING_NUMBER: 3,
+                tc.VAR_WAITING_TIME: 12.5,
+                tc.LAST_STEP_OCCUPANCY: 0.2,
+            },
+            "l2": {
+                tc.LAST_STEP_VEHICLE_HALTING_NUMBER: 1,
+                tc.VAR_WAITING_TIME: 2.5,
+                tc.LAST_STEP_OCCUPANCY: 0.4,
+            },
+        }
+        self.vehicles = {"v1": {tc.VAR_SPEED: 10.0}, "v2": {tc.VAR_SPEED: 4.0}}
+
+        def record(*args):
+            self.subscribed.append(args)
+
+        self.simulation = SimpleNamespace(
+            subscribe=record,
+            getTime=lambda: self.time,
+            getNetBoundary=lambda: ((0.0, 0.0), (300.0, 400.0)),
+            getSubscriptionResults=lambda: {
+                tc.VAR_TIME: self.time,
+                tc.VAR_LOADED_VEHICLES_NUMBER: 5,
+                tc.VAR_DEPARTED_VEHICLES_NUMBER: 4,
+                tc.VAR_ARRIVED_VEHICLES_NUMBER: 1,
+            },
+        )
+        self.trafficlight = SimpleNamespace(
+            subscribe=record,
+            getIDList=lambda: list(self.tls),
+            getControlledLanes=lambda tls_id: ["l1", "l2", "l1"],
+            getAllSubscriptionResults=lambda: self.tls,
+        )
+        self.lane = SimpleNamespace(
+            subscribe=record, getAllSubscriptionResults=lambda: self.lanes
+        )
+        self.junction = SimpleNamespace(
+            subscribeContext=record,
+            getIDList=lambda: ["J0"],
+            getContextSubscriptionResults=lambda anchor: self.vehicles,
+        )
+
+
+class TestTraCIConnectorSubscriptions:
+    """Test that traffic state is decoded from subscription results."""
+
+    def test_state_read_from_subscriptions(self):
+        """Test one subscription per object and a state without TraCI getters."""
+        fake = FakeConnection()
+        connector = TraCIConnector(label="test")
+        connector.conn = fake
+        connector.tls_id = "A"
+        connector._subscribe()
+        connector.connected = True
+
+        # simulation, 2 traffic lights, 2 distinct lanes, 1 vehicle context
+        assert len(fake.subscribed) == 6
+        anchor, domain, radius, _ = fake.subscribed[-1]
+        assert (anchor, domain, radius) == ("J0", tc.CMD_GET_VEHICLE_VARIABLE, 500.0)
+
+        state = connector.get_traffic_state()
+        assert state is not None
+        assert state["simulation_time"] == 42.0
+        assert state["current_phase"] == 2
+        assert (state["vehicle_count"], state["avg_speed"]) == (2, 7.0)
+        assert (state["max_speed"], state["min_speed"]) == (10.0, 4.0)
+        assert (state["queue_length"], state["waiting_time"]) == (4, 15.0)
+        assert state["avg_occupancy"] == 30.0
+        assert state["controlled_lanes"] == 2
+        assert state["departed_vehicles"] == 4
+        main, other = state["traffic_lights"]
+        assert main["is_main"] and main["time_until_switch"] == 8.0
+        assert main["lights"][1] == {"index": 1, "state": "r", "color": "red"}
+        assert not other["is_main"] and other["time_until_switch"] == 0
+
+    def test_phase_change_refreshes_subscription(self):
+        """Test that a TLS is re-subscribed after a phase change, main by default."""
+        fake = FakeConnection()
+        connector = TraCIConnector(label="test")
+        connector.conn = fake
+        connector.tls_id = "A"
+        connector._subscribe()
+        del fake.subscribed[:]
+
+        connector.refresh_traffic_light("B")
+        connector.refresh_traffic_light()
+        connector.refresh_traffic_light("unknown")
+
+        assert [args[0] for args in fake.subscribed] == ["B", "A"]
+
+    def test_closed_connector_reports_no_state(self):
+        """Test that a connector without a connection fails safely."""
+        connector = TraCIConnector(label="test")
+        connector.connected = True  # Stale flag, the connection is gone
+
+        with pytest.raises(RuntimeError):
+            connector._subscribe()
+        assert connector.get_compact_state() is None
+        assert connector.step() is None
+        assert connector.connected is False
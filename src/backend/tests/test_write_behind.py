@@ -0,0 +1,105 @@
+# Copyright (c) 2025 Green Wave Team
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+"""
+Tests for the write-behind attribute update buffer.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.write_behind import AttributeUpdateBuffer
+
+
+class TestAttributeUpdateBuffer:
+    """Test merging and flushing of buffered attribute updates."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_merged_into_one_batch(self, make_service):
+        """Test that repeated PATCHes become one batch update, last write wins."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(204)
+
+        service = make_service(handler)
+        buffer = AttributeUpdateBuffer(service, flush_interval=0.01)
+        light = "urn:ngsi-ld:TrafficLight:001"
+        waiters = [
+            buffer.update(light, {"forcePhase": {"type": "Property", "value": 1}}),
+            buffer.update(light, {"forcePhase": {"type": "Property", "value": 2}}),
+            buffer.update("urn:ngsi-ld:Device:001", {"batteryLevel": 0.5}),
+        ]
+
+        assert all(await asyncio.gather(*waiters))
+        assert len(calls) == 1
+        path, body = calls[0]
+        assert path.endswith("/entityOperations/update")
+        assert [e["id"] for e in body] == [light, "urn:ngsi-ld:Device:001"]
+        assert body[0]["type"] == "TrafficLight"
+        assert body[0]["forcePhase"]["value"] == 2
+        await buffer.close()
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_entities_resolve_false(self, make_service):
+        """Test that per-entity batch errors are reported to their waiters."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                207,
+                json={
+                    "success": ["urn:ngsi-ld:Device:001"],
+                    "errors": [
+                        {
+                            "entityId": "urn:ngsi-ld:Device:002",
+                            "error": {"title": "Not found", "status": 404},
+                        }
+                    ],
+                },
+            )
+
+        service = make_service(handler)
+        buffer = AttributeUpdateBuffer(service, flush_interval=60)
+        ok = buffer.update("urn:ngsi-ld:Device:001", {"batteryLevel": 0.5})
+        missing = buffer.update("urn:ngsi-ld:Device:002", {"batteryLevel": 0.5})
+
+        await buffer.close()  # Flush on shutdown without waiting for the timer
+
+        assert await ok is True
+        assert await missing is False
+        assert buffer.pending_count == 0
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_update_during_flush_is_flushed(self, make_service):
+        """Test that an update buffered while a batch is in flight gets a timer."""
+        calls = []
+        sending = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content))
+            sending.set()
+            await asyncio.sleep(0.2)
+            return httpx.Response(204)
+
+        service = make_service(handler)
+        buffer = AttributeUpdateBuffer(service, flush_interval=0.05)
+        light = "urn:ngsi-ld:TrafficLight:001"
+        first = buffer.update(light, {"forcePhase": 1})
+        await sending.wait()
+        second = buffer.update(light, {"forcePhase": 2})
+
+        assert await asyncio.wait_for(asyncio.gather(first, second), 2) == [
+            True,
+            True,
+        ]
+        assert [body[0]["forcePhase"] for body in calls] == [1, 2]
+        await buffer.close()
+        await service.close()